@@ -3,23 +3,42 @@
 """Konfigurationspaket für die YOLO Video Annotator Anwendung"""
 
 from .config_manager import ConfigManager
+from .config_watcher import ConfigWatcher
+from .config_writer import ConfigWriter
 from .constants import COLORS, POSE_CONNECTIONS, DEFAULT_CONFIG
 
-__all__ = ['ConfigManager', 'COLORS', 'POSE_CONNECTIONS', 'DEFAULT_CONFIG']
+__all__ = ['ConfigManager', 'ConfigWatcher', 'ConfigWriter', 'COLORS', 'POSE_CONNECTIONS', 'DEFAULT_CONFIG']
 
 # core/__init__.py
 """Kernfunktionalitäten für die YOLO Video Annotator Anwendung"""
 
-from .detection_worker import DualDetectionWorker, WorkerSignals
+from .detection_worker import DualDetectionWorker, ModelLoadWorker, WorkerSignals
 from .frame_renderer import FrameRenderer
 from .foi_manager import FOIManager
-
-__all__ = ['DualDetectionWorker', 'WorkerSignals', 'FrameRenderer', 'FOIManager']
+from .heatmap_accumulator import HeatmapAccumulator
+from .line_counter import LineCrossingCounter
+from .prediction_cache import PredictionCache, CachedDetectionModel
+from .metrics import MetricsRegistry, MetricsServer
+from .detection_recorder import DetectionRecorder, DetectionRecording
+from .inference_cache import InferenceCache
+from .frame_cache import FrameCache
+from .incident_recorder import IncidentRecorder
+from .video_exporter import VideoExporter
+from .alert_publisher import AlertPublisher
+from .mjpeg_server import FrameBroadcaster, MjpegServer
+from .headless_pipeline import HeadlessPipeline
+
+__all__ = ['DualDetectionWorker', 'ModelLoadWorker', 'WorkerSignals', 'FrameRenderer', 'FOIManager', 'HeatmapAccumulator',
+           'LineCrossingCounter', 'PredictionCache', 'CachedDetectionModel',
+           'MetricsRegistry', 'MetricsServer', 'DetectionRecorder', 'DetectionRecording',
+           'InferenceCache', 'FrameCache', 'IncidentRecorder', 'VideoExporter',
+           'AlertPublisher', 'FrameBroadcaster', 'MjpegServer', 'HeadlessPipeline']
 
 # ui/__init__.py
 """Benutzeroberflächen-Komponenten für die YOLO Video Annotator Anwendung"""
 
 from .video_player import VideoPlayer
 from .settings_dialog import SettingsDialog
+from .video_widget import VideoWidget
 
-__all__ = ['VideoPlayer', 'SettingsDialog']
\ No newline at end of file
+__all__ = ['VideoPlayer', 'SettingsDialog', 'VideoWidget']
\ No newline at end of file
@@ -1,21 +1,40 @@
 import os
 import json
+import hashlib
+from collections import deque
 from .constants import DEFAULT_CONFIG, COLORS
+from .config_writer import ConfigWriter, write_file_atomic
+
+# Einmal aufgelöster Pfad der Konfigurationsdatei (spart das Durchsuchen des App-Verzeichnisses)
+_cached_config_path = None
 
 class ConfigManager:
     """Verwaltet das Laden und Speichern der Anwendungskonfiguration"""
     
     def __init__(self):
         self.config_path = self._find_or_create_config_file()
+        
+        # Hashes der zuletzt selbst geschriebenen bzw. des geladenen Inhalts (für den ConfigWatcher)
+        self.written_hashes = deque(maxlen=16)
+        self.last_loaded_hash = None
+        
+        # Verzögertes, atomares Schreiben im Hintergrund
+        self.writer = ConfigWriter(self.config_path)
     
     def _find_or_create_config_file(self):
-        """Findet oder erstellt eine config.json Datei im App-Verzeichnis"""
+        """Findet oder erstellt eine config.json Datei im App-Verzeichnis (Ergebnis wird gecacht)"""
+        global _cached_config_path
+        if _cached_config_path and os.path.exists(_cached_config_path):
+            return _cached_config_path
+        
         app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         config_path = os.path.join(app_dir, "config.json")
         
         # Schaue auch nach anderen JSON-Dateien im Verzeichnis
         if not os.path.exists(config_path):
-            json_files = [f for f in os.listdir(app_dir) if f.endswith('.json')]
+            # Nur kleine Dateien prüfen - große JSON-Dateien (z.B. Exporte) sind keine Konfiguration
+            json_files = [f for f in os.listdir(app_dir) if f.endswith('.json') and
+                          os.path.getsize(os.path.join(app_dir, f)) < 1024 * 1024]
             
             # Versuche eine passende Konfigurationsdatei zu finden
             for json_file in json_files:
@@ -33,12 +52,12 @@ class ConfigManager:
         # Wenn keine config.json existiert, erstelle eine
         if not os.path.exists(config_path):
             try:
-                with open(config_path, 'w', encoding='utf-8') as f:
-                    json.dump(DEFAULT_CONFIG, f, indent=2)
+                write_file_atomic(config_path, json.dumps(DEFAULT_CONFIG, indent=2))
                 print(f"Neue Konfigurationsdatei erstellt: {config_path}")
             except Exception as e:
                 print(f"Konnte config.json nicht erstellen: {e}")
         
+        _cached_config_path = config_path
         return config_path
     
     def load_config(self):
@@ -48,29 +67,44 @@ class ConfigManager:
         
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
-            # Migration von alten Konfigurationsformaten
-            migrated_config = self._migrate_config(config)
+                content = f.read()
             
-            # Farben konvertieren
-            for cls_id, cfg in migrated_config.get('class_config', {}).items():
-                if 'color' in cfg and isinstance(cfg['color'], list):
-                    cfg['color'] = tuple(cfg['color'])
-            
-            # Entferne nicht existierende Videos
-            if 'video_files' in migrated_config:
-                migrated_config['video_files'] = [
-                    vf for vf in migrated_config['video_files'] 
-                    if os.path.exists(vf)
-                ]
-            
-            return migrated_config
+            config = self.parse_config(content)
+            self.last_loaded_hash = self.content_hash(content)
+            return config
             
         except Exception as e:
             print(f"Fehler beim Laden der Konfiguration: {e}")
             return DEFAULT_CONFIG.copy()
     
+    def parse_config(self, content):
+        """Parst und migriert einen Konfigurationsinhalt - wirft bei ungültigem JSON eine Exception"""
+        config = json.loads(content)
+        
+        # Migration von alten Konfigurationsformaten
+        migrated_config = self._migrate_config(config)
+        
+        # Farben konvertieren
+        for cls_id, cfg in migrated_config.get('class_config', {}).items():
+            if 'color' in cfg and isinstance(cfg['color'], list):
+                cfg['color'] = tuple(cfg['color'])
+        
+        # Entferne nicht existierende Videos
+        if 'video_files' in migrated_config:
+            migrated_config['video_files'] = [
+                vf for vf in migrated_config['video_files'] 
+                if os.path.exists(vf)
+            ]
+        
+        return migrated_config
+    
+    @staticmethod
+    def content_hash(content):
+        """Berechnet den Hash eines Konfigurationsinhalts (zum Erkennen eigener Schreibvorgänge)"""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        return hashlib.sha256(content).hexdigest()
+    
     def _migrate_config(self, config):
         """Migriert alte Konfigurationsformate"""
         migrated = DEFAULT_CONFIG.copy()
@@ -90,7 +124,9 @@ class ConfigManager:
             'line_thickness': old_pose_config.get('line_thickness', 2),
             'keypoint_radius': old_pose_config.get('keypoint_radius', 3),
             'show_keypoints': old_pose_config.get('show_keypoints', True),
-            'show_skeleton': old_pose_config.get('show_skeleton', True)
+            'show_skeleton': old_pose_config.get('show_skeleton', True),
+            'pose_only': old_pose_config.get('pose_only', False),
+            'pose_only_class': str(old_pose_config.get('pose_only_class', '0'))
         }
         
         # Display config aus alter Struktur migrieren (ohne playback_speed)
@@ -99,7 +135,8 @@ class ConfigManager:
             'box_thickness': old_display.get('box_thickness', 2),
             'font_scale': old_display.get('font_scale', 5),
             'text_thickness': old_display.get('text_thickness', 1),
-            'alarm_class': old_display.get('alarm_class', None)
+            'alarm_class': old_display.get('alarm_class', None),
+            'max_result_age': old_display.get('max_result_age', 1.0)
         }
         
         # FOI Config Migration - NEUE Konfiguration
@@ -114,6 +151,121 @@ class ConfigManager:
             'foi_thickness': old_foi.get('foi_thickness', 3)
         }
         
+        # Heatmap Config
+        old_heatmap = config.get('heatmap_config', {})
+        default_heatmap = DEFAULT_CONFIG['heatmap_config']
+        migrated['heatmap_config'] = {
+            'enabled': old_heatmap.get('enabled', default_heatmap['enabled']),
+            'show_overlay': old_heatmap.get('show_overlay', default_heatmap['show_overlay']),
+            'classes': old_heatmap.get('classes', list(default_heatmap['classes'])),
+            'decimation': old_heatmap.get('decimation', default_heatmap['decimation']),
+            'half_life': old_heatmap.get('half_life', default_heatmap['half_life']),
+            'overlay_alpha': old_heatmap.get('overlay_alpha', default_heatmap['overlay_alpha']),
+            'snapshot_dir': old_heatmap.get('snapshot_dir', default_heatmap['snapshot_dir']),
+            'snapshot_interval': old_heatmap.get('snapshot_interval', default_heatmap['snapshot_interval'])
+        }
+        
+        # Line Crossing Config
+        old_line = config.get('line_config', {})
+        default_line = DEFAULT_CONFIG['line_config']
+        migrated['line_config'] = {
+            'enabled': old_line.get('enabled', default_line['enabled']),
+            'points': old_line.get('points', [list(p) for p in default_line['points']]),
+            'classes': old_line.get('classes', list(default_line['classes'])),
+            'bucket_seconds': old_line.get('bucket_seconds', default_line['bucket_seconds']),
+            'max_buckets': old_line.get('max_buckets', default_line['max_buckets']),
+            'track_timeout': old_line.get('track_timeout', default_line['track_timeout']),
+            'export_file': old_line.get('export_file', default_line['export_file']),
+            'line_color': old_line.get('line_color', default_line['line_color']),
+            'line_thickness': old_line.get('line_thickness', default_line['line_thickness'])
+        }
+        
+        # Metrics Config
+        old_metrics = config.get('metrics_config', {})
+        default_metrics = DEFAULT_CONFIG['metrics_config']
+        migrated['metrics_config'] = {
+            'enabled': old_metrics.get('enabled', default_metrics['enabled']),
+            'show_overlay': old_metrics.get('show_overlay', default_metrics['show_overlay']),
+            'http_port': old_metrics.get('http_port', default_metrics['http_port']),
+            'histogram_size': old_metrics.get('histogram_size', default_metrics['histogram_size']),
+            'alert_latency_budget': old_metrics.get('alert_latency_budget', default_metrics['alert_latency_budget'])
+        }
+        
+        # Recording Config
+        old_recording = config.get('recording_config', {})
+        default_recording = DEFAULT_CONFIG['recording_config']
+        migrated['recording_config'] = {
+            'enabled': old_recording.get('enabled', default_recording['enabled']),
+            'output_dir': old_recording.get('output_dir', default_recording['output_dir']),
+            'chunk_frames': old_recording.get('chunk_frames', default_recording['chunk_frames'])
+        }
+        
+        # Inference Cache Config
+        old_inference_cache = config.get('inference_cache_config', {})
+        default_inference_cache = DEFAULT_CONFIG['inference_cache_config']
+        migrated['inference_cache_config'] = {
+            'enabled': old_inference_cache.get('enabled', default_inference_cache['enabled']),
+            'cache_dir': old_inference_cache.get('cache_dir', default_inference_cache['cache_dir']),
+            'max_size_mb': old_inference_cache.get('max_size_mb', default_inference_cache['max_size_mb'])
+        }
+        
+        # Frame Cache Config
+        old_frame_cache = config.get('frame_cache_config', {})
+        default_frame_cache = DEFAULT_CONFIG['frame_cache_config']
+        migrated['frame_cache_config'] = {
+            'enabled': old_frame_cache.get('enabled', default_frame_cache['enabled']),
+            'cache_dir': old_frame_cache.get('cache_dir', default_frame_cache['cache_dir']),
+            'max_size_mb': old_frame_cache.get('max_size_mb', default_frame_cache['max_size_mb']),
+            'max_width': old_frame_cache.get('max_width', default_frame_cache['max_width'])
+        }
+        
+        # Incident Config
+        old_incident = config.get('incident_config', {})
+        default_incident = DEFAULT_CONFIG['incident_config']
+        migrated['incident_config'] = {
+            'enabled': old_incident.get('enabled', default_incident['enabled']),
+            'output_dir': old_incident.get('output_dir', default_incident['output_dir']),
+            'pre_seconds': old_incident.get('pre_seconds', default_incident['pre_seconds']),
+            'post_seconds': old_incident.get('post_seconds', default_incident['post_seconds']),
+            'fps': old_incident.get('fps', default_incident['fps']),
+            'jpeg_quality': old_incident.get('jpeg_quality', default_incident['jpeg_quality']),
+            'max_width': old_incident.get('max_width', default_incident['max_width'])
+        }
+        
+        # Export Config
+        old_export = config.get('export_config', {})
+        default_export = DEFAULT_CONFIG['export_config']
+        migrated['export_config'] = {
+            'enabled': old_export.get('enabled', default_export['enabled']),
+            'output_dir': old_export.get('output_dir', default_export['output_dir']),
+            'fps': old_export.get('fps', default_export['fps']),
+            'width': old_export.get('width', default_export['width']),
+            'queue_size': old_export.get('queue_size', default_export['queue_size']),
+            'show_status': old_export.get('show_status', default_export['show_status'])
+        }
+        
+        # Alert Output Config
+        old_alert_output = config.get('alert_output_config', {})
+        default_alert_output = DEFAULT_CONFIG['alert_output_config']
+        migrated['alert_output_config'] = {
+            'enabled': old_alert_output.get('enabled', default_alert_output['enabled']),
+            'max_retries': old_alert_output.get('max_retries', default_alert_output['max_retries']),
+            'retry_delay': old_alert_output.get('retry_delay', default_alert_output['retry_delay']),
+            'max_retry_delay': old_alert_output.get('max_retry_delay', default_alert_output['max_retry_delay']),
+            'sinks': [dict(sink) for sink in old_alert_output.get('sinks', default_alert_output['sinks'])]
+        }
+        
+        # Headless Config
+        old_headless = config.get('headless_config', {})
+        default_headless = DEFAULT_CONFIG['headless_config']
+        migrated['headless_config'] = {
+            'host': old_headless.get('host', default_headless['host']),
+            'port': old_headless.get('port', default_headless['port']),
+            'stream_fps': old_headless.get('stream_fps', default_headless['stream_fps']),
+            'stream_width': old_headless.get('stream_width', default_headless['stream_width']),
+            'jpeg_quality': old_headless.get('jpeg_quality', default_headless['jpeg_quality'])
+        }
+        
         return migrated
     
     def _migrate_pose_detect_classes(self, old_pose_config):
@@ -124,15 +276,25 @@ class ConfigManager:
         return []
     
     def save_config(self, config):
-        """Speichert die Konfiguration in die Datei"""
+        """Speichert die Konfiguration - serialisiert sofort, geschrieben wird verzögert im Hintergrund"""
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            # Serialisieren im aufrufenden Thread: Momentaufnahme, bevor die Dicts weiter verändert werden
+            content = json.dumps(config, indent=2, ensure_ascii=False)
+            self.written_hashes.append(self.content_hash(content))
+            self.writer.submit(content)
             return True
         except Exception as e:
             print(f"Fehler beim Speichern der Konfiguration: {e}")
             return False
     
+    def flush(self):
+        """Schreibt eine ausstehende Konfiguration sofort (z.B. beim Beenden)"""
+        self.writer.flush()
+    
+    def is_own_content(self, content_hash):
+        """Prüft ob ein Dateiinhalt von uns selbst stammt (geschrieben oder zuletzt geladen)"""
+        return content_hash == self.last_loaded_hash or content_hash in self.written_hashes
+    
     def get_config_path(self):
         """Gibt den Pfad zur Konfigurationsdatei zurück"""
         return self.config_path
\ No newline at end of file
@@ -0,0 +1,69 @@
+import os
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+class ConfigWatcher(QObject):
+    """Überwacht die config.json auf externe Änderungen und meldet die neue Konfiguration.
+
+    Eigene Schreibvorgänge (gleicher Inhalts-Hash wie zuletzt geschrieben bzw.
+    geladen) werden ignoriert. Ungültiges JSON (z.B. halb geschriebene Datei)
+    wird verworfen, die laufende Konfiguration bleibt dann unverändert.
+    """
+
+    config_changed = pyqtSignal(object)
+
+    def __init__(self, config_manager, debounce_ms=300, parent=None):
+        super().__init__(parent)
+        self.config_manager = config_manager
+        self.config_path = config_manager.get_config_path()
+
+        # Editoren und Deployments schreiben oft in mehreren Schritten - kurz abwarten
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce_ms)
+        self.debounce_timer.timeout.connect(self._check_for_changes)
+
+        # Verzeichnis mit überwachen - beim Ersetzen der Datei (rename) geht die Datei-Überwachung verloren
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._on_file_event)
+        self.watcher.directoryChanged.connect(self._on_file_event)
+        self._ensure_watched()
+
+    def _ensure_watched(self):
+        """Fügt Datei und Verzeichnis (wieder) zur Überwachung hinzu"""
+        config_dir = os.path.dirname(self.config_path)
+        if config_dir and config_dir not in self.watcher.directories():
+            self.watcher.addPath(config_dir)
+        if os.path.exists(self.config_path) and self.config_path not in self.watcher.files():
+            self.watcher.addPath(self.config_path)
+
+    def _on_file_event(self, path):
+        """Startet die Prüfung verzögert (mehrere Events werden zusammengefasst)"""
+        self.debounce_timer.start()
+
+    def _check_for_changes(self):
+        """Liest die Datei und meldet sie, wenn sich der Inhalt gegenüber dem bekannten Stand geändert hat"""
+        self._ensure_watched()
+
+        try:
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except OSError:
+            return
+
+        # Eigene Schreibvorgänge ignorieren; solange noch geschrieben wird, ist die Datei nicht aktuell
+        content_hash = self.config_manager.content_hash(content)
+        if self.config_manager.is_own_content(content_hash):
+            return
+        if self.config_manager.writer.has_pending_write():
+            self.debounce_timer.start()
+            return
+
+        try:
+            config = self.config_manager.parse_config(content)
+        except Exception as e:
+            print(f"Externe Konfigurationsänderung ignoriert (ungültig): {e}")
+            return
+
+        self.config_manager.last_loaded_hash = content_hash
+        print("Externe Konfigurationsänderung erkannt")
+        self.config_changed.emit(config)
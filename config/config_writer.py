@@ -0,0 +1,94 @@
+import os
+import tempfile
+import threading
+import time
+
+def write_file_atomic(file_path, content):
+    """Schreibt Text atomar: temporäre Datei im selben Verzeichnis, fsync, dann os.replace"""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(prefix=".config_", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(file_path):
+            # Dateirechte der bestehenden Datei übernehmen (mkstemp legt 0600 an)
+            os.chmod(temp_path, os.stat(file_path).st_mode & 0o777)
+        os.replace(temp_path, file_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class ConfigWriter:
+    """Schreibt die Konfiguration verzögert und zusammengefasst in einem Hintergrund-Thread.
+
+    Mehrere Aufrufe von submit() innerhalb der Debounce-Zeit führen zu genau
+    einem Schreibvorgang mit dem zuletzt übergebenen Inhalt.
+    """
+
+    def __init__(self, file_path, debounce=0.5):
+        self.file_path = file_path
+        self.debounce = debounce
+
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()  # Entnehmen + Schreiben als Einheit, damit nie ein älterer Stand gewinnt
+        self._pending_content = None
+        self._last_submit_time = 0.0
+        self._stopped = False
+
+        self._thread = threading.Thread(target=self._run, name="ConfigWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, content):
+        """Merkt einen neuen Inhalt zum Schreiben vor (ersetzt einen noch nicht geschriebenen)"""
+        with self._condition:
+            self._pending_content = content
+            self._last_submit_time = time.monotonic()
+            self._condition.notify()
+
+    def has_pending_write(self):
+        """Prüft ob noch ein Inhalt auf das Schreiben wartet"""
+        with self._condition:
+            return self._pending_content is not None
+
+    def flush(self):
+        """Schreibt einen ausstehenden Inhalt sofort (im aufrufenden Thread)"""
+        with self._write_lock:
+            with self._condition:
+                content = self._pending_content
+                self._pending_content = None
+            if content is not None:
+                self._write(content)
+
+    def stop(self):
+        """Schreibt ausstehende Inhalte und beendet den Hintergrund-Thread"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join(timeout=5.0)
+        self.flush()
+
+    def _run(self):
+        """Wartet bis die Debounce-Zeit seit der letzten Änderung verstrichen ist und schreibt dann"""
+        while True:
+            with self._condition:
+                while self._pending_content is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+
+                remaining = self._last_submit_time + self.debounce - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+
+            self.flush()
+
+    def _write(self, content):
+        """Schreibt den Inhalt atomar - Fehler werden ausgegeben, nicht geworfen"""
+        try:
+            write_file_atomic(self.file_path, content)
+        except Exception as e:
+            print(f"Fehler beim Speichern der Konfiguration: {e}")
@@ -22,6 +22,12 @@ COLORS = {
     "Violet": (238, 130, 238),
 }
 
+NUM_KEYPOINTS = 17  # COCO-Keypoints
+
+# Schwellen der Modell-Inferenz (Ultralytics-Standard) - die Konfidenz pro Klasse wirkt erst darüber
+MODEL_PREDICT_CONF = 0.25
+MODEL_NMS_IOU = 0.7
+
 # Standard Pose-Verbindungen für YOLO Pose (17 Keypoints)
 POSE_CONNECTIONS = [
     (0, 1), (0, 2), (1, 3), (2, 4),  # Kopf
@@ -41,13 +47,16 @@ DEFAULT_CONFIG = {
         'line_thickness': 2,
         'keypoint_radius': 3,
         'show_keypoints': True,
-        'show_skeleton': True
+        'show_skeleton': True,
+        'pose_only': False,  # Nur das Pose-Modell auf dem Vollbild (ein Forward-Pass statt 1+N)
+        'pose_only_class': '0'  # Klassen-ID aus class_config für die Personen-Boxen des Pose-Modells
     },
     'display_config': {
         'box_thickness': 2,
         'font_scale': 5,
         'text_thickness': 1,
-        'alarm_class': None
+        'alarm_class': None,
+        'max_result_age': 1.0  # Sekunden, ältere Detections werden nicht mehr eingeblendet
     },
     'foi_config': {
         'enabled': True,
@@ -58,6 +67,84 @@ DEFAULT_CONFIG = {
         'foi_color': (0, 255, 255),  # Gelb für FOI-Rahmen
         'foi_thickness': 3
     },
+    'heatmap_config': {
+        'enabled': False,
+        'show_overlay': False,
+        'classes': [],  # Leer = alle Klassen
+        'decimation': 8,  # Heatmap-Auflösung = Frame-Auflösung / decimation
+        'half_life': 600.0,  # Sekunden bis ein Beitrag auf die Hälfte abgeklungen ist
+        'overlay_alpha': 0.4,
+        'snapshot_dir': 'heatmaps',  # Relativ zum App-Verzeichnis
+        'snapshot_interval': 3600.0  # Stündliche Snapshots
+    },
+    'line_config': {
+        'enabled': False,
+        'points': [[0.25, 0.5], [0.75, 0.5]],  # Gerichtete Zähllinie A->B, relative Koordinaten (0-1)
+        'classes': [],  # Leer = alle Klassen
+        'bucket_seconds': 60.0,  # Aggregationsintervall der Zählungen
+        'max_buckets': 1440,  # 24 Stunden bei 60s-Buckets
+        'track_timeout': 2.0,  # Sekunden bis ein verschwundener Track vergessen wird
+        'export_file': 'line_counts.csv',  # Relativ zum App-Verzeichnis, leer = kein Export
+        'line_color': (255, 0, 255),
+        'line_thickness': 2
+    },
+    'metrics_config': {
+        'enabled': True,  # Laufzeit-Metriken des Hot-Paths erfassen
+        'show_overlay': False,  # Metrik-Overlay im Video anzeigen
+        'http_port': 0,  # Lokaler Endpunkt /metrics (Prometheus) und /metrics.json, 0 = aus
+        'histogram_size': 1024,  # Anzahl der letzten Messwerte pro Histogramm
+        'alert_latency_budget': 0.5  # Sekunden, Warnung wenn p99 Erfassung -> Alarm-Entscheidung darüber liegt (0 = aus)
+    },
+    'recording_config': {
+        'enabled': False,  # Ergebnisse pro Frame für die Wiedergabe ohne Inferenz aufzeichnen
+        'output_dir': 'recordings',  # Relativ zum App-Verzeichnis, pro Sitzung ein Unterordner
+        'chunk_frames': 512  # Frames pro komprimiertem Block
+    },
+    'inference_cache_config': {
+        'enabled': False,  # Ergebnisse pro Video-Frame auf der Festplatte cachen (Endlosschleife ohne erneute Inferenz)
+        'cache_dir': '.cache/inference',  # Relativ zum App-Verzeichnis
+        'max_size_mb': 512  # Älteste Segmente werden darüber hinaus verdrängt (LRU)
+    },
+    'frame_cache_config': {
+        'enabled': False,  # Kurze Clips einmal dekodieren und danach aus einer gemappten Rohdatei lesen
+        'cache_dir': '.cache/frames',  # Relativ zum App-Verzeichnis
+        'max_size_mb': 2048,  # Längere Clips werden nicht gecacht, ältere Einträge verdrängt
+        'max_width': 0  # Frames beim Cachen auf diese Breite verkleinern (0 = Originalauflösung)
+    },
+    'incident_config': {
+        'enabled': False,  # Bei "Lift verlangsamt"/"gestoppt" einen Clip mit Vor- und Nachlauf speichern
+        'output_dir': 'incidents',  # Relativ zum App-Verzeichnis
+        'pre_seconds': 10.0,  # Vorlauf aus dem JPEG-Ringpuffer
+        'post_seconds': 5.0,  # Nachlauf nach dem Alarm
+        'fps': 10.0,  # Bildrate der Clips (Abtastung der angezeigten Frames)
+        'jpeg_quality': 80,
+        'max_width': 960  # Breite der Clip-Frames (0 = Anzeigegröße)
+    },
+    'export_config': {
+        'enabled': False,  # Gerenderte Ausgabe (Boxen, Skelette, FOI, Status) als Video exportieren
+        'output_dir': 'exports',  # Relativ zum App-Verzeichnis
+        'fps': 0,  # 0 = Bildrate des Videos
+        'width': 0,  # 0 = Anzeigegröße
+        'queue_size': 32,  # Bei vollem Puffer werden nur Export-Frames verworfen
+        'show_status': True  # Lift-Status in die exportierten Frames zeichnen
+    },
+    'alert_output_config': {
+        'enabled': False,  # Lift-Statuswechsel an Liftsteuerung/Pager senden (eigener Thread pro Ausgabe)
+        'max_retries': 3,  # Fehlversuche, ab denen eine Zustellung als fehlgeschlagen gemeldet wird (es wird weiter versucht)
+        'retry_delay': 0.5,  # Sekunden bis zur ersten Wiederholung (danach verdoppelt)
+        'max_retry_delay': 5.0,  # Obergrenze des Abstands zwischen Wiederholungen
+        # Ausgaben: udp/tcp (host, port; tcp optional expect_ack), webhook (url), mqtt (host, port, topic; paho-mqtt)
+        'sinks': [
+            {'type': 'udp', 'host': '127.0.0.1', 'port': 9500}
+        ]
+    },
+    'headless_config': {
+        'host': '127.0.0.1',  # '0.0.0.0' für Zugriff von anderen PCs (z.B. Leitstand)
+        'port': 8080,  # Vorschau (MJPEG) und Status-Endpunkt von main.py --headless
+        'stream_fps': 10.0,  # Render- und JPEG-Rate der Vorschau
+        'stream_width': 960,  # Breite der Vorschau (0 = Originalgröße)
+        'jpeg_quality': 75
+    },
     'video_files': []
 }
 
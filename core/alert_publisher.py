@@ -0,0 +1,251 @@
+import json
+import time
+import socket
+import threading
+import urllib.request
+
+class UdpSink:
+    """Ein JSON-Datagramm pro Statuswechsel (ohne Empfangsbestätigung)"""
+
+    def __init__(self, host, port, name=None):
+        self.name = name or f"udp_{port}"
+        self.address = (host, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(self, payload):
+        self.sock.sendto(payload, self.address)
+
+    def close(self):
+        self.sock.close()
+
+class TcpSink:
+    """Zeilenweises JSON über eine dauerhafte Verbindung - wird bei Fehlern neu aufgebaut.
+
+    Mit expect_ack wartet der Versand auf eine Antwortzeile der Steuerung
+    (z.B. "OK"); erst dann gilt die Meldung als zugestellt.
+    """
+
+    def __init__(self, host, port, timeout=2.0, expect_ack=False, name=None):
+        self.name = name or f"tcp_{port}"
+        self.address = (host, port)
+        self.timeout = timeout
+        self.expect_ack = expect_ack
+        self.sock = None
+        self.reader = None
+
+    def send(self, payload):
+        if self.sock is None:
+            self.sock = socket.create_connection(self.address, timeout=self.timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.reader = self.sock.makefile('rb')
+        try:
+            self.sock.sendall(payload + b"\n")
+            if self.expect_ack and not self.reader.readline():
+                raise ConnectionError("Verbindung ohne Bestätigung geschlossen")
+        except OSError:
+            self.close()
+            raise
+
+    def close(self):
+        if self.sock is not None:
+            self.reader.close()
+            self.sock.close()
+            self.sock = None
+            self.reader = None
+
+class WebhookSink:
+    """HTTP-POST des JSON-Dokuments - zugestellt bei Status 2xx"""
+
+    def __init__(self, url, timeout=2.0, name=None):
+        self.name = name or "webhook"
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, payload):
+        request = urllib.request.Request(self.url, data=payload, method='POST',
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    def close(self):
+        pass
+
+class MqttSink:
+    """Veröffentlichung auf einem MQTT-Topic (QoS 1, retained) - benötigt das optionale Paket paho-mqtt"""
+
+    def __init__(self, host, port=1883, topic='skilift/status', timeout=2.0, name=None):
+        try:
+            import paho.mqtt.client as mqtt
+        except ImportError:
+            raise RuntimeError("MQTT-Ausgabe benötigt das Paket paho-mqtt (pip install paho-mqtt)")
+
+        self.name = name or "mqtt"
+        self.topic = topic
+        self.timeout = timeout
+        if hasattr(mqtt, 'CallbackAPIVersion'):
+            self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+        else:
+            self.client = mqtt.Client()
+        self.client.connect_async(host, port)
+        self.client.loop_start()  # Reconnects übernimmt der Netzwerk-Thread von paho
+
+    def send(self, payload):
+        # retained: neue Abonnenten (z.B. nach Neustart der Steuerung) erhalten sofort den aktuellen Status
+        info = self.client.publish(self.topic, payload, qos=1, retain=True)
+        info.wait_for_publish(timeout=self.timeout)
+        if not info.is_published():
+            raise ConnectionError("MQTT-Broker hat die Meldung nicht bestätigt")
+
+    def close(self):
+        self.client.loop_stop()
+        self.client.disconnect()
+
+def create_sink(sink_config):
+    """Erzeugt eine Ausgabe aus einem Eintrag von alert_output_config['sinks']"""
+    sink_type = sink_config.get('type')
+    host = sink_config.get('host', '127.0.0.1')
+    timeout = sink_config.get('timeout', 2.0)
+    name = sink_config.get('name')
+    if sink_type == 'udp':
+        return UdpSink(host, sink_config['port'], name=name)
+    if sink_type == 'tcp':
+        return TcpSink(host, sink_config['port'], timeout, sink_config.get('expect_ack', False), name=name)
+    if sink_type == 'webhook':
+        return WebhookSink(sink_config['url'], timeout, name=name)
+    if sink_type == 'mqtt':
+        return MqttSink(host, sink_config.get('port', 1883), sink_config.get('topic', 'skilift/status'),
+                        timeout, name=name)
+    raise ValueError(f"Unbekannter Ausgabe-Typ: {sink_type}")
+
+class _SinkWorker:
+    """Zustellung an eine Ausgabe in einem eigenen Thread - nur die neueste Meldung wartet"""
+
+    def __init__(self, publisher, sink):
+        self.publisher = publisher
+        self.sink = sink
+        self.pending = None
+        self.condition = threading.Condition()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name=f"alert-{sink.name}", daemon=True)
+        self.thread.start()
+
+    def submit(self, message):
+        with self.condition:
+            if self.pending is not None:
+                # Noch nicht zugestellter Status ist überholt - nur der aktuelle zählt für die Steuerung
+                self.publisher._inc('alerts_coalesced')
+            self.pending = message
+            self.condition.notify()
+
+    def stop(self):
+        """Signalisiert das Ende - der Thread stellt noch Wartendes einmal zu und schließt danach die Ausgabe"""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+
+    def join(self, timeout):
+        self.thread.join(timeout)
+
+    def _take(self, timeout=None):
+        with self.condition:
+            if self.pending is None and self.running:
+                self.condition.wait(timeout)
+            message, self.pending = self.pending, None
+            return message
+
+    def _run(self):
+        try:
+            self._deliver()
+        finally:
+            try:
+                self.sink.close()
+            except Exception as e:
+                print(f"Alarm-Ausgabe {self.sink.name} konnte nicht geschlossen werden: {e}")
+
+    def _deliver(self):
+        message = None
+        while self.running or message is not None:
+            if message is None:
+                message = self._take()
+                if message is None:
+                    continue
+
+            enqueued_at, payload = message
+            attempt = 0
+            while True:
+                try:
+                    self.sink.send(payload)
+                    self.publisher._observe(f"alert_delivery_{self.sink.name}", time.monotonic() - enqueued_at)
+                    self.publisher._inc('alerts_delivered')
+                    if attempt > self.publisher.max_retries:
+                        print(f"Alarm-Ausgabe {self.sink.name}: nach {attempt} Fehlversuchen zugestellt")
+                    message = None
+                    break
+                except Exception as e:
+                    attempt += 1
+                    if attempt == self.publisher.max_retries + 1:
+                        # Nur melden und zählen - der aktuelle Status darf der Steuerung nicht verloren gehen
+                        print(f"Alarm-Ausgabe {self.sink.name}: Zustellung fehlgeschlagen ({e}), wird weiter versucht")
+                        self.publisher._inc('alert_delivery_failures')
+                    if not self.running:
+                        message = None
+                        break
+                    self.publisher._inc('alert_retries')
+                    # Warten mit begrenztem exponentiellem Backoff - ein neuer Status ersetzt die Wiederholung
+                    delay = min(self.publisher.retry_delay * 2 ** min(attempt - 1, 30), self.publisher.max_retry_delay)
+                    newer = self._take(delay)
+                    if newer is not None:
+                        self.publisher._inc('alerts_coalesced')
+                        message = newer
+                        break
+                    if not self.running:
+                        message = None
+                        break
+
+class AlertPublisher:
+    """Veröffentlicht Lift-Statuswechsel asynchron an mehrere Ausgaben (UDP, TCP, Webhook, MQTT).
+
+    publish() serialisiert nur die Meldung und übergibt sie an einen Thread
+    pro Ausgabe; der Frame-Pfad wartet nie auf das Netzwerk. Fehlgeschlagene
+    Zustellungen werden mit Backoff wiederholt, überholte Meldungen durch
+    den neuesten Status ersetzt. Eine Meldung wird wiederholt, bis sie
+    zugestellt oder durch einen neueren Status überholt ist.
+    """
+
+    def __init__(self, sinks, metrics=None, max_retries=3, retry_delay=0.5, max_retry_delay=5.0):
+        self.metrics = metrics
+        self.max_retries = max_retries  # Ab so vielen Fehlversuchen als fehlgeschlagen gezählt
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max(retry_delay, max_retry_delay)
+        self.sequence = 0
+        self.workers = [_SinkWorker(self, sink) for sink in sinks]
+
+    def publish(self, status_info):
+        """Übergibt einen Statuswechsel (FOIManager.get_status_info()) an alle Ausgaben"""
+        self.sequence += 1
+        message = dict(status_info, sequence=self.sequence, timestamp=time.time())
+        payload = json.dumps(message).encode('utf-8')
+        enqueued_at = time.monotonic()
+        self._inc('alerts_published')
+        for worker in self.workers:
+            worker.submit((enqueued_at, payload))
+
+    def close(self, timeout=0.5):
+        """Versucht noch wartende Meldungen einmal zuzustellen (ohne weitere Wiederholungen) und beendet die Threads.
+
+        Gewartet wird insgesamt höchstens timeout Sekunden; eine Ausgabe, die
+        noch im Versand hängt, beendet sich danach im Hintergrund.
+        """
+        for worker in self.workers:
+            worker.stop()
+        deadline = time.monotonic() + timeout
+        for worker in self.workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+
+    def _inc(self, name):
+        if self.metrics is not None:
+            self.metrics.inc(name)
+
+    def _observe(self, name, value):
+        if self.metrics is not None:
+            self.metrics.observe(name, value)
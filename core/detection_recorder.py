@@ -0,0 +1,247 @@
+import os
+import json
+import glob
+import queue
+import threading
+import numpy as np
+from config.constants import NUM_KEYPOINTS
+
+INDEX_FILE = 'index.jsonl'
+
+class RecordedFrame:
+    """Ein aufgezeichneter Frame: Zeitstempel, Frame-Größe, Detections, Posen und Lift-Status"""
+
+    __slots__ = ('timestamp', 'frame_size', 'detections', 'poses', 'lift_status')
+
+    def __init__(self, timestamp, frame_size, detections, poses, lift_status):
+        self.timestamp = timestamp
+        self.frame_size = frame_size
+        self.detections = detections
+        self.poses = poses
+        self.lift_status = lift_status
+
+def _pose_keypoints(pose):
+    """Keypoints einer Pose als Array (17 x 3: x, y, conf) - ungültige Punkte 0"""
+    keypoints = np.zeros((NUM_KEYPOINTS, 3), dtype=np.float32)
+    xy = pose.get('keypoints_xy')
+    if xy is not None:
+        keypoints[:, :2] = xy
+    for kp in pose.get('keypoints', []):
+        if 0 <= kp['id'] < NUM_KEYPOINTS:
+            if xy is None:
+                keypoints[kp['id'], :2] = (kp['x'], kp['y'])
+            keypoints[kp['id'], 2] = kp['conf']
+    return keypoints
+
+class FrameChunk:
+    """Sammelt Ergebnisse pro Frame spaltenweise im Speicher (Format der Aufzeichnungs-Blöcke)"""
+
+    def __init__(self):
+        self.timestamps = []
+        self.frame_sizes = []
+        self.lift_status = []
+        self.det_counts = []
+        self.boxes = []
+        self.classes = []
+        self.confs = []
+        self.track_ids = []
+        self.pose_counts = []
+        self.pose_det_index = []
+        self.keypoints = []
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def add(self, timestamp, frame_size, detections, poses, lift_status=''):
+        """Hängt einen Frame an (nur Umwandlung in Listen)"""
+        self.timestamps.append(timestamp)
+        self.frame_sizes.append(frame_size)
+        self.lift_status.append(lift_status)
+
+        det_index = {}
+        for i, detection in enumerate(detections):
+            box = detection['box']
+            det_index[id(box)] = i
+            self.boxes.append((box['x1'], box['y1'], box['x2'], box['y2']))
+            self.classes.append(detection['class_id'])
+            self.confs.append(detection['conf'])
+            track_id = detection.get('track_id')
+            self.track_ids.append(track_id if track_id is not None else -1)
+        self.det_counts.append(len(detections))
+
+        for pose in poses:
+            # Zuordnung zur Detection, aus deren Ausschnitt die Pose stammt
+            self.pose_det_index.append(det_index.get(id(pose.get('detection_box')), -1))
+            self.keypoints.append(_pose_keypoints(pose))
+        self.pose_counts.append(len(poses))
+
+    def to_arrays(self):
+        """Spaltenweise Arrays (Offsets im CSR-Stil für Detections und Posen pro Frame)"""
+        return {
+            'timestamps': np.asarray(self.timestamps, dtype=np.float64),
+            'frame_sizes': np.asarray(self.frame_sizes, dtype=np.int32).reshape(-1, 2),
+            'lift_status': np.asarray(self.lift_status, dtype=str),
+            'det_offsets': np.concatenate([[0], np.cumsum(self.det_counts, dtype=np.int64)]),
+            'boxes': np.asarray(self.boxes, dtype=np.float32).reshape(-1, 4),
+            'classes': np.asarray(self.classes, dtype=np.int32),
+            'confs': np.asarray(self.confs, dtype=np.float32),
+            'track_ids': np.asarray(self.track_ids, dtype=np.int32),
+            'pose_offsets': np.concatenate([[0], np.cumsum(self.pose_counts, dtype=np.int64)]),
+            'pose_det_index': np.asarray(self.pose_det_index, dtype=np.int32),
+            'keypoints': np.asarray(self.keypoints, dtype=np.float32).reshape(-1, NUM_KEYPOINTS, 3)
+        }
+
+class DetectionRecorder:
+    """Zeichnet die Ergebnisse pro Frame append-only auf: Boxen, Klassen, Konfidenzen, Keypoints und Lift-Status.
+
+    Frames werden im Speicher gesammelt und alle chunk_frames Frames als
+    komprimierte .npz-Datei von einem Hintergrund-Thread geschrieben; jede
+    fertige Datei wird mit ihrem Zeitbereich an index.jsonl angehängt.
+    """
+
+    def __init__(self, output_dir, chunk_frames=512):
+        self.output_dir = output_dir
+        self.chunk_frames = max(1, int(chunk_frames))
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Fortsetzen einer bestehenden Aufzeichnung: neue Blöcke hinter den vorhandenen
+        self.next_chunk = len(glob.glob(os.path.join(output_dir, 'chunk_*.npz')))
+        self.chunk = FrameChunk()
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def record(self, timestamp, frame_size, detections, poses, lift_status):
+        """Nimmt einen Frame auf (nur Umwandlung in Listen - Kompression und Schreiben im Hintergrund)"""
+        self.chunk.add(timestamp, frame_size, detections, poses, lift_status)
+        if len(self.chunk) >= self.chunk_frames:
+            self.flush()
+
+    def flush(self):
+        """Übergibt die gesammelten Frames an den Schreib-Thread"""
+        if not len(self.chunk):
+            return
+        self._queue.put((self.next_chunk, self.chunk))
+        self.next_chunk += 1
+        self.chunk = FrameChunk()
+
+    def close(self):
+        """Schreibt die restlichen Frames und beendet den Schreib-Thread"""
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            chunk_idx, chunk = item
+            try:
+                self._write_chunk(chunk_idx, chunk)
+            except Exception as e:
+                print(f"Fehler beim Schreiben der Aufzeichnung: {e}")
+
+    def _write_chunk(self, chunk_idx, chunk):
+        arrays = chunk.to_arrays()
+        file_name = f"chunk_{chunk_idx:06d}.npz"
+        path = os.path.join(self.output_dir, file_name)
+
+        # Erst vollständig schreiben, dann umbenennen und im Index eintragen
+        temp_path = path + ".tmp.npz"
+        np.savez_compressed(temp_path, **arrays)
+        os.replace(temp_path, path)
+
+        entry = {
+            'file': file_name,
+            'start': float(arrays['timestamps'][0]),
+            'end': float(arrays['timestamps'][-1]),
+            'frames': len(chunk)
+        }
+        with open(os.path.join(self.output_dir, INDEX_FILE), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+
+class DetectionRecording:
+    """Liest eine Aufzeichnung des DetectionRecorder - Blöcke werden über den Zeitindex ausgewählt"""
+
+    def __init__(self, path, class_config=None):
+        self.path = path
+        self.class_config = class_config or {}
+        self.chunks = self._read_index()
+
+    def _read_index(self):
+        """Liest index.jsonl (eine evtl. abgeschnittene letzte Zeile wird übersprungen)"""
+        index_path = os.path.join(self.path, INDEX_FILE)
+        chunks = []
+        if os.path.exists(index_path):
+            with open(index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        chunks.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        print(f"Unvollständiger Index-Eintrag in {index_path} übersprungen")
+        return sorted(chunks, key=lambda entry: entry['start'])
+
+    def time_range(self):
+        """Erster und letzter Zeitstempel der Aufzeichnung (None ohne Daten)"""
+        if not self.chunks:
+            return None
+        return self.chunks[0]['start'], max(entry['end'] for entry in self.chunks)
+
+    def frame_count(self):
+        """Anzahl aufgezeichneter Frames laut Index"""
+        return sum(entry['frames'] for entry in self.chunks)
+
+    def frames(self, start=None, end=None):
+        """Liefert die Frames (RecordedFrame) im Zeitbereich [start, end] in Aufnahmereihenfolge"""
+        for entry in self.chunks:
+            if (start is not None and entry['end'] < start) or (end is not None and entry['start'] > end):
+                continue
+            with np.load(os.path.join(self.path, entry['file'])) as data:
+                arrays = {name: data[name] for name in data.files}
+            yield from decode_frames(arrays, self.class_config, start, end)
+
+def decode_frames(arrays, class_config, start=None, end=None):
+    """Baut die Detection- und Pose-Dictionaries eines Blocks (FrameChunk.to_arrays) wieder auf"""
+    timestamps = arrays['timestamps']
+    det_offsets, pose_offsets = arrays['det_offsets'], arrays['pose_offsets']
+    boxes = arrays['boxes'].astype(np.int64).tolist()
+    classes = arrays['classes'].tolist()
+    confs = arrays['confs'].tolist()
+    track_ids = arrays['track_ids'].tolist()
+    keypoints = arrays['keypoints']
+    pose_det_index = arrays['pose_det_index'].tolist()
+
+    for frame_idx, timestamp in enumerate(timestamps.tolist()):
+        if (start is not None and timestamp < start) or (end is not None and timestamp > end):
+            continue
+
+        detections = []
+        for i in range(det_offsets[frame_idx], det_offsets[frame_idx + 1]):
+            x1, y1, x2, y2 = boxes[i]
+            cls = classes[i]
+            detections.append({
+                'box': {'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2},
+                'conf': confs[i],
+                'class_id': cls,
+                'class_name': class_config.get(str(cls), {}).get('name', f"Class {cls}"),
+                'track_id': track_ids[i] if track_ids[i] >= 0 else None
+            })
+
+        poses = []
+        first_pose = pose_offsets[frame_idx]
+        for i in range(first_pose, pose_offsets[frame_idx + 1]):
+            det_idx = pose_det_index[i]
+            detection = detections[det_idx] if 0 <= det_idx < len(detections) else None
+            valid_ids = np.flatnonzero(keypoints[i, :, 2] > 0)
+            poses.append({
+                'person_id': f"{detection['class_id'] if detection else -1}_{i - first_pose}",
+                'detection_box': detection['box'] if detection else None,
+                'keypoints': [{'id': int(k), 'x': float(keypoints[i, k, 0]), 'y': float(keypoints[i, k, 1]),
+                               'conf': float(keypoints[i, k, 2])} for k in valid_ids],
+                'keypoints_xy': keypoints[i, :, :2].astype(np.float64)
+            })
+
+        frame_size = tuple(int(v) for v in arrays['frame_sizes'][frame_idx])
+        yield RecordedFrame(timestamp, frame_size, detections, poses, str(arrays['lift_status'][frame_idx]))
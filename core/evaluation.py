@@ -0,0 +1,189 @@
+import os
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+def find_dataset_images(dataset_dir):
+    """Sucht Bilder mit YOLO-Labels: <split>/images + <split>/labels oder Bild und .txt im selben Ordner"""
+    images_dir = os.path.join(dataset_dir, 'images')
+    if os.path.isdir(images_dir):
+        labels_dir = os.path.join(dataset_dir, 'labels')
+    else:
+        images_dir = labels_dir = dataset_dir
+
+    samples = []
+    for file_name in sorted(os.listdir(images_dir)):
+        if not file_name.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        label_path = os.path.join(labels_dir, os.path.splitext(file_name)[0] + '.txt')
+        samples.append((os.path.join(images_dir, file_name), label_path))
+    return samples
+
+def load_yolo_labels(label_path, width, height):
+    """Lädt YOLO-Labels (cls cx cy w h, relativ) als Array (N x 5): cls, x1, y1, x2, y2 in Pixeln"""
+    if not os.path.exists(label_path):
+        return np.zeros((0, 5), dtype=np.float64)
+
+    rows = np.loadtxt(label_path, dtype=np.float64, ndmin=2)
+    if rows.size == 0:
+        return np.zeros((0, 5), dtype=np.float64)
+
+    rows = rows[:, :5]
+    cx, cy = rows[:, 1] * width, rows[:, 2] * height
+    half_w, half_h = rows[:, 3] * width / 2, rows[:, 4] * height / 2
+    return np.stack([rows[:, 0], cx - half_w, cy - half_h, cx + half_w, cy + half_h], axis=1)
+
+def box_iou(boxes_a, boxes_b):
+    """Paarweise IoU zweier Box-Arrays (N x 4, M x 4 im Format x1, y1, x2, y2) -> N x M"""
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return np.zeros((len(boxes_a), len(boxes_b)), dtype=np.float64)
+
+    x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return np.where(union > 0, intersection / np.maximum(union, 1e-12), 0.0)
+
+def match_detections(pred_boxes, pred_scores, gt_boxes, match_iou=0.5):
+    """Greedy-Zuordnung nach absteigender Konfidenz -> True-Positive-Flags je Vorhersage.
+
+    Da die Zuordnung in Konfidenz-Reihenfolge erfolgt, ist sie für jede
+    Konfidenz-Schwelle ein Präfix - TP/FP lassen sich kumulativ auswerten.
+    Vektorisiert in Runden: alle offenen Vorhersagen wählen gleichzeitig
+    ihre beste freie Ground-Truth-Box; bis zur ersten Vorhersage, deren
+    Wahl schon eine höher bewertete getroffen hat, entspricht das exakt der
+    sequentiellen Zuordnung. Runden gibt es so viele wie Konflikte.
+    """
+    true_positive = np.zeros(len(pred_boxes), dtype=bool)
+    if len(pred_boxes) == 0 or len(gt_boxes) == 0:
+        return true_positive
+
+    order = np.argsort(-pred_scores, kind='stable')
+    ious = box_iou(pred_boxes[order], gt_boxes)
+    gt_used = np.zeros(len(gt_boxes), dtype=bool)
+    matched = np.zeros(len(order), dtype=bool)
+    start = 0  # Vorhersagen vor start sind entschieden
+    while start < len(order):
+        candidate_ious = np.where(gt_used[None, :], -1.0, ious[start:])
+        best = np.argmax(candidate_ious, axis=1)
+        valid = candidate_ious[np.arange(len(best)), best] >= match_iou
+
+        # Erste Vorhersage, deren Ground-Truth-Box eine höher bewertete in dieser Runde gewählt hat
+        positions = np.flatnonzero(valid)
+        choices = best[positions]
+        by_choice = np.argsort(choices, kind='stable')
+        duplicate = choices[by_choice[1:]] == choices[by_choice[:-1]]
+        end = int(positions[by_choice[1:][duplicate]].min()) if duplicate.any() else len(best)
+
+        resolved = positions[positions < end]
+        matched[start + resolved] = True
+        gt_used[best[resolved]] = True
+        start += end
+
+    true_positive[order[matched]] = True
+    return true_positive
+
+def match_detections_batched(pred_image_index, pred_boxes, pred_scores, gt_image_index, gt_boxes, match_iou=0.5):
+    """Greedy-Zuordnung wie match_detections, aber für alle Bilder gleichzeitig -> True-Positive-Flags.
+
+    Die IoU wird nur für Paare aus demselben Bild berechnet, Paare unter
+    match_iou fallen sofort weg. Jede Runde wählt jede offene Vorhersage ihre
+    beste freie Ground-Truth-Box; pro Bild gilt die Wahl bis zur ersten
+    Vorhersage, deren Box eine höher bewertete desselben Bilds gewählt hat.
+    Runden gibt es so viele wie Konflikte im konfliktreichsten Bild.
+    """
+    true_positive = np.zeros(len(pred_boxes), dtype=bool)
+    if len(pred_boxes) == 0 or len(gt_boxes) == 0:
+        return true_positive
+
+    # Vorhersagen nach Bild und absteigendem Score, Ground Truth stabil nach Bild
+    order = np.lexsort((-pred_scores, pred_image_index))
+    pred_image = pred_image_index[order]
+    gt_order = np.argsort(gt_image_index, kind='stable')
+    gt_image = gt_image_index[gt_order]
+    num_images = int(max(pred_image.max(), gt_image.max())) + 1
+    gt_count = np.bincount(gt_image, minlength=num_images)
+    gt_start = np.concatenate([[0], np.cumsum(gt_count)[:-1]])
+
+    # Alle Paare (Vorhersage, Ground Truth desselben Bilds)
+    pairs_per_pred = gt_count[pred_image]
+    pair_pred = np.repeat(np.arange(len(order)), pairs_per_pred)
+    pair_offset = np.arange(len(pair_pred)) - np.repeat(np.cumsum(pairs_per_pred) - pairs_per_pred, pairs_per_pred)
+    pair_gt = gt_start[pred_image][pair_pred] + pair_offset
+
+    boxes_a, boxes_b = pred_boxes[order][pair_pred], gt_boxes[gt_order][pair_gt]
+    intersection = (np.clip(np.minimum(boxes_a[:, 2], boxes_b[:, 2]) - np.maximum(boxes_a[:, 0], boxes_b[:, 0]), 0, None) *
+                    np.clip(np.minimum(boxes_a[:, 3], boxes_b[:, 3]) - np.maximum(boxes_a[:, 1], boxes_b[:, 1]), 0, None))
+    union = ((boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1]) +
+             (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1]) - intersection)
+    pair_iou = np.where(union > 0, intersection / np.maximum(union, 1e-12), 0.0)
+
+    candidate = pair_iou >= match_iou
+    pair_pred, pair_gt, pair_iou = pair_pred[candidate], pair_gt[candidate], pair_iou[candidate]
+    # Pro Vorhersage die beste Box zuerst, bei Gleichstand die erste (wie argmax)
+    pair_order = np.lexsort((pair_gt, -pair_iou, pair_pred))
+    pair_pred, pair_gt = pair_pred[pair_order], pair_gt[pair_order]
+
+    gt_used = np.zeros(len(gt_boxes), dtype=bool)
+    matched = np.zeros(len(order), dtype=bool)
+    while len(pair_pred):
+        # Beste freie Box jeder offenen Vorhersage (erstes Paar pro Vorhersage)
+        choosers, first = np.unique(pair_pred, return_index=True)
+        choices = pair_gt[first]
+
+        # Konflikt: Box wurde schon von einer höher bewerteten Vorhersage gewählt (choosers sind sortiert)
+        _, first_choice = np.unique(choices, return_index=True)
+        conflict = np.ones(len(choosers), dtype=bool)
+        conflict[first_choice] = False
+        end = np.full(num_images, len(order))
+        np.minimum.at(end, pred_image[choosers[conflict]], choosers[conflict])
+
+        resolved = choosers < end[pred_image[choosers]]
+        matched[choosers[resolved]] = True
+        gt_used[choices[resolved]] = True
+
+        open_pairs = ~matched[pair_pred] & ~gt_used[pair_gt]
+        pair_pred, pair_gt = pair_pred[open_pairs], pair_gt[open_pairs]
+
+    true_positive[order[matched]] = True
+    return true_positive
+
+def cumulative_counts(scores, true_positive, conf_thresholds):
+    """TP und FP je Konfidenz-Schwelle aus sortierten Scores (vektorisiert über alle Schwellen)"""
+    order = np.argsort(-scores, kind='stable')
+    sorted_scores = scores[order]
+    tp_cumsum = np.concatenate([[0], np.cumsum(true_positive[order])])
+
+    # Anzahl Vorhersagen mit score >= Schwelle (Scores absteigend sortiert)
+    counts = np.searchsorted(-sorted_scores, -np.asarray(conf_thresholds), side='right')
+    tp = tp_cumsum[counts]
+    return tp, counts - tp
+
+def f1_scores(tp, fp, fn):
+    """F1 aus TP/FP/FN-Arrays (0 wenn undefiniert)"""
+    tp = np.asarray(tp, dtype=np.float64)
+    denominator = 2 * tp + fp + fn
+    return np.where(denominator > 0, 2 * tp / np.maximum(denominator, 1e-12), 0.0)
+
+def average_precision(scores, true_positive, num_gt):
+    """Average Precision (alle Punkte interpoliert, wie VOC) aus Scores und TP-Flags"""
+    if num_gt == 0 or len(scores) == 0:
+        return 0.0
+
+    order = np.argsort(-np.asarray(scores), kind='stable')
+    tp = np.cumsum(np.asarray(true_positive)[order])
+    fp = np.cumsum(~np.asarray(true_positive)[order])
+    recall = tp / num_gt
+    precision = tp / np.maximum(tp + fp, 1)
+
+    # Präzisions-Hüllkurve (monoton fallend) und Fläche unter der PR-Kurve
+    recall = np.concatenate([[0.0], recall, [1.0]])
+    precision = np.concatenate([[1.0], precision, [0.0]])
+    precision = np.maximum.accumulate(precision[::-1])[::-1]
+    steps = np.flatnonzero(recall[1:] != recall[:-1])
+    return float(np.sum((recall[steps + 1] - recall[steps]) * precision[steps + 1]))
@@ -2,12 +2,18 @@ import cv2
 import numpy as np
 import time
 from config.constants import FOI_CORNER_SIZE, FOI_CORNER_COLOR, FOI_HOVER_COLOR
+from core.overlay_cache import to_layer_color
+
+# Anzeigedauer von "Lift wieder auf Normalgeschwindigkeit" vor dem Wechsel zu Normalbetrieb
+NORMAL_SPEED_DISPLAY_SECONDS = 3.0
 
 class FOIManager:
     """Verwaltet das Field of Interest (FOI) für die Skilift-Überwachung"""
     
-    def __init__(self, foi_config):
+    def __init__(self, foi_config, clock=None):
         self.foi_config = foi_config
+        # Zeitquelle (Sekunden) - für die Wiedergabe aufgezeichneter Detections austauschbar
+        self.clock = clock or time.time
         self.frame_width = 1
         self.frame_height = 1
         
@@ -20,6 +26,7 @@ class FOIManager:
         self.alert_start_time = None
         self.alert_active = False
         self.manual_reset_requested = False  # NEU: Flag für manuellen Reset
+        self.normal_reset_at = None  # Zeitpunkt für den Wechsel "Normalgeschwindigkeit" -> "Normalbetrieb"
         
         # Zählung und Erkennung
         self.current_count = 0
@@ -34,12 +41,14 @@ class FOIManager:
         self.frame_width = width
         self.frame_height = height
         
-    def get_absolute_points(self):
-        """Konvertiert relative FOI-Punkte zu absoluten Bildkoordinaten"""
+    def get_absolute_points(self, width=None, height=None):
+        """Konvertiert relative FOI-Punkte zu absoluten Bildkoordinaten (Standard: Frame-Auflösung)"""
+        if width is None or height is None:
+            width, height = self.frame_width, self.frame_height
         points = []
         for rel_point in self.foi_config['points']:
-            x = int(rel_point[0] * self.frame_width)
-            y = int(rel_point[1] * self.frame_height)
+            x = int(rel_point[0] * width)
+            y = int(rel_point[1] * height)
             points.append([x, y])
         return np.array(points, dtype=np.int32)
     
@@ -55,12 +64,12 @@ class FOIManager:
         """Überprüft ob ein Punkt im Polygon liegt"""
         return cv2.pointPolygonTest(polygon, point, False) >= 0
     
-    def get_corner_at_position(self, x, y):
-        """Findet die Ecke an der gegebenen Position"""
+    def get_corner_at_position(self, x, y, tolerance=FOI_CORNER_SIZE):
+        """Findet die Ecke an der gegebenen Position (tolerance in Frame-Pixeln)"""
         points = self.get_absolute_points()
         for i, point in enumerate(points):
             distance = np.sqrt((x - point[0])**2 + (y - point[1])**2)
-            if distance <= FOI_CORNER_SIZE:
+            if distance <= tolerance:
                 return i
         return -1
     
@@ -125,7 +134,8 @@ class FOIManager:
                     break
         
         # Status-Management - VERBESSERT
-        current_time = time.time()
+        current_time = self.clock()
+        self._apply_pending_reset(current_time)
         
         # Manueller Reset wurde angefordert
         if self.manual_reset_requested:
@@ -149,7 +159,7 @@ class FOIManager:
                     # VERBESSERUNG: Vollständiger Reset zu Normalbetrieb
                     self.lift_status = "Lift wieder auf Normalgeschwindigkeit"
                     # Timer für kurze Anzeige, dann Reset zu Normalbetrieb
-                    self._schedule_normal_reset()
+                    self._schedule_normal_reset(current_time)
                 else:
                     # Zeit überschritten, Status bleibt "gestoppt" bis manueller Reset
                     pass
@@ -160,17 +170,23 @@ class FOIManager:
         
         self.alert_object_in_foi = alert_object_found
     
-    def _schedule_normal_reset(self):
+    def _schedule_normal_reset(self, current_time):
         """Hilfsmethode: Plant Reset zu Normalbetrieb nach kurzer Anzeige"""
-        # Nach 3 Sekunden "Normalgeschwindigkeit" zurück zu "Normalbetrieb"
-        import threading
-        def delayed_reset():
-            time.sleep(3.0)
+        # Nach 3 Sekunden "Normalgeschwindigkeit" zurück zu "Normalbetrieb" - zeitbasiert statt
+        # über einen Thread, damit die Logik auch mit der Wiedergabe-Uhr stimmt
+        if self.normal_reset_at is None:
+            self.normal_reset_at = current_time + NORMAL_SPEED_DISPLAY_SECONDS
+    
+    def _apply_pending_reset(self, current_time=None):
+        """Führt einen fälligen Reset zu Normalbetrieb aus"""
+        if self.normal_reset_at is None:
+            return
+        if current_time is None:
+            current_time = self.clock()
+        if current_time >= self.normal_reset_at:
             if self.lift_status == "Lift wieder auf Normalgeschwindigkeit":
                 self._reset_to_normal()
-        
-        reset_thread = threading.Thread(target=delayed_reset, daemon=True)
-        reset_thread.start()
+            self.normal_reset_at = None
     
     def _reset_to_normal(self):
         """NEUE METHODE: Setzt alle Timer und Status zurück auf Normalbetrieb"""
@@ -178,6 +194,7 @@ class FOIManager:
         self.alert_active = False
         self.alert_start_time = None
         self.alert_object_in_foi = False
+        self.normal_reset_at = None
     
     def manual_reset(self):
         """NEUE METHODE: Ermöglicht manuellen Reset des Lift-Status"""
@@ -190,7 +207,7 @@ class FOIManager:
         if not self.alert_active or not self.alert_start_time:
             return None
         
-        current_time = time.time()
+        current_time = self.clock()
         elapsed = current_time - self.alert_start_time
         timeout = self.foi_config.get('alert_timeout', 10.0)
         remaining = timeout - elapsed
@@ -202,17 +219,33 @@ class FOIManager:
         if not self.alert_active or not self.alert_start_time:
             return 0
         
-        current_time = time.time()
+        current_time = self.clock()
         return current_time - self.alert_start_time
     
+    def overlay_geometry_key(self):
+        """Schlüssel der FOI-Geometrie für den Overlay-Cache - ändert sich nur bei Konfig-/Maus-Änderungen"""
+        if not self.foi_config.get('enabled', False):
+            return None
+        return (
+            tuple(tuple(point) for point in self.foi_config['points']),
+            self.hover_corner,
+            self.dragging_corner,
+            tuple(self.foi_config.get('foi_color', (0, 255, 255))),
+            self.foi_config.get('foi_thickness', 3)
+        )
+    
+    def draw_overlay_geometry(self, layer):
+        """Zeichnet die FOI-Geometrie auf eine (BGRA-)Overlay-Ebene"""
+        self.draw_foi_on_frame(layer)
+    
     def draw_foi_on_frame(self, frame):
         """Zeichnet das FOI auf den Frame"""
         if not self.foi_config.get('enabled', False):
             return frame
             
-        # FOI-Polygon zeichnen
-        points = self.get_absolute_points()
-        foi_color = self.foi_config.get('foi_color', (0, 255, 255))
+        # FOI-Polygon in der Auflösung des Ziel-Frames zeichnen (Quell- oder Anzeigeauflösung)
+        points = self.get_absolute_points(frame.shape[1], frame.shape[0])
+        foi_color = to_layer_color(self.foi_config.get('foi_color', (0, 255, 255)), frame)
         foi_thickness = self.foi_config.get('foi_thickness', 3)
         
         # Polygon-Linien zeichnen
@@ -230,17 +263,27 @@ class FOIManager:
                 color = foi_color
                 size = FOI_CORNER_SIZE
                 
-            cv2.circle(frame, tuple(point), size, color, -1)
-            cv2.circle(frame, tuple(point), size, (0, 0, 0), 2)  # Schwarzer Rand
+            center = tuple(int(c) for c in point)
+            cv2.circle(frame, center, size, to_layer_color(color, frame), -1)
+            cv2.circle(frame, center, size, to_layer_color((0, 0, 0), frame), 2)  # Schwarzer Rand
         
         return frame
     
     def draw_count_display(self, frame):
         """Zeichnet die Objektzählung und Timer-Info oberhalb des FOI - ERWEITERT"""
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        text_items = self.overlay_text_items(frame.shape[1], frame.shape[0])
+        for text, center_x, y, font_scale, thickness, text_color, bg_color in text_items:
+            self._draw_text_with_background(frame, text, center_x, y, font, font_scale, thickness, text_color, bg_color)
+        return frame
+    
+    def overlay_text_items(self, width=None, height=None):
+        """Gibt die Textelemente oberhalb des FOI zurück: (text, center_x, y, font_scale, thickness, text_color, bg_color)"""
         if not self.foi_config.get('enabled', False):
-            return frame
+            return []
             
-        points = self.get_absolute_points()
+        items = []
+        points = self.get_absolute_points(width, height)
         
         # Finde den höchsten Punkt (kleinste Y-Koordinate)
         top_y = min(point[1] for point in points)
@@ -248,9 +291,8 @@ class FOIManager:
         
         # Text-Position oberhalb des FOI
         text_x = center_x
-        base_y = max(50, top_y - 20)
+        base_y = max(50, int(top_y) - 20)
         
-        font = cv2.FONT_HERSHEY_SIMPLEX
         font_scale = 0.8
         thickness = 2
         
@@ -258,7 +300,7 @@ class FOIManager:
         count_class = self.foi_config.get('count_class')
         if count_class:
             count_text = f"Personen im FOI: {self.current_count}"
-            self._draw_text_with_background(frame, count_text, text_x, base_y, font, font_scale, thickness, (255, 255, 255), (0, 0, 0))
+            items.append((count_text, text_x, base_y, font_scale, thickness, (255, 255, 255), (0, 0, 0)))
             
         # Timer-Info hinzufügen wenn Alert aktiv
         if self.alert_active and self.alert_start_time:
@@ -267,13 +309,13 @@ class FOIManager:
                 timer_text = f"Lift-Stopp in: {remaining:.1f}s"
                 timer_y = base_y + 35 if count_class else base_y
                 timer_color = (0, 255, 255) if remaining > 5 else (0, 0, 255)  # Gelb oder Rot
-                self._draw_text_with_background(frame, timer_text, text_x, timer_y, font, font_scale - 0.1, thickness, timer_color, (0, 0, 0))
+                items.append((timer_text, text_x, timer_y, font_scale - 0.1, thickness, timer_color, (0, 0, 0)))
             elif "gestoppt" in self.lift_status:
                 timer_text = "Lift gestoppt - Manueller Reset erforderlich"
                 timer_y = base_y + 35 if count_class else base_y
-                self._draw_text_with_background(frame, timer_text, text_x, timer_y, font, font_scale - 0.1, thickness, (0, 0, 255), (0, 0, 0))
+                items.append((timer_text, text_x, timer_y, font_scale - 0.1, thickness, (0, 0, 255), (0, 0, 0)))
         
-        return frame
+        return items
     
     def _draw_text_with_background(self, frame, text, center_x, y, font, font_scale, thickness, text_color, bg_color):
         """Hilfsmethode: Zeichnet Text mit Hintergrund"""
@@ -295,6 +337,7 @@ class FOIManager:
     
     def get_lift_status(self):
         """Gibt den aktuellen Lift-Status zurück"""
+        self._apply_pending_reset()
         return self.lift_status
     
     def reset_status(self):
@@ -308,7 +351,7 @@ class FOIManager:
     def get_status_info(self):
         """NEUE METHODE: Gibt detaillierte Status-Informationen zurück"""
         info = {
-            'status': self.lift_status,
+            'status': self.get_lift_status(),
             'alert_active': self.alert_active,
             'alert_duration': self.get_alert_duration(),
             'remaining_timeout': self.get_remaining_timeout_seconds(),
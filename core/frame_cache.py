@@ -0,0 +1,261 @@
+import os
+import json
+import glob
+import hashlib
+import cv2
+import numpy as np
+
+class FrameCache:
+    """Cache dekodierter Frames kurzer Clips als Rohdatei (uint8, N x H x W x 3) für Memory-Mapping.
+
+    Beim ersten Durchlauf wird der Clip normal dekodiert und nebenbei in die
+    Rohdatei geschrieben; weitere Durchläufe lesen die Frames ohne Kopie aus
+    der gemappten Datei. Größe und Änderungszeit der Quelle stehen in den
+    Metadaten - ändert sich die Quelle, wird der Eintrag neu aufgebaut.
+    """
+
+    def __init__(self, cache_dir, max_bytes, max_width=0):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_width = int(max_width or 0)  # 0 = Originalauflösung
+        self._in_use = set()  # Rohdateien offener Captures (werden nicht verdrängt)
+
+    def open(self, video_path):
+        """Liefert ein Capture mit read()/get()/release() wie cv2.VideoCapture"""
+        key = self._key(video_path)
+        raw_path = os.path.join(self.cache_dir, f"{key}.raw")
+        meta_path = os.path.join(self.cache_dir, f"{key}.json")
+
+        meta = self._valid_meta(video_path, raw_path, meta_path)
+        if meta is not None:
+            try:
+                os.utime(meta_path)  # Für die LRU-Reihenfolge als verwendet markieren
+                return MemmapCapture(self, raw_path, meta)
+            except (OSError, ValueError) as e:
+                print(f"Frame-Cache {raw_path} nicht lesbar, wird neu aufgebaut: {e}")
+
+        cap = cv2.VideoCapture(video_path)
+        estimated = self._estimate_bytes(cap)
+        if estimated is None or estimated > self.max_bytes:
+            # Zu lang für den Cache (oder unbekannte Länge) - normal dekodieren
+            return cap
+        self._remove(raw_path, meta_path)
+        self.evict(self.max_bytes - estimated)
+        return CachingCapture(self, cap, video_path, raw_path, meta_path)
+
+    def _key(self, video_path):
+        source = f"{os.path.abspath(video_path)}|{self.max_width}"
+        name = os.path.splitext(os.path.basename(video_path))[0]
+        return f"{name}_{hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]}"
+
+    def _source_stat(self, video_path):
+        stat = os.stat(video_path)
+        return {'source_size': stat.st_size, 'source_mtime_ns': stat.st_mtime_ns}
+
+    def _valid_meta(self, video_path, raw_path, meta_path):
+        """Metadaten eines vollständigen Eintrags, der zur aktuellen Quelldatei passt (sonst None)"""
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            source_stat = self._source_stat(video_path)
+            expected_size = meta['frames'] * meta['height'] * meta['width'] * 3
+            if os.path.getsize(raw_path) != expected_size:
+                return None
+        except (OSError, ValueError, KeyError):
+            return None
+        if any(meta.get(name) != value for name, value in source_stat.items()):
+            return None
+        if meta.get('max_width', 0) != self.max_width:
+            return None
+        return meta
+
+    def output_size(self, width, height):
+        """Größe der gecachten Frames (Breite, Höhe) - bei max_width proportional verkleinert"""
+        if self.max_width and width > self.max_width:
+            return self.max_width, max(1, int(round(height * self.max_width / width)))
+        return width, height
+
+    def _estimate_bytes(self, cap):
+        frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if frames <= 0 or width <= 0 or height <= 0:
+            return None
+        width, height = self.output_size(width, height)
+        return frames * width * height * 3
+
+    def _remove(self, *paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Frame-Cache {path} konnte nicht gelöscht werden: {e}")
+
+    def evict(self, max_bytes=None):
+        """Löscht die am längsten nicht verwendeten Einträge, bis die Gesamtgröße max_bytes nicht übersteigt"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = []
+        for meta_path in glob.glob(os.path.join(self.cache_dir, '*.json')):
+            raw_path = meta_path[:-len('.json')] + '.raw'
+            try:
+                entries.append((os.stat(meta_path).st_mtime, os.path.getsize(raw_path), raw_path, meta_path))
+            except OSError:
+                continue
+
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, raw_path, meta_path in sorted(entries):
+            if total <= max_bytes:
+                break
+            if raw_path in self._in_use:
+                continue
+            self._remove(meta_path, raw_path)
+            total -= size
+
+class MemmapCapture:
+    """Liest die Frames eines vollständigen Cache-Eintrags als Views in die gemappte Rohdatei"""
+
+    def __init__(self, cache, raw_path, meta):
+        self.cache = cache
+        self.raw_path = raw_path
+        self.max_width = meta.get('max_width', 0)
+        self.fps = meta.get('fps', 0.0)
+        self.frames = np.memmap(raw_path, dtype=np.uint8, mode='r',
+                                shape=(meta['frames'], meta['height'], meta['width'], 3))
+        self.position = 0
+        cache._in_use.add(raw_path)
+
+    def isOpened(self):
+        return self.frames is not None
+
+    def read(self):
+        """Nächster Frame (schreibgeschützte View, keine Kopie) - (False, None) am Ende"""
+        if self.frames is None or self.position >= len(self.frames):
+            return False, None
+        frame = self.frames[self.position]
+        self.position += 1
+        return True, frame
+
+    def get(self, prop):
+        if self.frames is None:
+            return 0.0
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.frames))
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.frames.shape[2])
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.frames.shape[1])
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+        return 0.0
+
+    def release(self):
+        self.frames = None
+        self.cache._in_use.discard(self.raw_path)
+
+class CachingCapture:
+    """Dekodiert mit cv2.VideoCapture und schreibt die Frames nebenbei in den Cache.
+
+    Erst wenn der Clip bis zum Ende gelesen wurde, wird die Rohdatei
+    umbenannt und die Metadaten geschrieben; ein abgebrochener Durchlauf
+    hinterlässt keinen Eintrag.
+    """
+
+    def __init__(self, cache, cap, video_path, raw_path, meta_path):
+        self.cache = cache
+        self.cap = cap
+        self.video_path = video_path
+        self.raw_path = raw_path
+        self.meta_path = meta_path
+        self.max_width = cache.max_width
+        self.temp_path = raw_path + '.tmp'
+        self.frame_size = None
+        self.frames = 0
+        self.written = 0
+        try:
+            os.makedirs(cache.cache_dir, exist_ok=True)
+            self.file = open(self.temp_path, 'wb')
+        except OSError as e:
+            print(f"Frame-Cache nicht verfügbar: {e}")
+            self.file = None
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            self._finish()
+            return ret, frame
+
+        height, width = frame.shape[:2]
+        target_size = self.cache.output_size(width, height)
+        if target_size != (width, height):
+            frame = cv2.resize(frame, target_size, interpolation=cv2.INTER_AREA)
+        if self.file is not None:
+            self._write(frame)
+        return ret, frame
+
+    def _write(self, frame):
+        if self.frame_size is None:
+            self.frame_size = frame.shape[:2]
+        if frame.shape[:2] != self.frame_size or self.written + frame.nbytes > self.cache.max_bytes:
+            # Wechselnde Auflösung oder Längenangabe des Containers zu klein - nicht cachen
+            self._abort()
+            return
+        try:
+            self.file.write(np.ascontiguousarray(frame).data)
+            self.frames += 1
+            self.written += frame.nbytes
+        except OSError as e:
+            print(f"Fehler beim Schreiben des Frame-Cache: {e}")
+            self._abort()
+
+    def _finish(self):
+        """Vollständig gelesen: Rohdatei übernehmen und Metadaten schreiben"""
+        if self.file is None:
+            return
+        self.file.close()
+        self.file = None
+        if not self.frames:
+            self.cache._remove(self.temp_path)
+            return
+        meta = {
+            'source': os.path.abspath(self.video_path),
+            'frames': self.frames,
+            'height': self.frame_size[0],
+            'width': self.frame_size[1],
+            'fps': self.cap.get(cv2.CAP_PROP_FPS),
+            'max_width': self.max_width
+        }
+        try:
+            meta.update(self.cache._source_stat(self.video_path))
+            os.replace(self.temp_path, self.raw_path)
+            with open(self.meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=2)
+            print(f"Frame-Cache erstellt: {os.path.basename(self.video_path)} "
+                  f"({self.frames} Frames, {self.written / 1e6:.0f} MB)")
+        except OSError as e:
+            print(f"Frame-Cache konnte nicht gespeichert werden: {e}")
+            self.cache._remove(self.temp_path, self.raw_path)
+
+    def _abort(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.cache._remove(self.temp_path)
+
+    def get(self, prop):
+        if prop in (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT):
+            width, height = self.cache.output_size(int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                                                   int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            return float(width if prop == cv2.CAP_PROP_FRAME_WIDTH else height)
+        return self.cap.get(prop)
+
+    def release(self):
+        # Vor dem Ende abgebrochen (z.B. Videowechsel) - unvollständige Datei verwerfen
+        self._abort()
+        self.cap.release()
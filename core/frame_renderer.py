@@ -1,5 +1,11 @@
 import cv2
-from config.constants import POSE_CONNECTIONS
+import numpy as np
+from config.constants import POSE_CONNECTIONS, NUM_KEYPOINTS
+from core.overlay_cache import OverlayLayerCache
+
+# Start- und Endpunkt-Indizes aller Skelett-Verbindungen
+_EDGE_START = np.array([a for a, _ in POSE_CONNECTIONS], dtype=np.intp)
+_EDGE_END = np.array([b for _, b in POSE_CONNECTIONS], dtype=np.intp)
 
 class FrameRenderer:
     """Verantwortlich für das Zeichnen von Detections und Poses auf Frames"""
@@ -8,6 +14,9 @@ class FrameRenderer:
         self.class_config = class_config
         self.pose_config = pose_config
         self.display_config = display_config
+        
+        # Gecachte Overlay-Ebenen (FOI-Geometrie, Texte)
+        self.overlay_cache = OverlayLayerCache()
     
     def update_config(self, class_config, pose_config, display_config):
         """Aktualisiert die Konfiguration"""
@@ -15,24 +24,44 @@ class FrameRenderer:
         self.pose_config = pose_config
         self.display_config = display_config
     
-    def render_frame(self, frame, detections, poses):
-        """Zeichnet Detections und Poses auf den Frame"""
+    def render_frame(self, frame, detections, poses, heatmap=None, target_size=None):
+        """Zeichnet Detections und Poses (optional über einer Heatmap) auf den Frame.
+        
+        Mit target_size (Breite, Höhe) wird der Frame zuerst auf Anzeigegröße
+        verkleinert und die Overlays danach in Anzeigekoordinaten gezeichnet.
+        """
         if frame is None:
             return frame
-            
-        # Create a copy to draw on
-        rendered_frame = frame.copy()
+        
+        frame_height, frame_width = frame.shape[:2]
+        if target_size is not None and tuple(target_size) != (frame_width, frame_height):
+            # Erst skalieren, dann zeichnen - das Resize liefert bereits eine Kopie
+            rendered_frame = cv2.resize(frame, tuple(target_size), interpolation=cv2.INTER_LINEAR)
+            scale_x = target_size[0] / frame_width
+            scale_y = target_size[1] / frame_height
+        else:
+            # Create a copy to draw on
+            rendered_frame = frame.copy()
+            scale_x = scale_y = 1.0
+        
+        # Heatmap zuerst, damit Boxen und Skelette darüber liegen
+        if heatmap is not None:
+            heatmap.draw_overlay(rendered_frame)
         
         # Draw detection boxes
-        self._draw_detections(rendered_frame, detections)
+        self._draw_detections(rendered_frame, detections, scale_x, scale_y)
         
         # Draw poses
-        self._draw_poses(rendered_frame, poses)
+        self._draw_poses(rendered_frame, poses, scale_x, scale_y)
         
         return rendered_frame
     
-    def _draw_detections(self, frame, detections):
-        """Zeichnet Detection-Bounding-Boxes"""
+    def render_overlays(self, frame, sources):
+        """Blendet die gecachten Overlay-Ebenen der Quellen (FOI, Zähllinie) in einem Schritt ein"""
+        return self.overlay_cache.composite_onto(frame, sources)
+    
+    def _draw_detections(self, frame, detections, scale_x=1.0, scale_y=1.0):
+        """Zeichnet Detection-Bounding-Boxes (Koordinaten werden auf den Ziel-Frame skaliert)"""
         box_thickness = self.display_config.get('box_thickness', 2)
         font_scale = self.display_config.get('font_scale', 5) / 10.0
         text_thickness = self.display_config.get('text_thickness', 1)
@@ -45,20 +74,22 @@ class FrameRenderer:
                 
             box = detection['box']
             conf = detection['conf']
+            x1, y1 = int(box['x1'] * scale_x), int(box['y1'] * scale_y)
+            x2, y2 = int(box['x2'] * scale_x), int(box['y2'] * scale_y)
             
             color = cfg['color']
             label = f"{cfg['name']} {conf:.2f}"
             
             # Draw bounding box
-            cv2.rectangle(frame, (box['x1'], box['y1']), (box['x2'], box['y2']), 
+            cv2.rectangle(frame, (x1, y1), (x2, y2), 
                          color, box_thickness)
             
             # Draw label
-            cv2.putText(frame, label, (box['x1'], box['y1'] - 10),
+            cv2.putText(frame, label, (x1, y1 - 10),
                        cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, text_thickness)
     
-    def _draw_poses(self, frame, poses):
-        """Zeichnet Pose-Keypoints und Skelett"""
+    def _draw_poses(self, frame, poses, scale_x=1.0, scale_y=1.0):
+        """Zeichnet Pose-Keypoints und Skelett (Koordinaten werden auf den Ziel-Frame skaliert)"""
         if not (self.pose_config.get('show_keypoints', True) or 
                 self.pose_config.get('show_skeleton', True)):
             return
@@ -68,49 +99,39 @@ class FrameRenderer:
         show_keypoints = self.pose_config.get('show_keypoints', True)
         show_skeleton = self.pose_config.get('show_skeleton', True)
         
-        for pose in poses:
-            keypoints = pose['keypoints']
-            
-            if not keypoints:  # Skip wenn keine gültigen Keypoints
-                continue
-            
-            # Erstelle Keypoint-Array für einfacheren Zugriff
-            kp_array = [None] * 17  # COCO hat 17 Keypoints
-            for kp in keypoints:
-                if kp['id'] < 17 and kp['x'] > 0 and kp['y'] > 0:  # Gültige Koordinaten
-                    kp_array[kp['id']] = (int(kp['x']), int(kp['y']))
-            
-            # Zeichne Skelett-Verbindungen
-            if show_skeleton:
-                self._draw_skeleton(frame, kp_array, line_thickness)
-            
-            # Zeichne Keypoints
-            if show_keypoints:
-                self._draw_keypoints(frame, keypoints, keypoint_radius)
-    
-    def _draw_skeleton(self, frame, kp_array, line_thickness):
-        """Zeichnet Skelett-Verbindungen"""
-        for connection in POSE_CONNECTIONS:
-            pt1_idx, pt2_idx = connection
-            if (pt1_idx < len(kp_array) and pt2_idx < len(kp_array) and 
-                kp_array[pt1_idx] is not None and kp_array[pt2_idx] is not None):
-                
-                # Zusätzliche Validierung der Koordinaten
-                pt1 = kp_array[pt1_idx]
-                pt2 = kp_array[pt2_idx]
-                
-                if self._are_valid_coordinates(pt1, frame) and self._are_valid_coordinates(pt2, frame):
-                    cv2.line(frame, pt1, pt2, (0, 255, 0), line_thickness)
-    
-    def _draw_keypoints(self, frame, keypoints, keypoint_radius):
-        """Zeichnet Keypoints"""
-        for kp in keypoints:
-            x, y = int(kp['x']), int(kp['y'])
-            if self._are_valid_coordinates((x, y), frame):
-                cv2.circle(frame, (x, y), keypoint_radius, (0, 0, 255), -1)
+        # Alle Personen als ein Array (Personen x 17 x 2) in Ziel-Koordinaten
+        arrays = [self._get_keypoint_array(pose) for pose in poses if pose['keypoints']]
+        if not arrays:
+            return
+        points = (np.stack(arrays) * (scale_x, scale_y)).astype(np.int32)
+        
+        # Gültig: innerhalb der Bildgrenzen (ungültige Keypoints liegen bei 0/0)
+        h, w = frame.shape[:2]
+        valid = ((points[:, :, 0] > 0) & (points[:, :, 1] > 0) &
+                 (points[:, :, 0] < w) & (points[:, :, 1] < h))
+        
+        # Zeichne Skelett-Verbindungen - ein polylines-Aufruf für alle Personen
+        if show_skeleton:
+            edge_valid = valid[:, _EDGE_START] & valid[:, _EDGE_END]
+            if edge_valid.any():
+                segments = np.stack([points[:, _EDGE_START], points[:, _EDGE_END]], axis=2)[edge_valid]
+                cv2.polylines(frame, segments, False, (0, 255, 0), line_thickness)
+        
+        # Zeichne Keypoints - Polylinien der Länge 0 mit Dicke 2r entsprechen gefüllten Kreisen mit Radius r
+        if show_keypoints and valid.any():
+            keypoint_points = points[valid]
+            dots = np.repeat(keypoint_points[:, None, :], 2, axis=1)
+            cv2.polylines(frame, dots, False, (0, 0, 255), max(1, 2 * keypoint_radius))
     
-    def _are_valid_coordinates(self, point, frame):
-        """Überprüft ob die Koordinaten gültig sind"""
-        x, y = point
-        return (x > 0 and y > 0 and 
-                x < frame.shape[1] and y < frame.shape[0])  # Innerhalb Bildgrenzen
\ No newline at end of file
+    def _get_keypoint_array(self, pose):
+        """Liefert die Keypoints einer Pose als Array (17 x 2), ungültige Keypoints bei 0/0"""
+        keypoints_xy = pose.get('keypoints_xy')
+        if keypoints_xy is not None and len(keypoints_xy) == NUM_KEYPOINTS:
+            return keypoints_xy
+        
+        # Fallback für Posen ohne Array (z.B. aus älteren Aufzeichnungen)
+        keypoints_xy = np.zeros((NUM_KEYPOINTS, 2), dtype=np.float64)
+        for kp in pose['keypoints']:
+            if kp['id'] < NUM_KEYPOINTS:
+                keypoints_xy[kp['id']] = (kp['x'], kp['y'])
+        return keypoints_xy
\ No newline at end of file
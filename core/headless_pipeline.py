@@ -0,0 +1,348 @@
+import os
+import copy
+import time
+import queue
+import threading
+import cv2
+from config.constants import DEFAULT_CONFIG
+from core.inference import run_inference
+from core.frame_renderer import FrameRenderer
+from core.foi_manager import FOIManager
+from core.heatmap_accumulator import HeatmapAccumulator
+from core.line_counter import LineCrossingCounter
+from core.metrics import MetricsRegistry, MetricsServer
+from core.mjpeg_server import FrameBroadcaster, MjpegServer
+from core.pipeline_common import (
+    create_frame_cache, create_recorder, create_incident_recorder, create_alert_publisher,
+    evaluate_foi, observe_alert_latency, trigger_incident, publish_lift_status, record_result, export_final_results
+)
+
+class HeadlessPipeline:
+    """Erkennungs-Pipeline ohne Oberfläche: Videos im Takt der Quelle, Inferenz im Hintergrund, Vorschau per HTTP.
+
+    Wie im VideoPlayer wird nur dann ein Frame an die Inferenz übergeben,
+    wenn sie frei ist; FOI-Logik, Zähllinie und Alarm-Ausgabe laufen im
+    Hauptthread. Gerendert und als JPEG kodiert wird nur mit stream_fps und
+    nur, solange jemand zusieht (oder Vorfall-Clips aktiv sind).
+    """
+
+    def __init__(self, config, config_dir, video_files=None):
+        self.config = config
+        self.config_dir = config_dir
+        self.headless_config = config.get('headless_config', DEFAULT_CONFIG['headless_config'])
+        self.class_config = config.get('class_config', {})
+        self.pose_config = config.get('pose_config', {})
+        self.display_config = config.get('display_config', {})
+        self.foi_config = config.get('foi_config', {})
+        self.line_config = config.get('line_config', {})
+        self.heatmap_config = config.get('heatmap_config', DEFAULT_CONFIG['heatmap_config'])
+        self.video_files = list(video_files or config.get('video_files', []))
+
+        metrics_config = config.get('metrics_config', DEFAULT_CONFIG['metrics_config'])
+        self.metrics = MetricsRegistry(metrics_config.get('histogram_size', 1024), metrics_config.get('enabled', True))
+        self.metrics_server = None
+        metrics_port = int(metrics_config.get('http_port', 0) or 0)
+        if metrics_port:
+            self.metrics_server = MetricsServer(self.metrics, metrics_port)
+
+        self.frame_renderer = FrameRenderer(self.class_config, self.pose_config, self.display_config)
+        self.foi_manager = FOIManager(self.foi_config)
+        self.heatmap_accumulator = HeatmapAccumulator(self.heatmap_config)
+        self.line_counter = LineCrossingCounter(self.line_config)
+
+        self.detection_model = None
+        self.pose_model = None
+
+        self.broadcaster = FrameBroadcaster()
+        self.server = MjpegServer(self.broadcaster, self.status,
+                                  self.headless_config.get('port', 8080),
+                                  self.headless_config.get('host', '127.0.0.1'))
+
+        self.frame_cache = None
+        self.recorder = None
+        self.incident_recorder = None
+        self.alert_publisher = None
+        self._create_outputs()
+
+        # Inferenz-Thread: ein Frame in Arbeit, kein Rückstau
+        self._frames = queue.Queue()
+        self._results = queue.Queue()
+        self.inference_busy = False
+        self._inference_thread = None
+
+        self.running = False
+        self.current_video = None
+        self.last_detections = []
+        self.last_poses = []
+        self.last_result_capture_time = None
+        self.published_status = None
+        self.last_error_report = 0.0
+        self.next_stream_time = 0.0
+        self.fps = 0.0
+        self._fps_window = []
+        self._status = {}
+        self._status_lock = threading.Lock()
+
+    def _create_outputs(self):
+        """Frame-Cache, Aufzeichnung, Vorfall-Clips und Alarm-Ausgabe gemäß config (wie im VideoPlayer)"""
+        self.frame_cache = create_frame_cache(self.config.get('frame_cache_config', {}), self.config_dir)
+        self.recorder = create_recorder(self.config.get('recording_config', {}), self.config_dir)
+        self.incident_recorder = create_incident_recorder(self.config.get('incident_config', {}), self.config_dir)
+        self.alert_publisher = create_alert_publisher(self.config.get('alert_output_config', {}), self.metrics)
+
+    def load_models(self):
+        """Lädt die konfigurierten Modelle (blockierend - ohne Oberfläche gibt es nichts zu überbrücken)"""
+        from core.model_loader import load_yolo_model
+        for kind in ('detection', 'pose'):
+            model_path = self.config.get(f'{kind}_model_path', '')
+            if not model_path:
+                continue
+            try:
+                setattr(self, f'{kind}_model', load_yolo_model(model_path))
+            except Exception as e:
+                print(f"Fehler beim Laden des Modells {model_path}: {e}")
+
+    def run(self):
+        """Spielt die Videos in Endlosschleife ab, bis stop() aufgerufen wird (oder Strg+C)"""
+        if not self.video_files:
+            print("Keine Videos konfiguriert")
+            return 1
+        if not (self.detection_model or self.pose_model):
+            print("Kein Modell geladen")
+            return 1
+
+        self.running = True
+        self._inference_thread = threading.Thread(target=self._run_inference, daemon=True)
+        self._inference_thread.start()
+        self.server.start()
+        if self.metrics_server is not None:
+            self.metrics_server.start()
+
+        video_idx = 0
+        try:
+            while self.running:
+                try:
+                    self._play(self.video_files[video_idx])
+                except Exception as e:
+                    # Fehler beim Öffnen eines Videos beenden nicht den Dienst - weiter mit dem nächsten
+                    print(f"Fehler bei Video {self.video_files[video_idx]}: {e}")
+                    self.metrics.inc('video_errors')
+                    time.sleep(1.0)
+                # Track-IDs sind nicht videoübergreifend gültig
+                self.line_counter.reset_tracks()
+                video_idx = (video_idx + 1) % len(self.video_files)
+        except KeyboardInterrupt:
+            print("Beende...")
+        finally:
+            self.close()
+        return 0
+
+    def stop(self):
+        """Beendet run() nach dem aktuellen Frame (aus einem anderen Thread aufrufbar)"""
+        self.running = False
+
+    def close(self):
+        self.running = False
+        self._frames.put(None)
+        if self._inference_thread is not None:
+            self._inference_thread.join(timeout=5.0)
+        self.server.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        for output in (self.recorder, self.incident_recorder, self.alert_publisher):
+            if output is not None:
+                output.close()
+        self.recorder = self.incident_recorder = self.alert_publisher = None
+
+        # Aktuelle Heatmap und Durchsatz-Zählungen der Zähllinie sichern (wie beim Schließen des Fensters)
+        export_final_results(self.heatmap_accumulator, self.heatmap_config,
+                             self.line_counter, self.line_config, self.config_dir)
+
+    def _open_capture(self, video_path):
+        if self.frame_cache is not None:
+            return self.frame_cache.open(video_path)
+        return cv2.VideoCapture(video_path)
+
+    def _play(self, video_path):
+        cap = self._open_capture(video_path)
+        if not cap.isOpened():
+            print(f"Video {video_path} konnte nicht geöffnet werden")
+            cap.release()
+            time.sleep(1.0)
+            return
+        self.current_video = os.path.basename(video_path)
+
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if not fps or fps <= 0 or fps > 240:
+            fps = 30.0  # Fallback bei fehlender/ungültiger Angabe
+        interval = 1.0 / fps
+        next_tick = time.monotonic()
+        try:
+            while self.running:
+                with self.metrics.time('decode'):
+                    ret, frame = cap.read()
+                if not ret:
+                    return
+                capture_time = time.monotonic()
+                self.metrics.inc('frames_decoded')
+
+                # Wie ein Qt-Slot: ein Fehler betrifft nur diesen Frame, Alarm-Ausgabe und Vorschau laufen weiter
+                try:
+                    self._submit(frame, capture_time)
+                    self._drain_results()
+                    self._stream(frame)
+                except Exception as e:
+                    self._report_frame_error(e)
+                self._update_fps(capture_time)
+
+                # Im Takt der Quelle - hinkt die Schleife hinterher, wird der Takt neu gesetzt statt aufzuholen
+                next_tick += interval
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -interval:
+                    self.metrics.inc('ticks_late')
+                    next_tick = time.monotonic()
+        finally:
+            cap.release()
+
+    def _submit(self, frame, capture_time):
+        if self.inference_busy:
+            self.metrics.inc('inference_skipped_busy')
+            return
+        self.inference_busy = True
+        self.metrics.inc('inference_submitted')
+        self._frames.put((frame, capture_time))
+
+    def _run_inference(self):
+        while True:
+            item = self._frames.get()
+            if item is None:
+                return
+            frame, capture_time = item
+            try:
+                detections, poses = run_inference(frame, self.detection_model, self.pose_model,
+                                                  self.class_config, self.pose_config,
+                                                  use_tracking=self.line_config.get('enabled', False),
+                                                  metrics=self.metrics)
+                self._results.put((frame, detections, poses, capture_time))
+            except Exception as e:
+                print(f"Error: {e}")
+                self.metrics.inc('inference_errors')
+                self._results.put(None)
+
+    def _report_frame_error(self, error):
+        """Zählt Fehler der Frame-Verarbeitung - ausgegeben wird höchstens alle 5 Sekunden"""
+        self.metrics.inc('frame_errors')
+        now = time.monotonic()
+        if now - self.last_error_report >= 5.0:
+            self.last_error_report = now
+            print(f"Fehler bei der Frame-Verarbeitung: {error!r}")
+
+    def _drain_results(self):
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                return
+            self.inference_busy = False
+            if result is not None:
+                self._handle_result(*result)
+
+    def _handle_result(self, frame, detections, poses, capture_time):
+        """FOI-Logik, Zähllinie, Heatmap und Ausgaben für ein Inferenz-Ergebnis (Hauptthread)"""
+        self.last_detections = detections
+        self.last_poses = poses
+        self.last_result_capture_time = capture_time
+
+        h, w = frame.shape[:2]
+        self.foi_manager.set_frame_dimensions(w, h)
+        self.heatmap_accumulator.set_frame_dimensions(w, h)
+        self.line_counter.set_frame_dimensions(w, h)
+        self.heatmap_accumulator.update(detections)
+        self.line_counter.update(detections)
+
+        if self.foi_config.get('enabled', False):
+            previous_status, lift_status = evaluate_foi(self.foi_manager, detections, self.metrics)
+            observe_alert_latency(self.metrics, capture_time, previous_status, lift_status)
+            if lift_status != previous_status:
+                print(f"{time.strftime('%H:%M:%S')}  {lift_status}")
+            trigger_incident(self.incident_recorder, previous_status, lift_status)
+            self.published_status = publish_lift_status(self.alert_publisher, self.foi_manager, self.published_status)
+
+        record_result(self.recorder, (w, h), detections, poses, self.foi_manager.get_lift_status(), capture_time)
+
+        self._update_status()
+
+    def _stream(self, frame):
+        """Rendert und kodiert den Frame einmal für alle Zuschauer (mit stream_fps, nur bei Bedarf)"""
+        if not self.broadcaster.viewers and self.incident_recorder is None:
+            return
+        now = time.monotonic()
+        if now < self.next_stream_time:
+            return
+        self.next_stream_time = now + 1.0 / max(1.0, float(self.headless_config.get('stream_fps', 10)))
+
+        # Veraltete Detections nicht mehr über den aktuellen Frame legen
+        max_result_age = self.display_config.get('max_result_age', 1.0)
+        if self.last_result_capture_time is not None and now - self.last_result_capture_time <= max_result_age:
+            detections, poses = self.last_detections, self.last_poses
+        else:
+            detections, poses = [], []
+
+        frame_height, frame_width = frame.shape[:2]
+        stream_width = int(self.headless_config.get('stream_width', 960) or frame_width)
+        target_size = (stream_width, max(1, int(round(frame_height * stream_width / frame_width))))
+        with self.metrics.time('render'):
+            rendered = self.frame_renderer.render_frame(frame, detections, poses,
+                                                        heatmap=self.heatmap_accumulator, target_size=target_size)
+            rendered = self.frame_renderer.render_overlays(rendered, [self.foi_manager, self.line_counter])
+
+        if self.incident_recorder is not None:
+            self.incident_recorder.add_frame(rendered)
+        if self.broadcaster.viewers:
+            with self.metrics.time('jpeg'):
+                ok, jpeg = cv2.imencode('.jpg', rendered,
+                                        [cv2.IMWRITE_JPEG_QUALITY, int(self.headless_config.get('jpeg_quality', 75))])
+            if ok:
+                self.broadcaster.publish(jpeg.tobytes())
+
+    def _update_fps(self, now):
+        self._fps_window.append(now)
+        while self._fps_window and now - self._fps_window[0] > 2.0:
+            self._fps_window.pop(0)
+        if len(self._fps_window) > 1:
+            self.fps = (len(self._fps_window) - 1) / (self._fps_window[-1] - self._fps_window[0])
+
+    def _update_status(self):
+        status_info = self.foi_manager.get_status_info()
+        total_in, total_out = self.line_counter.get_current_bucket_totals()
+        status = {
+            'lift_status': status_info['status'],
+            'alert_active': status_info['alert_active'],
+            'remaining_timeout': status_info['remaining_timeout'],
+            'person_count': status_info['person_count'],
+            'alert_object_present': status_info['alert_object_present'],
+            'detections': len(self.last_detections),
+            'line_in': total_in,
+            'line_out': total_out
+        }
+        with self._status_lock:
+            self._status = status
+
+    def status(self):
+        """Status als JSON-fähiges Dictionary (wird vom HTTP-Thread aufgerufen)"""
+        with self._status_lock:
+            status = copy.copy(self._status) if self._status else {'lift_status': self.foi_manager.lift_status,
+                                                                   'person_count': 0}
+        result_age = None
+        if self.last_result_capture_time is not None:
+            result_age = time.monotonic() - self.last_result_capture_time
+        status.update({
+            'video': self.current_video,
+            'fps': self.fps,
+            'result_age': result_age,
+            'viewers': self.broadcaster.viewers,
+            'timestamp': time.time()
+        })
+        return status
@@ -0,0 +1,157 @@
+import os
+import time
+import cv2
+import numpy as np
+
+class HeatmapAccumulator:
+    """Akkumuliert eine Belegungs-Heatmap inkrementell aus den vorhandenen Detections"""
+
+    def __init__(self, heatmap_config):
+        self.heatmap_config = heatmap_config
+        self.frame_width = 1
+        self.frame_height = 1
+
+        # Dezimierter float32-Akkumulator (Auflösung = Frame / decimation)
+        self.accumulator = None
+        self.last_update_time = None
+
+        # Stündliche Snapshots
+        self.last_snapshot_bucket = None
+
+    def update_config(self, heatmap_config):
+        """Aktualisiert die Heatmap-Konfiguration"""
+        old_decimation = self.heatmap_config.get('decimation', 8)
+        self.heatmap_config = heatmap_config
+        if heatmap_config.get('decimation', 8) != old_decimation:
+            self.reset()
+
+    def reset(self):
+        """Verwirft die akkumulierte Heatmap"""
+        self.accumulator = None
+        self.last_update_time = None
+
+    def set_frame_dimensions(self, width, height):
+        """Setzt die Frame-Dimensionen und passt den Akkumulator bei Auflösungswechsel an"""
+        if width == self.frame_width and height == self.frame_height:
+            return
+        self.frame_width = width
+        self.frame_height = height
+
+        if self.accumulator is not None:
+            # Bisherige Belegung übernehmen statt verwerfen (relative Koordinaten)
+            acc_h, acc_w = self._accumulator_shape()
+            self.accumulator = cv2.resize(self.accumulator, (acc_w, acc_h),
+                                          interpolation=cv2.INTER_LINEAR)
+
+    def _accumulator_shape(self):
+        """Berechnet die Größe des dezimierten Akkumulators"""
+        decimation = max(1, int(self.heatmap_config.get('decimation', 8)))
+        acc_h = max(1, self.frame_height // decimation)
+        acc_w = max(1, self.frame_width // decimation)
+        return acc_h, acc_w
+
+    def update(self, detections, current_time=None):
+        """Verfällt die Heatmap exponentiell und addiert die Boxen des aktuellen Frames"""
+        if not self.heatmap_config.get('enabled', False):
+            return
+
+        if current_time is None:
+            current_time = time.time()
+
+        if self.accumulator is None:
+            self.accumulator = np.zeros(self._accumulator_shape(), dtype=np.float32)
+
+        # Exponentieller Zerfall abhängig von der vergangenen Zeit (Halbwertszeit)
+        if self.last_update_time is not None:
+            elapsed = current_time - self.last_update_time
+            half_life = float(self.heatmap_config.get('half_life', 600.0))
+            if elapsed > 0 and half_life > 0:
+                self.accumulator *= np.float32(0.5 ** (elapsed / half_life))
+        self.last_update_time = current_time
+
+        classes = self.heatmap_config.get('classes', [])
+        acc_h, acc_w = self.accumulator.shape
+        scale_x = acc_w / self.frame_width
+        scale_y = acc_h / self.frame_height
+
+        for detection in detections:
+            if classes and str(detection['class_id']) not in classes:
+                continue
+
+            # Box in dezimierte Koordinaten umrechnen
+            box = detection['box']
+            x1 = max(0, int(box['x1'] * scale_x))
+            y1 = max(0, int(box['y1'] * scale_y))
+            x2 = min(acc_w, int(box['x2'] * scale_x) + 1)
+            y2 = min(acc_h, int(box['y2'] * scale_y) + 1)
+            if x2 > x1 and y2 > y1:
+                self.accumulator[y1:y2, x1:x2] += 1.0
+
+        self._export_snapshot_if_due(current_time)
+
+    def colorize(self):
+        """Erzeugt ein eingefärbtes BGR-Bild der Heatmap in Akkumulator-Auflösung"""
+        if self.accumulator is None:
+            return None
+
+        max_value = float(self.accumulator.max())
+        if max_value <= 0:
+            normalized = np.zeros(self.accumulator.shape, dtype=np.uint8)
+        else:
+            normalized = cv2.convertScaleAbs(self.accumulator, alpha=255.0 / max_value)
+        return cv2.applyColorMap(normalized, cv2.COLORMAP_PARULA)
+
+    def draw_overlay(self, frame):
+        """Blendet die Heatmap halbtransparent über den Frame"""
+        if (not self.heatmap_config.get('show_overlay', False) or
+                self.accumulator is None or frame is None):
+            return frame
+
+        colored = self.colorize()
+        h, w = frame.shape[:2]
+        colored = cv2.resize(colored, (w, h), interpolation=cv2.INTER_LINEAR)
+
+        alpha = float(self.heatmap_config.get('overlay_alpha', 0.4))
+        cv2.addWeighted(colored, alpha, frame, 1.0 - alpha, 0, dst=frame)
+        return frame
+
+    def _export_snapshot_if_due(self, current_time):
+        """Exportiert einen Snapshot, sobald ein neues Zeitintervall (standardmäßig Stunde) beginnt"""
+        interval = float(self.heatmap_config.get('snapshot_interval', 3600.0))
+        if interval <= 0:
+            return
+
+        bucket = int(current_time // interval)
+        if self.last_snapshot_bucket is None:
+            self.last_snapshot_bucket = bucket
+            return
+
+        if bucket != self.last_snapshot_bucket:
+            # Snapshot gilt für das abgeschlossene Intervall
+            self.export_snapshot(self.last_snapshot_bucket * interval)
+            self.last_snapshot_bucket = bucket
+
+    def export_snapshot(self, timestamp=None):
+        """Speichert die aktuelle Heatmap als PNG und als Rohdaten (.npy)"""
+        if self.accumulator is None:
+            return None
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        snapshot_dir = self.heatmap_config.get('snapshot_dir', 'heatmaps')
+        if not os.path.isabs(snapshot_dir):
+            app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            snapshot_dir = os.path.join(app_dir, snapshot_dir)
+
+        try:
+            os.makedirs(snapshot_dir, exist_ok=True)
+            name = time.strftime("heatmap_%Y%m%d_%H%M", time.localtime(timestamp))
+            base_path = os.path.join(snapshot_dir, name)
+            cv2.imwrite(base_path + ".png", self.colorize())
+            np.save(base_path + ".npy", self.accumulator)
+            print(f"Heatmap-Snapshot gespeichert: {base_path}.png")
+            return base_path + ".png"
+        except Exception as e:
+            print(f"Fehler beim Speichern des Heatmap-Snapshots: {e}")
+            return None
@@ -0,0 +1,157 @@
+import os
+import re
+import time
+import queue
+import threading
+from collections import deque
+import cv2
+import numpy as np
+
+class IncidentRecorder:
+    """Ringpuffer der letzten Sekunden als JPEG und Vorfall-Clips bei Alarmen - vollständig im Hintergrund.
+
+    add_frame() und trigger() kehren sofort zurück: Frames werden mit der
+    Clip-Bildrate abgetastet und in eine kurze Warteschlange gelegt (ist sie
+    voll, wird der Frame verworfen). Ein Encoder-Thread komprimiert sie zu
+    JPEG und hält pre_seconds davon vor; nach einem Alarm werden noch
+    post_seconds gesammelt und der Clip von einem eigenen Schreib-Thread
+    als Video gespeichert.
+    """
+
+    def __init__(self, output_dir, pre_seconds=10.0, post_seconds=5.0, fps=10.0,
+                 jpeg_quality=80, max_width=960, queue_size=8):
+        self.output_dir = output_dir
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.fps = max(1.0, float(fps))
+        self.jpeg_quality = int(jpeg_quality)
+        self.max_width = int(max_width or 0)
+        self.queue_size = max(1, int(queue_size))
+        os.makedirs(output_dir, exist_ok=True)
+
+        self.next_sample = None  # Zeitpunkt, ab dem der nächste Frame übernommen wird (GUI-Thread)
+        self.dropped_frames = 0
+
+        # Nur vom Encoder-Thread verwendet
+        self.ring = deque(maxlen=max(1, int(round(pre_seconds * self.fps))))  # (Zeitstempel, JPEG)
+        self.incident = None
+
+        self._frames = queue.Queue()
+        self._clips = queue.Queue()
+        self._encoder = threading.Thread(target=self._run_encoder, daemon=True)
+        self._writer = threading.Thread(target=self._run_writer, daemon=True)
+        self._encoder.start()
+        self._writer.start()
+
+    def add_frame(self, frame, timestamp=None):
+        """Übergibt einen angezeigten Frame (mit Overlays) - nur im Takt der Clip-Bildrate, nie blockierend"""
+        timestamp = time.time() if timestamp is None else timestamp
+        if self.next_sample is not None and timestamp < self.next_sample:
+            return
+        # Im festen Raster weiterschalten, damit die Clip-Bildrate auch bei krummen Frame-Abständen stimmt
+        interval = 1.0 / self.fps
+        self.next_sample = timestamp + interval if self.next_sample is None else self.next_sample + interval
+        if self.next_sample <= timestamp:
+            self.next_sample = timestamp + interval
+
+        # Encoder hinkt hinterher - Frame verwerfen statt Speicher oder Anzeige zu belasten
+        if self._frames.qsize() >= self.queue_size:
+            self.dropped_frames += 1
+            return
+        self._frames.put(('frame', timestamp, frame))
+
+    def trigger(self, status, timestamp=None):
+        """Startet einen Vorfall-Clip (Vorlauf aus dem Ringpuffer, Nachlauf post_seconds)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        self._frames.put(('trigger', timestamp, status))
+
+    def close(self):
+        """Schreibt einen laufenden Vorfall (mit bisherigem Nachlauf) und beendet die Threads"""
+        self._frames.put(None)
+        self._encoder.join()
+        self._writer.join()
+
+    def _run_encoder(self):
+        while True:
+            item = self._frames.get()
+            if item is None:
+                self._finish_incident()
+                self._clips.put(None)
+                return
+            kind, timestamp, payload = item
+            try:
+                if kind == 'frame':
+                    self._add_encoded(timestamp, payload)
+                else:
+                    self._start_incident(timestamp, payload)
+            except Exception as e:
+                print(f"Fehler im Vorfall-Rekorder: {e}")
+
+    def _add_encoded(self, timestamp, frame):
+        height, width = frame.shape[:2]
+        if self.max_width and width > self.max_width:
+            size = (self.max_width, max(1, int(round(height * self.max_width / width))))
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            return
+        entry = (timestamp, jpeg)
+        self.ring.append(entry)
+
+        if self.incident is not None:
+            self.incident['frames'].append(entry)
+            if timestamp >= self.incident['end']:
+                self._finish_incident()
+
+    def _start_incident(self, timestamp, status):
+        if self.incident is not None:
+            # Weiterer Alarm während des Nachlaufs (z.B. verlangsamt -> gestoppt) - Clip verlängern
+            self.incident['end'] = max(self.incident['end'], timestamp + self.post_seconds)
+            self.incident['statuses'].append(status)
+            return
+        self.incident = {
+            'timestamp': timestamp,
+            'statuses': [status],
+            'end': timestamp + self.post_seconds,
+            'frames': [entry for entry in self.ring if entry[0] >= timestamp - self.pre_seconds]
+        }
+
+    def _finish_incident(self):
+        if self.incident is not None and self.incident['frames']:
+            self._clips.put(self.incident)
+        self.incident = None
+
+    def _run_writer(self):
+        while True:
+            incident = self._clips.get()
+            if incident is None:
+                return
+            try:
+                self._write_clip(incident)
+            except Exception as e:
+                print(f"Fehler beim Schreiben des Vorfall-Clips: {e}")
+
+    def _write_clip(self, incident):
+        status = re.sub(r'[^A-Za-z0-9]+', '_', incident['statuses'][-1]).strip('_') or 'alarm'
+        name = time.strftime("%Y%m%d_%H%M%S", time.localtime(incident['timestamp']))
+        path = os.path.join(self.output_dir, f"incident_{name}_{status}.mp4")
+
+        writer = None
+        size = None
+        for _, jpeg in incident['frames']:
+            frame = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if frame is None:
+                continue
+            if writer is None:
+                size = (frame.shape[1], frame.shape[0])
+                writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), self.fps, size)
+            elif (frame.shape[1], frame.shape[0]) != size:
+                # Fenstergröße hat sich während des Vorfalls geändert
+                frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+            writer.write(frame)
+
+        if writer is not None:
+            writer.release()
+            pre = sum(1 for timestamp, _ in incident['frames'] if timestamp < incident['timestamp'])
+            print(f"Vorfall-Clip gespeichert: {path} ({pre} Frames Vorlauf, "
+                  f"{len(incident['frames']) - pre} Frames Nachlauf)")
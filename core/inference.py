@@ -0,0 +1,186 @@
+from contextlib import nullcontext
+import numpy as np
+from config.constants import MODEL_PREDICT_CONF, MODEL_NMS_IOU
+
+def filter_detections(xyxy, confs, classes, class_config, track_ids=None, return_indices=False):
+    """Wendet class_config auf Modell-Boxen an: nur konfigurierte Klassen mit Konfidenz über der Schwelle der Klasse.
+
+    Gemeinsam genutzt von Live-Pipeline und Auswertung; die Reihenfolge der
+    Modell-Ausgabe bleibt erhalten. Mit return_indices zusätzlich die
+    Indizes der behaltenen Boxen (z.B. für die zugehörigen Keypoints).
+    """
+    classes = np.asarray(classes).astype(np.int64)
+    confs = np.asarray(confs, dtype=np.float64)
+    xyxy = np.asarray(xyxy, dtype=np.float64).reshape(-1, 4)
+    
+    keep = np.zeros(len(classes), dtype=bool)
+    for cls in np.unique(classes):
+        cfg = class_config.get(str(int(cls)))
+        if cfg:
+            keep |= (classes == cls) & (confs >= float(cfg.get("conf", 0.5)))
+    
+    detections = []
+    kept_indices = np.flatnonzero(keep)
+    for i in kept_indices:
+        x1, y1, x2, y2 = (int(v) for v in xyxy[i])
+        cls = int(classes[i])
+        cfg = class_config[str(cls)]
+        detections.append({
+            'box': {'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2},
+            'conf': float(confs[i]),
+            'class_id': cls,
+            'class_name': cfg.get('name', f"Class {cls}"),
+            'track_id': int(track_ids[i]) if track_ids is not None else None
+        })
+    if return_indices:
+        return detections, kept_indices
+    return detections
+
+def keypoints_to_arrays(keypoints, min_conf, offset=(0, 0)):
+    """Keypoints eines Pose-Ergebnisses als Vollbild-Koordinaten (Personen x Keypoints x 2), Konfidenzen und Gültigkeit.
+
+    Ungültige Keypoints (unter min_conf oder ohne Position) liegen auf 0/0.
+    """
+    keypoints_data = keypoints.cpu().numpy()
+    all_xy = np.asarray(keypoints_data.xy, dtype=np.float64)
+    if keypoints_data.conf is not None:
+        all_conf = np.asarray(keypoints_data.conf, dtype=np.float64)
+    else:
+        all_conf = np.ones(all_xy.shape[:2], dtype=np.float64)
+    
+    all_valid = (all_conf >= min_conf) & (all_xy[:, :, 0] > 0) & (all_xy[:, :, 1] > 0)
+    global_xy = np.where(all_valid[:, :, None], all_xy + offset, 0.0)
+    return global_xy, all_conf, all_valid
+
+def build_pose(person_id, detection_box, xy, conf, valid):
+    """Pose-Eintrag einer Person - None ohne gültige Keypoints"""
+    valid_ids = np.flatnonzero(valid)
+    if not len(valid_ids):
+        return None
+    return {
+        'person_id': person_id,
+        'detection_box': detection_box,
+        'keypoints': [{
+            'id': int(i),
+            'x': float(xy[i, 0]),
+            'y': float(xy[i, 1]),
+            'conf': float(conf[i])
+        } for i in valid_ids],
+        'keypoints_xy': xy  # Array für das gebündelte Zeichnen
+    }
+
+def _timed(metrics, name):
+    """Misst eine Stufe, falls eine MetricsRegistry übergeben wurde"""
+    return metrics.time(name) if metrics is not None else nullcontext()
+
+def run_inference(frame, detection_model, pose_model, class_config, pose_config, use_tracking=False, metrics=None):
+    """Detection und Pose für einen Frame -> (Detections, Posen).
+
+    Ohne Qt: genutzt vom DualDetectionWorker, von der Headless-Pipeline
+    und den Werkzeugen. Der Frame wird nicht verändert.
+    """
+    if pose_config.get('pose_only') and pose_model:
+        return _run_pose_only(frame, pose_model, class_config, pose_config, use_tracking, metrics)
+    
+    detections = []
+    poses = []
+    
+    # Step 1: Object Detection
+    if detection_model:
+        with _timed(metrics, 'detect'):
+            if use_tracking:
+                # persist=True behält den Tracker-Zustand zwischen den Frames
+                det_results = detection_model.track(frame, persist=True, verbose=False,
+                                                    conf=MODEL_PREDICT_CONF, iou=MODEL_NMS_IOU)[0]
+            else:
+                det_results = detection_model.predict(frame, conf=MODEL_PREDICT_CONF, iou=MODEL_NMS_IOU, verbose=False)[0]
+            
+            boxes = det_results.boxes.cpu().numpy()
+            detections = filter_detections(
+                boxes.xyxy, boxes.conf, boxes.cls, class_config,
+                track_ids=boxes.id if boxes.id is not None else None
+            )
+        
+        # Step 2: Pose Detection auf ausgeschnittenen Bereichen
+        pose_detect_classes = pose_config.get('pose_detect_classes', [])
+        if pose_model and pose_detect_classes:
+            with _timed(metrics, 'pose'):
+                for detection in detections:
+                    if str(detection['class_id']) not in pose_detect_classes:
+                        continue
+                    with _timed(metrics, 'pose_roi'):
+                        pose_data_list = _detect_pose_in_roi(frame, pose_model, pose_config, detection)
+                    if pose_data_list:
+                        poses.extend(pose_data_list)  # Erweitern statt einzeln hinzufügen
+    
+    return detections, poses
+
+def _run_pose_only(frame, pose_model, class_config, pose_config, use_tracking, metrics):
+    """Nur das Pose-Modell auf dem Vollbild: ein Forward-Pass liefert Personen-Boxen und Keypoints.
+    
+    Die Boxen erhalten die Klasse pose_only_class und laufen durch
+    class_config wie Detection-Boxen; das Detection-Modell wird nicht genutzt.
+    """
+    with _timed(metrics, 'pose_single'):
+        if use_tracking:
+            results = pose_model.track(frame, persist=True, verbose=False,
+                                       conf=MODEL_PREDICT_CONF, iou=MODEL_NMS_IOU)[0]
+        else:
+            results = pose_model.predict(frame, conf=MODEL_PREDICT_CONF, iou=MODEL_NMS_IOU, verbose=False)[0]
+        
+        boxes = results.boxes.cpu().numpy()
+        person_class = int(pose_config.get('pose_only_class', '0'))
+        detections, kept = filter_detections(
+            boxes.xyxy, boxes.conf, np.full(len(boxes.conf), person_class), class_config,
+            track_ids=boxes.id if boxes.id is not None else None, return_indices=True
+        )
+        
+        poses = []
+        if getattr(results, 'keypoints', None) is not None and len(kept):
+            min_conf = pose_config.get('min_confidence', 0.3)
+            global_xy, all_conf, all_valid = keypoints_to_arrays(results.keypoints, min_conf)
+            for detection, i in zip(detections, kept):
+                pose_data = build_pose(f"{person_class}_{i}", detection['box'],
+                                       global_xy[i], all_conf[i], all_valid[i])
+                if pose_data:
+                    poses.append(pose_data)
+    
+    return detections, poses
+
+def _detect_pose_in_roi(frame, pose_model, pose_config, detection):
+    """Führt Pose Detection im Bereich einer Detection durch - KANN MEHRERE PERSONEN ERKENNEN"""
+    box = detection['box']
+    
+    # Bounding Box erweitern und beschränken
+    h, w = frame.shape[:2]
+    margin = 20  # Pixel Spielraum um die Box
+    x1_exp = max(0, box['x1'] - margin)
+    y1_exp = max(0, box['y1'] - margin)
+    x2_exp = min(w, box['x2'] + margin)
+    y2_exp = min(h, box['y2'] + margin)
+    
+    # Ausschnitt extrahieren
+    roi = frame[y1_exp:y2_exp, x1_exp:x2_exp]
+    
+    if roi.shape[0] <= 0 or roi.shape[1] <= 0:
+        return None
+    
+    # Pose Detection auf ROI
+    pose_results = pose_model.predict(roi, verbose=False)[0]
+    
+    if not hasattr(pose_results, 'keypoints') or pose_results.keypoints is None:
+        return None
+    
+    # Koordinaten zurück ins Vollbild transformieren, ungültige Keypoints auf 0/0
+    min_conf = pose_config.get('min_confidence', 0.3)
+    global_xy, all_conf, all_valid = keypoints_to_arrays(pose_results.keypoints, min_conf, (x1_exp, y1_exp))
+    
+    # Iteriere über alle erkannten Personen in der Bounding Box
+    poses_in_roi = []  # Liste für mehrere erkannte Personen
+    for person_idx in range(len(global_xy)):
+        pose_data = build_pose(f"{detection['class_id']}_{person_idx}", detection['box'],
+                               global_xy[person_idx], all_conf[person_idx], all_valid[person_idx])
+        if pose_data:  # Nur hinzufügen wenn gültige Keypoints
+            poses_in_roi.append(pose_data)
+    
+    return poses_in_roi if poses_in_roi else None
@@ -0,0 +1,236 @@
+import os
+import re
+import copy
+import json
+import glob
+import queue
+import shutil
+import hashlib
+import threading
+import numpy as np
+from core.prediction_cache import file_hash
+from core.detection_recorder import FrameChunk, decode_frames
+
+_CHUNK_PATTERN = re.compile(r'chunk_(\d+)\.npz$')
+
+class InferenceCache:
+    """Festplatten-Cache der Pipeline-Ergebnisse pro Video-Frame, LRU-Verdrängung nach Gesamtgröße.
+
+    Ein Segment ist ein Verzeichnis mit allen Frames eines Videos unter einem
+    Schlüssel aus Video-Hash, Modell-Hashes und Schwellwerten; jede Änderung
+    daran ergibt ein neues Segment. Neue Frames werden als weitere
+    Block-Dateien angehängt, bestehende nie neu geschrieben. Schlüssel
+    berechnen, Laden und Schreiben laufen in einem Hintergrund-Thread; die
+    Zugriffsreihenfolge steckt in der Änderungszeit der Segment-Verzeichnisse.
+    """
+
+    def __init__(self, cache_dir, max_bytes, chunk_frames=256):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.chunk_frames = max(1, int(chunk_frames))
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def make_key(self, video_path, detection_model_path, pose_model_path, class_config, pose_config, use_tracking,
+                 frame_max_width=0):
+        """Schlüssel aus Video- und Modell-Inhalt sowie allen Schwellwerten, die das Ergebnis beeinflussen"""
+        parts = {
+            'video': file_hash(video_path),
+            'classes': {cls: [cfg.get('conf'), cfg.get('iou')] for cls, cfg in sorted(class_config.items())},
+            'tracking': bool(use_tracking)
+        }
+        if pose_config.get('pose_only') and pose_model_path:
+            # Nur-Pose-Modus: Ergebnis hängt allein vom Pose-Modell ab - das Detection-Modell wird nicht gelesen
+            parts.update({
+                'detection_model': None,
+                'pose_model': file_hash(pose_model_path),
+                'pose_detect_classes': [],
+                'min_confidence': pose_config.get('min_confidence', 0.3),
+                'pose_only_class': str(pose_config.get('pose_only_class', '0'))
+            })
+        else:
+            pose_detect_classes = sorted(pose_config.get('pose_detect_classes', []))
+            use_pose = bool(pose_model_path and pose_detect_classes)
+            parts.update({
+                'detection_model': file_hash(detection_model_path) if detection_model_path else None,
+                'pose_model': file_hash(pose_model_path) if use_pose else None,
+                'pose_detect_classes': pose_detect_classes if use_pose else [],
+                'min_confidence': pose_config.get('min_confidence', 0.3) if use_pose else None
+            })
+        if frame_max_width:
+            # Verkleinerte Frames aus dem Frame-Cache ergeben andere Ergebnisse
+            parts['frame_max_width'] = frame_max_width
+        digest = hashlib.sha1(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+        return f"{parts['video'][:12]}_{digest[:16]}"
+
+    def open_segment(self, video_path, detection_model_path, pose_model_path, class_config, pose_config,
+                     use_tracking, frame_max_width=0):
+        """Öffnet ein Segment sofort - Schlüssel und vorhandene Frames folgen aus dem Hintergrund-Thread"""
+        key_args = (video_path, detection_model_path, pose_model_path, copy.deepcopy(class_config),
+                    copy.deepcopy(pose_config), use_tracking, frame_max_width)
+        segment = InferenceCacheSegment(self)
+        self._queue.put((self._open_segment, segment, key_args))
+        return segment
+
+    def segment_path(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def close(self):
+        """Schreibt ausstehende Blöcke und beendet den Hintergrund-Thread"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            handler, segment, payload = item
+            try:
+                handler(segment, payload)
+            except Exception as e:
+                print(f"Fehler im Inferenz-Cache: {e}")
+
+    def _open_segment(self, segment, key_args):
+        """Berechnet den Schlüssel und lädt alle Blöcke des Segments (Hintergrund-Thread)"""
+        try:
+            segment.key = self.make_key(*key_args)
+        except OSError as e:
+            print(f"Inferenz-Cache nicht verfügbar: {e}")
+            segment.failed = True
+            return
+        segment.path = self.segment_path(segment.key)
+
+        chunk_indices = []
+        frames = {}
+        for path in sorted(glob.glob(os.path.join(segment.path, 'chunk_*.npz'))):
+            match = _CHUNK_PATTERN.search(path)
+            if match is None:
+                continue
+            chunk_indices.append(int(match.group(1)))
+            if segment.closed:
+                continue  # Nur noch Block-Nummern für ausstehende Schreibvorgänge
+            try:
+                with np.load(path) as data:
+                    arrays = {name: data[name] for name in data.files}
+                for frame in decode_frames(arrays, key_args[3]):
+                    frames.setdefault(int(frame.timestamp), (frame.frame_size, frame.detections, frame.poses))
+            except Exception as e:
+                print(f"Cache-Block {path} ungültig, wird übersprungen: {e}")
+
+        segment.next_chunk = max(chunk_indices) + 1 if chunk_indices else 0
+        segment.disk_indices = set(frames)
+        if chunk_indices:
+            os.utime(segment.path)  # Für die LRU-Reihenfolge als verwendet markieren
+        segment.loaded = frames
+
+    def _write_chunk(self, segment, entries):
+        """Hängt neue Frames als weiteren Block an das Segment an und verdrängt danach alte Segmente"""
+        if segment.failed or segment.path is None:
+            return
+        chunk = FrameChunk()
+        for frame_index, frame_size, detections, poses in entries:
+            if frame_index in segment.disk_indices:
+                continue
+            chunk.add(frame_index, frame_size, detections, poses)
+            segment.disk_indices.add(frame_index)
+        if not len(chunk):
+            return
+
+        try:
+            os.makedirs(segment.path, exist_ok=True)
+            path = os.path.join(segment.path, f"chunk_{segment.next_chunk:06d}.npz")
+            temp_path = path + ".tmp.npz"
+            np.savez_compressed(temp_path, **chunk.to_arrays())
+            os.replace(temp_path, path)
+            segment.next_chunk += 1
+            os.utime(segment.path)
+        except OSError as e:
+            print(f"Cache-Block für {segment.path} konnte nicht geschrieben werden: {e}")
+            return
+        self.evict(keep=segment.path)
+
+    def evict(self, keep=None):
+        """Löscht die am längsten nicht verwendeten Segmente, bis die Gesamtgröße unter max_bytes liegt"""
+        entries = []
+        for path in glob.glob(os.path.join(self.cache_dir, '*')):
+            if not os.path.isdir(path):
+                continue
+            try:
+                mtime = os.stat(path).st_mtime
+                size = sum(os.path.getsize(chunk) for chunk in glob.glob(os.path.join(path, '*.npz')))
+            except OSError:
+                continue
+            entries.append((mtime, size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                shutil.rmtree(path)
+                total -= size
+            except OSError as e:
+                print(f"Cache-Segment {path} konnte nicht gelöscht werden: {e}")
+
+class InferenceCacheSegment:
+    """Ergebnisse (Detections, Posen) eines Videos unter einem Schlüssel, nach Frame-Index.
+
+    get/put laufen im GUI-Thread und greifen nur auf den Speicher zu; bis das
+    Laden im Hintergrund fertig ist, liefert get None.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.key = None  # Ab hier vom Hintergrund-Thread gesetzt
+        self.path = None
+        self.failed = False
+        self.next_chunk = 0
+        self.disk_indices = set()
+        self.loaded = None  # Geladene Frames, vom GUI-Thread beim nächsten Zugriff übernommen
+
+        self.frames = {}  # Frame-Index -> (Frame-Größe, Detections, Posen)
+        self.pending = []  # Neue Frames, die noch nicht an den Hintergrund-Thread übergeben wurden
+        self.closed = False
+
+    def __len__(self):
+        self._take_loaded()
+        return len(self.frames)
+
+    def _take_loaded(self):
+        loaded = self.loaded
+        if loaded is not None:
+            self.loaded = None
+            for frame_index, entry in loaded.items():
+                self.frames.setdefault(frame_index, entry)
+
+    def get(self, frame_index):
+        """Gecachte (Detections, Posen) eines Frames oder None"""
+        self._take_loaded()
+        entry = self.frames.get(frame_index)
+        return None if entry is None else entry[1:]
+
+    def put(self, frame_index, frame_size, detections, poses):
+        """Übernimmt das Ergebnis eines Frames (geschrieben wird blockweise im Hintergrund)"""
+        if self.failed or frame_index in self.frames:
+            return
+        self.frames[frame_index] = (frame_size, detections, poses)
+        self.pending.append((frame_index, frame_size, detections, poses))
+        if len(self.pending) >= self.cache.chunk_frames:
+            self.flush()
+
+    def flush(self):
+        """Übergibt die neuen Frames als Block an den Hintergrund-Thread"""
+        if not self.pending:
+            return
+        self.cache._queue.put((self.cache._write_chunk, self, self.pending))
+        self.pending = []
+
+    def close(self):
+        """Schreibt die restlichen Frames; ein noch laufendes Laden dekodiert danach nichts mehr"""
+        self.flush()
+        self.closed = True
@@ -0,0 +1,244 @@
+import csv
+import time
+from collections import OrderedDict
+import cv2
+import numpy as np
+from config.constants import FOI_CORNER_SIZE, FOI_CORNER_COLOR, FOI_HOVER_COLOR
+from core.overlay_cache import to_layer_color
+
+class LineCrossingCounter:
+    """Zählt gerichtete Überquerungen einer Zähllinie anhand stabiler Track-IDs (Liftdurchsatz)"""
+
+    def __init__(self, line_config):
+        self.line_config = line_config
+        self.frame_width = 1
+        self.frame_height = 1
+
+        # Letzte eindeutige Position pro Track: track_id -> (x, y, Seite, Zeitpunkt zuletzt gesehen)
+        self.track_positions = {}
+        self.last_prune_time = 0.0
+
+        # Maus-Bearbeitung der Endpunkte (wie die FOI-Ecken)
+        self.dragging_point = -1
+        self.hover_point = -1
+
+        # Zeit-Buckets: Bucket-Start -> {class_id: {'in': n, 'out': n}}
+        self.buckets = OrderedDict()
+        self.total_in = 0
+        self.total_out = 0
+
+    def update_config(self, line_config):
+        """Aktualisiert die Konfiguration der Zähllinie"""
+        self.line_config = line_config
+
+    def set_frame_dimensions(self, width, height):
+        """Setzt die Frame-Dimensionen für die Koordinatenumrechnung"""
+        self.frame_width = width
+        self.frame_height = height
+
+    def get_absolute_points(self, width=None, height=None):
+        """Konvertiert die relativen Linienpunkte zu absoluten Bildkoordinaten (Standard: Frame-Auflösung)"""
+        if width is None or height is None:
+            width, height = self.frame_width, self.frame_height
+        points = []
+        for rel_point in self.line_config['points']:
+            x = int(rel_point[0] * width)
+            y = int(rel_point[1] * height)
+            points.append([x, y])
+        return np.array(points, dtype=np.int32)
+
+    def reset_tracks(self):
+        """Vergisst alle Tracks (z.B. beim Videowechsel), die Zählungen bleiben erhalten"""
+        self.track_positions.clear()
+
+    def reset_counts(self):
+        """Setzt alle Zählungen zurück"""
+        self.buckets.clear()
+        self.total_in = 0
+        self.total_out = 0
+
+    def get_point_at_position(self, x, y, tolerance=FOI_CORNER_SIZE):
+        """Findet den Endpunkt der Linie an der gegebenen Position (tolerance in Frame-Pixeln)"""
+        if not self.line_config.get('enabled', False):
+            return -1
+        for i, point in enumerate(self.get_absolute_points()[:2]):
+            if np.hypot(x - point[0], y - point[1]) <= tolerance:
+                return i
+        return -1
+
+    def move_point(self, point_idx, x, y):
+        """Verschiebt einen Endpunkt der Linie (auf den Frame begrenzt)"""
+        if 0 <= point_idx < len(self.line_config['points']):
+            x = max(0, min(self.frame_width - 1, x))
+            y = max(0, min(self.frame_height - 1, y))
+            self.line_config['points'][point_idx] = [x / self.frame_width, y / self.frame_height]
+
+    def update(self, detections, current_time=None):
+        """Verarbeitet die Detections eines Frames - O(Tracks) pro Frame"""
+        if not self.line_config.get('enabled', False):
+            return
+
+        if current_time is None:
+            current_time = time.time()
+
+        (ax, ay), (bx, by) = self.get_absolute_points()[:2]
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+        if length_sq == 0:
+            return
+
+        classes = self.line_config.get('classes', [])
+
+        for detection in detections:
+            track_id = detection.get('track_id')
+            if track_id is None:
+                continue
+            cls_id = str(detection['class_id'])
+            if classes and cls_id not in classes:
+                continue
+
+            # Referenzpunkt: Zentrum der Bounding Box (wie beim FOI)
+            box = detection['box']
+            px = (box['x1'] + box['x2']) / 2
+            py = (box['y1'] + box['y2']) / 2
+
+            # Seite relativ zur gerichteten Linie A->B (Vorzeichen des Kreuzprodukts)
+            cross = dx * (py - ay) - dy * (px - ax)
+            side = 1 if cross > 0 else -1 if cross < 0 else 0
+
+            previous = self.track_positions.get(track_id)
+            if side == 0:
+                # Auf der Linie: letzte eindeutige Position beibehalten
+                if previous is not None:
+                    self.track_positions[track_id] = previous[:3] + (current_time,)
+                continue
+
+            self.track_positions[track_id] = (px, py, side, current_time)
+            if previous is None or previous[2] == side:
+                continue
+
+            # Nur zählen, wenn der Schritt vorherige -> aktuelle Position das Segment A-B schneidet:
+            # A und B liegen auf verschiedenen Seiten (oder auf) der Bewegungsgeraden
+            qx, qy = previous[0], previous[1]
+            mx, my = px - qx, py - qy
+            cross_a = mx * (ay - qy) - my * (ax - qx)
+            cross_b = mx * (by - qy) - my * (bx - qx)
+            if cross_a * cross_b <= 0:
+                self._count_crossing(cls_id, 'in' if side > 0 else 'out', current_time)
+
+        self._prune_stale_tracks(current_time)
+
+    def _count_crossing(self, cls_id, direction, current_time):
+        """Verbucht eine Überquerung im passenden Zeit-Bucket"""
+        bucket_seconds = float(self.line_config.get('bucket_seconds', 60.0))
+        bucket_start = int(current_time // bucket_seconds * bucket_seconds)
+
+        bucket = self.buckets.get(bucket_start)
+        if bucket is None:
+            bucket = self.buckets[bucket_start] = {}
+            max_buckets = int(self.line_config.get('max_buckets', 1440))
+            while len(self.buckets) > max_buckets:
+                self.buckets.popitem(last=False)
+
+        class_counts = bucket.setdefault(cls_id, {'in': 0, 'out': 0})
+        class_counts[direction] += 1
+
+        if direction == 'in':
+            self.total_in += 1
+        else:
+            self.total_out += 1
+
+    def _prune_stale_tracks(self, current_time):
+        """Entfernt Tracks, die länger als track_timeout nicht gesehen wurden (max. 1x pro Sekunde)"""
+        if current_time - self.last_prune_time < 1.0:
+            return
+        self.last_prune_time = current_time
+
+        timeout = float(self.line_config.get('track_timeout', 2.0))
+        stale = [tid for tid, position in self.track_positions.items() if current_time - position[3] > timeout]
+        for tid in stale:
+            del self.track_positions[tid]
+
+    def get_bucket_counts(self):
+        """Gibt die Zählungen pro Zeit-Bucket zurück: [(Bucket-Start, {class_id: {'in', 'out'}})]"""
+        return list(self.buckets.items())
+
+    def get_current_bucket_totals(self, current_time=None):
+        """Gibt die Summen (in, out) des aktuellen Zeit-Buckets über alle Klassen zurück"""
+        if current_time is None:
+            current_time = time.time()
+        bucket_seconds = float(self.line_config.get('bucket_seconds', 60.0))
+        bucket_start = int(current_time // bucket_seconds * bucket_seconds)
+
+        bucket = self.buckets.get(bucket_start, {})
+        total_in = sum(counts['in'] for counts in bucket.values())
+        total_out = sum(counts['out'] for counts in bucket.values())
+        return total_in, total_out
+
+    def export_csv(self, file_path):
+        """Exportiert die Zählungen pro Zeit-Bucket und Klasse als CSV"""
+        try:
+            with open(file_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f, delimiter=';')
+                writer.writerow(['Bucket_Start', 'Klasse', 'Ein', 'Aus'])
+                for bucket_start, bucket in self.buckets.items():
+                    timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(bucket_start))
+                    for cls_id, counts in sorted(bucket.items()):
+                        writer.writerow([timestamp, cls_id, counts['in'], counts['out']])
+            return True
+        except Exception as e:
+            print(f"Fehler beim Exportieren der Linienzählung: {e}")
+            return False
+
+    def overlay_geometry_key(self):
+        """Schlüssel der Liniengeometrie für den Overlay-Cache"""
+        if not self.line_config.get('enabled', False):
+            return None
+        return (
+            tuple(tuple(point) for point in self.line_config['points']),
+            tuple(self.line_config.get('line_color', (255, 0, 255))),
+            self.line_config.get('line_thickness', 2),
+            self.hover_point,
+            self.dragging_point
+        )
+
+    def draw_overlay_geometry(self, layer):
+        """Zeichnet Zähllinie und Richtungspfeil auf eine (BGRA-)Overlay-Ebene"""
+        if not self.line_config.get('enabled', False):
+            return layer
+
+        (ax, ay), (bx, by) = self.get_absolute_points(layer.shape[1], layer.shape[0])[:2].tolist()
+        color = to_layer_color(self.line_config.get('line_color', (255, 0, 255)), layer)
+        thickness = self.line_config.get('line_thickness', 2)
+        cv2.line(layer, (ax, ay), (bx, by), color, thickness)
+
+        # Pfeil zeigt auf die "Ein"-Seite (senkrecht zur Linie)
+        mid_x, mid_y = (ax + bx) // 2, (ay + by) // 2
+        dx, dy = bx - ax, by - ay
+        length = max(1.0, float(np.hypot(dx, dy)))
+        arrow_x = int(mid_x - dy / length * 30)
+        arrow_y = int(mid_y + dx / length * 30)
+        cv2.arrowedLine(layer, (mid_x, mid_y), (arrow_x, arrow_y), color, thickness, tipLength=0.4)
+
+        # Griffe der Endpunkte (wie die FOI-Ecken)
+        for i, center in enumerate(((ax, ay), (bx, by))):
+            if i == self.hover_point:
+                handle_color, size = to_layer_color(FOI_HOVER_COLOR, layer), FOI_CORNER_SIZE + 2
+            elif i == self.dragging_point:
+                handle_color, size = to_layer_color(FOI_CORNER_COLOR, layer), FOI_CORNER_SIZE + 2
+            else:
+                handle_color, size = color, FOI_CORNER_SIZE
+            cv2.circle(layer, center, size, handle_color, -1)
+            cv2.circle(layer, center, size, to_layer_color((0, 0, 0), layer), 2)  # Schwarzer Rand
+        return layer
+
+    def overlay_text_items(self, width=None, height=None):
+        """Gibt die Zählungen des aktuellen Buckets als Textelement oberhalb der Linie zurück"""
+        if not self.line_config.get('enabled', False):
+            return []
+
+        (ax, ay), (bx, by) = self.get_absolute_points(width, height)[:2].tolist()
+        total_in, total_out = self.get_current_bucket_totals()
+        text = f"Ein: {total_in} | Aus: {total_out}"
+        color = tuple(self.line_config.get('line_color', (255, 0, 255)))
+        return [(text, (ax + bx) // 2, max(30, min(ay, by) - 15), 0.6, 2, color, (0, 0, 0))]
@@ -0,0 +1,216 @@
+import json
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+# Perzentile für Anzeige und Export
+METRIC_QUANTILES = (0.5, 0.9, 0.99)
+
+class RollingHistogram:
+    """Ringpuffer der letzten N Werte - Perzentile werden erst beim Auslesen berechnet"""
+
+    def __init__(self, size=1024):
+        self.values = np.zeros(max(1, int(size)), dtype=np.float64)
+        self.count = 0  # Gesamtanzahl seit Start (nicht nur im Fenster)
+        self.total = 0.0
+
+    def observe(self, value):
+        """Fügt einen Wert hinzu (überschreibt den ältesten, wenn der Puffer voll ist)"""
+        self.values[self.count % len(self.values)] = value
+        self.count += 1
+        self.total += value
+
+    def window(self):
+        """Werte im aktuellen Fenster"""
+        return self.values[:min(self.count, len(self.values))]
+
+    def summary(self):
+        """Perzentile, Mittelwert und Maximum des Fensters sowie Gesamtanzahl und -summe"""
+        window = self.window()
+        if not len(window):
+            return {'count': 0, 'sum': 0.0}
+        summary = {f"p{int(q * 100)}": float(v) for q, v in zip(METRIC_QUANTILES, np.quantile(window, METRIC_QUANTILES))}
+        summary.update({'mean': float(window.mean()), 'max': float(window.max()),
+                        'count': self.count, 'sum': self.total})
+        return summary
+
+class _Timer:
+    """Kontextmanager, der die Dauer (time.perf_counter, monoton) in ein Histogramm schreibt"""
+
+    __slots__ = ('registry', 'name', 'start')
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+class MetricsRegistry:
+    """Zähler, Gauges und Histogramme (Sekunden) des Hot-Paths - threadsicher, ohne externe Abhängigkeiten.
+
+    Pro Messung fallen nur ein perf_counter-Aufruf und ein Ringpuffer-Eintrag
+    an; ist die Registry deaktiviert, sind alle Aufrufe No-ops.
+    """
+
+    def __init__(self, histogram_size=1024, enabled=True):
+        self.histogram_size = histogram_size
+        self.enabled = enabled
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def time(self, name):
+        """Kontextmanager zum Messen einer Stufe: with metrics.time('detect'): ..."""
+        if not self.enabled:
+            return nullcontext()
+        return _Timer(self, name)
+
+    def observe(self, name, value):
+        """Trägt einen Messwert (z.B. Dauer in Sekunden) in das Histogramm ein"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = RollingHistogram(self.histogram_size)
+            histogram.observe(value)
+
+    def inc(self, name, amount=1):
+        """Erhöht einen Zähler"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name, value):
+        """Setzt einen Momentanwert (z.B. Warteschlangenlänge)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.gauges[name] = value
+
+    def quantile(self, name, q, min_count=1):
+        """Quantil eines Histogramms über das aktuelle Fenster (None bei weniger als min_count Werten)"""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None or histogram.count < min_count:
+                return None
+            return float(np.quantile(histogram.window(), q))
+
+    def reset(self):
+        """Verwirft alle Messwerte"""
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+            self.started_at = time.time()
+
+    def snapshot(self):
+        """Momentaufnahme aller Metriken als Dictionary (Histogramme zusammengefasst)"""
+        with self._lock:
+            return {
+                'uptime_s': time.time() - self.started_at,
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+                'histograms': {name: histogram.summary() for name, histogram in self.histograms.items()}
+            }
+
+    def to_json(self):
+        """Export als JSON-Text"""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix='skilift'):
+        """Export im Prometheus-Textformat (Histogramme als Summary mit Quantilen)"""
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot['counters'].items()):
+            metric = f"{prefix}_{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, value in sorted(snapshot['gauges'].items()):
+            metric = f"{prefix}_{name}"
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        for name, summary in sorted(snapshot['histograms'].items()):
+            metric = f"{prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for q in METRIC_QUANTILES:
+                key = f"p{int(q * 100)}"
+                if key in summary:
+                    lines.append(f'{metric}{{quantile="{q}"}} {summary[key]:.6f}')
+            lines += [f"{metric}_sum {summary['sum']:.6f}", f"{metric}_count {summary['count']}"]
+        return "\n".join(lines) + "\n"
+
+    def format_overlay(self):
+        """Kompakte Textdarstellung für das In-App-Overlay"""
+        snapshot = self.snapshot()
+        lines = [f"{'Stufe':<12}{'p50':>8}{'p99':>8}  ms"]
+        for name, summary in sorted(snapshot['histograms'].items()):
+            if summary['count']:
+                lines.append(f"{name:<12}{summary['p50'] * 1000:>8.1f}{summary['p99'] * 1000:>8.1f}")
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f"{name}: {value}")
+        for name, value in sorted(snapshot['gauges'].items()):
+            lines.append(f"{name}: {value}")
+        return "\n".join(lines)
+
+class MetricsServer:
+    """Lokaler HTTP-Endpunkt: /metrics (Prometheus-Text) und /metrics.json - läuft in einem Daemon-Thread"""
+
+    def __init__(self, registry, port, host='127.0.0.1'):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Startet den Server (Fehler, z.B. Port belegt, werden nur ausgegeben)"""
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, content_type = registry.to_prometheus(), 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body, content_type = registry.to_json(), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass  # Keine Ausgabe pro Abfrage
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            print(f"Metrik-Endpunkt konnte nicht gestartet werden ({self.host}:{self.port}): {e}")
+            self._server = None
+            return False
+
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"Metriken unter http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        """Beendet den Server"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,143 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BOUNDARY = 'frame'
+
+INDEX_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Skilift Vorschau</title>
+<style>body{background:#202020;color:#eee;font-family:sans-serif;margin:0}
+img{max-width:100%;display:block;margin:auto}#status{padding:8px 12px;font-size:18px}</style></head>
+<body><div id="status">Verbinde...</div><img src="/stream.mjpg">
+<script>
+async function poll(){try{const s=await (await fetch('/status')).json();
+document.getElementById('status').textContent=`${s.lift_status} | Personen im FOI: ${s.person_count} | ${s.fps.toFixed(1)} FPS | ${s.viewers} Zuschauer`;}catch(e){}}
+setInterval(poll,500);poll();
+</script></body></html>
+"""
+
+class FrameBroadcaster:
+    """Letztes JPEG für alle Zuschauer - jeder Frame wird genau einmal kodiert.
+
+    Es gibt keine Warteschlange pro Zuschauer: wer langsam liest, bekommt
+    beim nächsten Mal einfach das dann aktuelle Bild, Zwischenframes
+    entfallen.
+    """
+
+    def __init__(self):
+        self.jpeg = None
+        self.sequence = 0
+        self.viewers = 0
+        self.condition = threading.Condition()
+
+    def publish(self, jpeg):
+        """Ersetzt das aktuelle Bild und weckt alle wartenden Zuschauer"""
+        with self.condition:
+            self.jpeg = jpeg
+            self.sequence += 1
+            self.condition.notify_all()
+
+    def wait_for_frame(self, last_sequence, timeout=5.0):
+        """Wartet auf ein neueres Bild als last_sequence - (Sequenz, JPEG) oder (last_sequence, None) bei Timeout"""
+        with self.condition:
+            if self.sequence <= last_sequence:
+                self.condition.wait(timeout)
+            if self.sequence <= last_sequence or self.jpeg is None:
+                return last_sequence, None
+            return self.sequence, self.jpeg
+
+    def latest(self):
+        with self.condition:
+            return self.jpeg
+
+    def _add_viewer(self, delta):
+        with self.condition:
+            self.viewers += delta
+
+class MjpegServer:
+    """HTTP-Vorschau: / (Seite), /stream.mjpg (MJPEG), /snapshot.jpg und /status (JSON) - in Daemon-Threads"""
+
+    def __init__(self, broadcaster, status_provider, port, host='127.0.0.1'):
+        self.broadcaster = broadcaster
+        self.status_provider = status_provider  # Callable -> dict, wird im Server-Thread aufgerufen
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Startet den Server (Fehler, z.B. Port belegt, werden nur ausgegeben)"""
+        broadcaster = self.broadcaster
+        status_provider = self.status_provider
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/stream.mjpg':
+                    self._stream()
+                elif path == '/snapshot.jpg':
+                    jpeg = broadcaster.latest()
+                    if jpeg is None:
+                        self.send_error(503, "Noch kein Bild")
+                        return
+                    self._send(jpeg, 'image/jpeg')
+                elif path == '/status':
+                    self._send(json.dumps(status_provider()).encode('utf-8'), 'application/json')
+                elif path in ('/', '/index.html'):
+                    self._send(INDEX_PAGE.encode('utf-8'), 'text/html; charset=utf-8')
+                else:
+                    self.send_error(404)
+
+            def _send(self, data, content_type):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self):
+                self.send_response(200)
+                self.send_header('Content-Type', f'multipart/x-mixed-replace; boundary={BOUNDARY}')
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+
+                broadcaster._add_viewer(1)
+                sequence = 0
+                try:
+                    while True:
+                        sequence, jpeg = broadcaster.wait_for_frame(sequence)
+                        if jpeg is None:
+                            continue
+                        # Blockiert nur diesen Zuschauer - die anderen und die Pipeline laufen weiter
+                        self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                         f"Content-Length: {len(jpeg)}\r\n\r\n".encode('ascii'))
+                        self.wfile.write(jpeg)
+                        self.wfile.write(b"\r\n")
+                except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+                    pass  # Zuschauer hat die Verbindung geschlossen
+                finally:
+                    broadcaster._add_viewer(-1)
+
+            def log_message(self, format, *args):
+                pass  # Keine Ausgabe pro Abfrage
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            print(f"Vorschau-Server konnte nicht gestartet werden ({self.host}:{self.port}): {e}")
+            self._server = None
+            return False
+
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"Vorschau unter http://{self.host}:{self.port}/ (Stream: /stream.mjpg, Status: /status)")
+        return True
+
+    def stop(self):
+        """Beendet den Server"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,45 @@
+import time
+import threading
+
+# Erst beim ersten Modell importiert - ultralytics zieht torch nach und kostet mehrere Sekunden
+_yolo_class = None
+
+def get_yolo_class():
+    """Importiert ultralytics beim ersten Aufruf und gibt die YOLO-Klasse zurück"""
+    global _yolo_class
+    if _yolo_class is None:
+        start = time.perf_counter()
+        from ultralytics import YOLO
+        _yolo_class = YOLO
+        print(f"ultralytics importiert in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return _yolo_class
+
+def load_yolo_model(model_path):
+    """Lädt ein YOLO-Modell (ultralytics wird dabei bei Bedarf importiert)"""
+    yolo_class = get_yolo_class()
+    start = time.perf_counter()
+    model = yolo_class(model_path)
+    print(f"Modell {model_path} geladen in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return model
+
+class PerThreadModel:
+    """Lädt ein YOLO-Modell beim ersten Aufruf einmal pro Thread (ultralytics-Modelle sind nicht threadsicher)"""
+
+    def __init__(self, model_path, model_factory=None):
+        self.model_path = model_path
+        self.model_factory = model_factory or load_yolo_model
+        self._local = threading.local()
+
+    def _get_model(self):
+        """Lädt das Modell für den aktuellen Thread bei Bedarf"""
+        model = getattr(self._local, 'model', None)
+        if model is None:
+            model = self.model_factory(self.model_path)
+            self._local.model = model
+        return model
+
+    def predict(self, frame, **kwargs):
+        return self._get_model().predict(frame, **kwargs)
+
+    def track(self, frame, **kwargs):
+        return self._get_model().track(frame, **kwargs)
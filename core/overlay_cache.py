@@ -0,0 +1,188 @@
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+def to_layer_color(color, frame):
+    """Ergänzt eine BGR-Farbe um volle Deckkraft, wenn auf eine BGRA-Ebene gezeichnet wird"""
+    if frame.ndim == 3 and frame.shape[2] == 4:
+        return (int(color[0]), int(color[1]), int(color[2]), 255)
+    return tuple(int(c) for c in color)
+
+def rasterize_text_with_background(text, font, font_scale, thickness, text_color, bg_color):
+    """Rastert Text mit Hintergrund und weißem Rahmen in ein kleines BGRA-Patch.
+
+    Gibt (patch, (offset_x, offset_y)) zurück; der Offset ist relativ zur
+    Textmitte bzw. Grundlinie, wie bei FOIManager._draw_text_with_background.
+    """
+    (text_width, text_height), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+
+    # Hintergrund wie bisher: 10px Rand links/rechts/oben, 5px unter der Grundlinie
+    bg_left = -(text_width // 2) - 10
+    bg_top = -text_height - 10
+    bg_right = text_width // 2 + 10
+    bg_bottom = 5
+
+    # 1px Reserve für den 2px-Rahmen, Unterlängen dürfen über den Hintergrund ragen
+    offset_x = bg_left - 1
+    offset_y = bg_top - 1
+    patch_w = bg_right - bg_left + 3
+    patch_h = max(bg_bottom, baseline + thickness) - bg_top + 3
+
+    patch = np.zeros((patch_h, patch_w, 4), dtype=np.uint8)
+    p1 = (bg_left - offset_x, bg_top - offset_y)
+    p2 = (bg_right - offset_x, bg_bottom - offset_y)
+    cv2.rectangle(patch, p1, p2, to_layer_color(bg_color, patch), -1)
+    cv2.rectangle(patch, p1, p2, (255, 255, 255, 255), 2)
+    cv2.putText(patch, text, (-(text_width // 2) - offset_x, -offset_y),
+                font, font_scale, to_layer_color(text_color, patch), thickness)
+
+    return patch, (offset_x, offset_y)
+
+class OverlayLayerCache:
+    """Cacht statische Overlay-Ebenen und blendet sie mit vorberechneten Masken ein.
+
+    - Geometrie (dünne Linien, Eckpunkte): Liste der deckenden Pixel als flache
+      Byte-Indizes samt Farbwerten, damit nur die gezeichneten Pixel berührt
+      werden und nicht die ganze Bounding Box des FOI.
+    - Texte (kompakte Rechtecke): dichtes BGR-Patch mit Maske, neu gerastert
+      nur wenn sich der String ändert.
+
+    Overlay-Quellen (z.B. FOIManager) stellen bereit:
+    - overlay_geometry_key(): hashbarer Schlüssel der Geometrie
+    - draw_overlay_geometry(layer): zeichnet die Geometrie auf eine BGRA-Ebene
+    - overlay_text_items(width, height): Liste von (text, center_x, y, font_scale, thickness, text_color, bg_color)
+
+    Alle Koordinaten beziehen sich auf den Frame, auf den eingeblendet wird
+    (Quell- oder Anzeigeauflösung).
+    """
+
+    def __init__(self, max_text_patches=64):
+        self.max_text_patches = max_text_patches
+
+        # Geometrie-Ebene: (flache Indizes, Farben) der deckenden Pixel
+        self.geometry_key = None
+        self.geometry_pixels = None
+
+        # Text-Patches, nur bei geändertem String neu gerastert
+        self.text_patches = OrderedDict()
+
+        # Zusammengesetzte Ebene: Geometrie-Pixel (ohne von Text verdeckte) + platzierte Text-Patches
+        self.composite_key = None
+        self.composite_indices = None
+        self.composite_values = None
+        self.composite_byte_indices = None
+        self.composite_byte_values = None
+        self.composite_patches = []
+
+    def invalidate(self):
+        """Verwirft alle gecachten Ebenen"""
+        self.geometry_key = None
+        self.geometry_pixels = None
+        self.text_patches.clear()
+        self.composite_key = None
+        self.composite_indices = None
+        self.composite_values = None
+        self.composite_byte_indices = None
+        self.composite_byte_values = None
+        self.composite_patches = []
+
+    def composite_onto(self, frame, sources):
+        """Blendet die Overlays aller Quellen auf den Frame (in-place)"""
+        if frame is None:
+            return frame
+
+        h, w = frame.shape[:2]
+        geometry_key = (w, h, tuple(source.overlay_geometry_key() for source in sources))
+        if geometry_key != self.geometry_key:
+            self.geometry_pixels = self._rasterize_geometry(w, h, sources)
+            self.geometry_key = geometry_key
+
+        text_items = tuple(item for source in sources for item in source.overlay_text_items(w, h))
+        composite_key = (geometry_key, text_items)
+        if composite_key != self.composite_key:
+            self._compose(w, h, text_items)
+            self.composite_key = composite_key
+
+        if self.composite_indices is not None and len(self.composite_indices):
+            if frame.flags['C_CONTIGUOUS']:
+                # Byte-weiser Scatter ist deutlich schneller als pixelweises Fancy-Indexing
+                frame.reshape(-1)[self.composite_byte_indices] = self.composite_byte_values
+            else:
+                rows, cols = np.divmod(self.composite_indices, w)
+                frame[rows, cols] = self.composite_values
+
+        for patch, mask, x, y in self.composite_patches:
+            np.copyto(frame[y:y + patch.shape[0], x:x + patch.shape[1]], patch, where=mask)
+        return frame
+
+    def _rasterize_geometry(self, width, height, sources):
+        """Zeichnet die Geometrie aller Quellen auf eine BGRA-Ebene und extrahiert die deckenden Pixel"""
+        layer = np.zeros((height, width, 4), dtype=np.uint8)
+        for source in sources:
+            source.draw_overlay_geometry(layer)
+
+        flat = layer.reshape(-1, 4)
+        indices = np.flatnonzero(flat[:, 3])
+        return indices, flat[indices, :3]
+
+    def _get_text_patch(self, item):
+        """Liefert das gerasterte Patch eines Textelements (LRU-Cache über den Inhalt)"""
+        text, _, _, font_scale, thickness, text_color, bg_color = item
+        key = (text, font_scale, thickness, text_color, bg_color)
+
+        cached = self.text_patches.get(key)
+        if cached is not None:
+            self.text_patches.move_to_end(key)
+            return cached
+
+        patch, offset = rasterize_text_with_background(
+            text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness, text_color, bg_color
+        )
+        # Maske auf 3 Kanäle ausgeweitet - copyto ohne Broadcasting ist um ein Vielfaches schneller
+        mask = np.repeat(patch[:, :, 3:4] > 0, 3, axis=2)
+        cached = (np.ascontiguousarray(patch[:, :, :3]), mask, offset)
+        self.text_patches[key] = cached
+        while len(self.text_patches) > self.max_text_patches:
+            self.text_patches.popitem(last=False)
+        return cached
+
+    def _compose(self, width, height, text_items):
+        """Platziert die Text-Patches und entfernt von ihnen verdeckte Geometrie-Pixel"""
+        placed = []
+        covered = np.zeros(0, dtype=np.intp)
+
+        for item in text_items:
+            patch, mask, (offset_x, offset_y) = self._get_text_patch(item)
+            x = int(item[1]) + offset_x
+            y = int(item[2]) + offset_y
+
+            # Auf den Frame zuschneiden
+            sx0, sy0 = max(0, -x), max(0, -y)
+            sx1 = min(patch.shape[1], width - x)
+            sy1 = min(patch.shape[0], height - y)
+            if sx1 <= sx0 or sy1 <= sy0:
+                continue
+            patch = patch[sy0:sy1, sx0:sx1]
+            mask = mask[sy0:sy1, sx0:sx1]
+            x, y = x + sx0, y + sy0
+            placed.append((patch, mask, x, y))
+
+            mask_rows, mask_cols = np.nonzero(mask[:, :, 0])
+            covered = np.concatenate([covered, (mask_rows + y) * width + (mask_cols + x)])
+
+        self.composite_patches = placed
+
+        if self.geometry_pixels is None:
+            self.composite_indices = self.composite_values = None
+            self.composite_byte_indices = self.composite_byte_values = None
+            return
+
+        indices, values = self.geometry_pixels
+        if len(covered):
+            # Geometrie-Pixel unter Texten nicht zweimal schreiben
+            keep = ~np.isin(indices, covered)
+            indices, values = indices[keep], values[keep]
+        self.composite_indices = indices
+        self.composite_values = values
+        self.composite_byte_indices = (indices[:, None] * 3 + np.arange(3)).ravel()
+        self.composite_byte_values = values.ravel()
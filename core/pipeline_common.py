@@ -0,0 +1,142 @@
+"""Gemeinsame Schritte von VideoPlayer und HeadlessPipeline (ohne Qt).
+
+Ausgaben aus der Konfiguration erzeugen, FOI auswerten, Vorfälle auslösen,
+den Lift-Status veröffentlichen und beim Beenden exportieren - beide
+Oberflächen verhalten sich damit gleich.
+"""
+import os
+import time
+from core.frame_cache import FrameCache
+from core.detection_recorder import DetectionRecorder
+from core.incident_recorder import IncidentRecorder
+from core.alert_publisher import AlertPublisher, create_sink
+
+def resolve_path(path, config_dir):
+    """Relative Pfade gelten relativ zum Verzeichnis der config.json"""
+    return path if os.path.isabs(path) else os.path.join(config_dir, path)
+
+def create_frame_cache(frame_cache_config, config_dir):
+    """Frame-Cache gemäß frame_cache_config oder None"""
+    if not frame_cache_config.get('enabled', False):
+        return None
+    cache_dir = resolve_path(frame_cache_config.get('cache_dir', '.cache/frames'), config_dir)
+    max_bytes = int(frame_cache_config.get('max_size_mb', 2048) * 1024 * 1024)
+    return FrameCache(cache_dir, max_bytes, frame_cache_config.get('max_width', 0))
+
+def create_recorder(recording_config, config_dir):
+    """Aufzeichnung in einem neuen Sitzungsverzeichnis gemäß recording_config oder None"""
+    if not recording_config.get('enabled', False):
+        return None
+    output_dir = resolve_path(recording_config.get('output_dir', 'recordings'), config_dir)
+    session_dir = os.path.join(output_dir, time.strftime("%Y%m%d_%H%M%S"))
+    try:
+        recorder = DetectionRecorder(session_dir, recording_config.get('chunk_frames', 512))
+    except OSError as e:
+        print(f"Aufzeichnung konnte nicht gestartet werden: {e}")
+        return None
+    print(f"Aufzeichnung: {session_dir}")
+    return recorder
+
+def create_incident_recorder(incident_config, config_dir):
+    """Vorfall-Rekorder gemäß incident_config oder None"""
+    if not incident_config.get('enabled', False):
+        return None
+    try:
+        return IncidentRecorder(
+            resolve_path(incident_config.get('output_dir', 'incidents'), config_dir),
+            pre_seconds=incident_config.get('pre_seconds', 10.0),
+            post_seconds=incident_config.get('post_seconds', 5.0),
+            fps=incident_config.get('fps', 10.0),
+            jpeg_quality=incident_config.get('jpeg_quality', 80),
+            max_width=incident_config.get('max_width', 960)
+        )
+    except OSError as e:
+        print(f"Vorfall-Rekorder konnte nicht gestartet werden: {e}")
+        return None
+
+def create_alert_publisher(alert_output_config, metrics=None):
+    """Alarm-Ausgabe mit allen verfügbaren Ausgaben gemäß alert_output_config oder None"""
+    if not alert_output_config.get('enabled', False):
+        return None
+
+    sinks = []
+    for sink_config in alert_output_config.get('sinks', []):
+        if not sink_config.get('enabled', True):
+            continue
+        try:
+            sinks.append(create_sink(sink_config))
+        except (OSError, ValueError, KeyError, RuntimeError) as e:
+            print(f"Alarm-Ausgabe {sink_config.get('type')} nicht verfügbar: {e}")
+    if not sinks:
+        return None
+
+    return AlertPublisher(
+        sinks, metrics=metrics,
+        max_retries=alert_output_config.get('max_retries', 3),
+        retry_delay=alert_output_config.get('retry_delay', 0.5),
+        max_retry_delay=alert_output_config.get('max_retry_delay', 5.0)
+    )
+
+def get_status_style_key(lift_status):
+    """Ordnet den Lift-Status einer Kategorie zu (auch Style der Status-Bar)"""
+    if "verlangsamt" in lift_status:
+        return 'slowed'
+    if "gestoppt" in lift_status:
+        return 'stopped'
+    if "Normalgeschwindigkeit" in lift_status:
+        return 'normal_speed'
+    return 'normal'
+
+def evaluate_foi(foi_manager, detections, metrics):
+    """Zählt Objekte und prüft Alert-Objekte im FOI -> (Status vorher, Status nachher)"""
+    previous_status = foi_manager.get_lift_status()
+    with metrics.time('foi'):
+        foi_manager.count_objects_in_foi(detections)
+        foi_manager.check_alert_objects_in_foi(detections)
+    return previous_status, foi_manager.get_lift_status()
+
+def observe_alert_latency(metrics, capture_time, previous_status, lift_status):
+    """Erfasst die Latenz Erfassung -> FOI-Entscheidung (bzw. -> Statuswechsel) und gibt sie zurück"""
+    if capture_time is None:
+        return None
+    latency = time.monotonic() - capture_time
+
+    # Jeder ausgewertete Frame: so spät würde ein Alarm in diesem Frame frühestens ausgelöst
+    metrics.observe('capture_to_alert', latency)
+    if lift_status != previous_status:
+        metrics.observe('capture_to_status_change', latency)
+    return latency
+
+def trigger_incident(incident_recorder, previous_status, lift_status):
+    """Startet einen Vorfall-Clip beim Wechsel nach 'verlangsamt' bzw. 'gestoppt'"""
+    if (incident_recorder is not None and lift_status != previous_status
+            and get_status_style_key(lift_status) in ('slowed', 'stopped')):
+        incident_recorder.trigger(lift_status)
+
+def publish_lift_status(alert_publisher, foi_manager, published_status):
+    """Veröffentlicht den Lift-Status bei Änderung seit der letzten Meldung -> zuletzt veröffentlichter Status"""
+    if alert_publisher is None:
+        return published_status
+    status_info = foi_manager.get_status_info()
+    if status_info['status'] == published_status:
+        return published_status
+    alert_publisher.publish(status_info)
+    return status_info['status']
+
+def record_result(recorder, frame_size, detections, poses, lift_status, capture_time=None):
+    """Zeichnet ein Ergebnis auf - Zeitstempel = Erfassungszeitpunkt des Frames (als Wanduhrzeit)"""
+    if recorder is None:
+        return
+    timestamp = time.time()
+    if capture_time is not None:
+        timestamp -= time.monotonic() - capture_time
+    recorder.record(timestamp, frame_size, detections, poses, lift_status)
+
+def export_final_results(heatmap_accumulator, heatmap_config, line_counter, line_config, config_dir):
+    """Sichert beim Beenden die aktuelle Heatmap und die Zählungen der Zähllinie"""
+    if heatmap_config.get('enabled', False):
+        heatmap_accumulator.export_snapshot()
+
+    export_file = line_config.get('export_file')
+    if line_config.get('enabled', False) and export_file:
+        line_counter.export_csv(resolve_path(export_file, config_dir))
@@ -0,0 +1,126 @@
+import os
+import json
+import hashlib
+import numpy as np
+from core.model_loader import PerThreadModel
+
+# Datei-Hashes pro (Pfad, Größe, Änderungszeit) - Modelle werden nur einmal pro Prozess gehasht
+_file_hash_cache = {}
+
+def file_hash(file_path):
+    """SHA-1 des Dateiinhalts (gecacht, solange Größe und Änderungszeit gleich bleiben)"""
+    stat = os.stat(file_path)
+    cache_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    cached = _file_hash_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    _file_hash_cache[cache_key] = digest.hexdigest()
+    return _file_hash_cache[cache_key]
+
+class PredictionCache:
+    """Speichert Roh-Vorhersagen eines Modells über einen Datensatz als komprimierte .npz-Datei.
+
+    Der Schlüssel umfasst den Modell-Hash, die Bilder (Pfad, Größe,
+    Änderungszeit) und die Inferenz-Parameter - ändert sich eines davon,
+    wird neu gerechnet.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def make_key(self, model_hash, image_paths, params):
+        """Berechnet den Cache-Schlüssel"""
+        digest = hashlib.sha1()
+        digest.update(model_hash.encode('utf-8'))
+        digest.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+        for image_path in image_paths:
+            stat = os.stat(image_path)
+            digest.update(f"{os.path.abspath(image_path)}|{stat.st_size}|{stat.st_mtime_ns}".encode('utf-8'))
+        return f"{model_hash[:12]}_{digest.hexdigest()[:16]}"
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def load(self, key):
+        """Lädt gecachte Arrays (dict) oder None"""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                return {name: data[name] for name in data.files}
+        except Exception as e:
+            print(f"Cache-Datei {path} ungültig, wird neu berechnet: {e}")
+            return None
+
+    def save(self, key, arrays):
+        """Speichert Arrays (dict) komprimiert - atomar über temporäre Datei"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        temp_path = path + ".tmp.npz"
+        np.savez_compressed(temp_path, **arrays)
+        os.replace(temp_path, path)
+        return path
+
+class CachedBoxes:
+    """Boxen im Format der ultralytics-Ergebnisse (xyxy, conf, cls, id) als NumPy-Arrays"""
+
+    def __init__(self, xyxy, conf, cls, id=None):
+        self.xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+        self.conf = np.asarray(conf, dtype=np.float32)
+        self.cls = np.asarray(cls, dtype=np.float32)
+        self.id = None if id is None else np.asarray(id, dtype=np.float32)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self
+
+    def __len__(self):
+        return len(self.conf)
+
+class CachedResult:
+    """Minimales Ergebnisobjekt mit .boxes wie bei model.predict(...)[0]"""
+
+    def __init__(self, boxes):
+        self.boxes = boxes
+
+class CachedDetectionModel:
+    """Detection-Modell mit Vorhersage-Cache pro Bild (Schlüssel: Modell-Hash, Bild, Parameter).
+
+    Das echte Modell wird erst bei einem Cache-Miss geladen, und zwar eine
+    Instanz pro Thread (ultralytics-Modelle sind nicht threadsicher).
+    """
+
+    def __init__(self, model_path, cache, model_factory=None):
+        self.model_path = model_path
+        self.model_hash = file_hash(model_path)
+        self.cache = cache
+        self.model = PerThreadModel(model_path, model_factory)
+
+    def for_image(self, image_path):
+        """Liefert ein Modell-Objekt für genau ein Bild (predict() wie bei ultralytics)"""
+        return _CachedImageModel(self, image_path)
+
+class _CachedImageModel:
+    """Bindet CachedDetectionModel an ein Bild, damit predict(frame) den Cache-Schlüssel kennt"""
+
+    def __init__(self, cached_model, image_path):
+        self.cached_model = cached_model
+        self.image_path = image_path
+
+    def predict(self, frame, verbose=False, **kwargs):
+        cache = self.cached_model.cache
+        key = cache.make_key(self.cached_model.model_hash, [self.image_path], kwargs)
+        arrays = cache.load(key)
+        if arrays is None:
+            boxes = self.cached_model.model.predict(frame, verbose=verbose, **kwargs)[0].boxes.cpu().numpy()
+            arrays = {'xyxy': boxes.xyxy, 'conf': boxes.conf, 'cls': boxes.cls}
+            cache.save(key, arrays)
+        return [CachedResult(CachedBoxes(arrays['xyxy'], arrays['conf'], arrays['cls']))]
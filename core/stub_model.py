@@ -0,0 +1,102 @@
+import time
+import numpy as np
+from config.constants import NUM_KEYPOINTS
+from core.prediction_cache import CachedBoxes, CachedResult
+
+class StubKeypoints:
+    """Keypoints im Format der ultralytics-Ergebnisse (xy, conf) als NumPy-Arrays"""
+
+    def __init__(self, xy, conf):
+        self.xy = np.asarray(xy, dtype=np.float32).reshape(-1, NUM_KEYPOINTS, 2)
+        self.conf = np.asarray(conf, dtype=np.float32).reshape(-1, NUM_KEYPOINTS)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self
+
+    def __len__(self):
+        return len(self.xy)
+
+class StubDetectionModel:
+    """Deterministisches Ersatz-Detection-Modell (predict/track wie ultralytics) für Benchmarks ohne Gewichte.
+
+    Liefert pro Aufruf num_boxes Boxen der angegebenen Klassen; die Boxen
+    hängen nur vom Seed und der Aufrufnummer ab. latency simuliert die
+    Inferenzzeit (time.sleep, gibt die GIL frei wie eine GPU-Inferenz).
+    """
+
+    def __init__(self, num_boxes=5, latency=0.0, class_ids=(0,), seed=0):
+        self.num_boxes = num_boxes
+        self.latency = latency
+        self.class_ids = np.asarray(class_ids, dtype=np.float32)
+        self.seed = seed
+        self.calls = 0
+
+    def predict(self, frame, verbose=False, **kwargs):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        h, w = frame.shape[:2]
+        rng = np.random.default_rng((self.seed, self.calls))
+        self.calls += 1
+
+        # Boxen zwischen 5% und 30% der Bildgröße, vollständig im Bild
+        sizes = rng.uniform(0.05, 0.3, (self.num_boxes, 2)) * (w, h)
+        origins = rng.uniform(0, 1, (self.num_boxes, 2)) * ((w, h) - sizes)
+        xyxy = np.hstack([origins, origins + sizes])
+        conf = rng.uniform(0.5, 0.99, self.num_boxes)
+        cls = self.class_ids[np.arange(self.num_boxes) % len(self.class_ids)]
+        return [CachedResult(CachedBoxes(xyxy, conf, cls))]
+
+    def track(self, frame, persist=True, verbose=False, **kwargs):
+        """Wie predict, mit fortlaufenden Track-IDs pro Box-Index"""
+        result = self.predict(frame, verbose=verbose, **kwargs)[0]
+        result.boxes.id = np.arange(1, len(result.boxes) + 1, dtype=np.float32)
+        return [result]
+
+class StubPoseResult:
+    """Minimales Pose-Ergebnis mit .keypoints und .boxes (Klasse 0, umschließt die Keypoints) wie bei model.predict(...)[0]"""
+
+    def __init__(self, keypoints):
+        self.keypoints = keypoints
+        xy = keypoints.xy
+        if len(xy):
+            xyxy = np.hstack([xy.min(axis=1), xy.max(axis=1)])
+            conf = keypoints.conf.mean(axis=1)
+        else:
+            xyxy, conf = np.zeros((0, 4)), np.zeros(0)
+        self.boxes = CachedBoxes(xyxy, conf, np.zeros(len(xy)))
+
+class StubPoseModel:
+    """Deterministisches Ersatz-Pose-Modell: persons Personen mit 17 Keypoints pro Ausschnitt bzw. Vollbild"""
+
+    def __init__(self, persons=1, latency=0.0, seed=0):
+        self.persons = persons
+        self.latency = latency
+        self.seed = seed
+        self.calls = 0
+
+    def predict(self, roi, verbose=False, **kwargs):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        h, w = roi.shape[:2]
+        rng = np.random.default_rng((self.seed, self.calls))
+        self.calls += 1
+
+        xy = rng.uniform(0.1, 0.9, (self.persons, NUM_KEYPOINTS, 2)) * (w, h)
+        if self.persons > 1:
+            # Mehrere Personen (z.B. Vollbild im Nur-Pose-Modus): jede in einem eigenen Bereich wie die Detection-Boxen
+            sizes = rng.uniform(0.05, 0.3, (self.persons, 1, 2)) * (w, h)
+            origins = rng.uniform(0, 1, (self.persons, 1, 2)) * ((w, h) - sizes)
+            xy = origins + xy / (w, h) * sizes
+        conf = rng.uniform(0.2, 1.0, (self.persons, NUM_KEYPOINTS))
+        return [StubPoseResult(StubKeypoints(xy, conf))]
+
+    def track(self, frame, persist=True, verbose=False, **kwargs):
+        """Wie predict, mit fortlaufenden Track-IDs pro Person"""
+        result = self.predict(frame, verbose=verbose, **kwargs)[0]
+        result.boxes.id = np.arange(1, len(result.boxes) + 1, dtype=np.float32)
+        return [result]
@@ -0,0 +1,92 @@
+import queue
+import threading
+import cv2
+
+class VideoExporter:
+    """Schreibt gerenderte Frames über einen eigenen Encoder-Thread in ein Video.
+
+    write() legt nur eine Referenz in eine begrenzte Warteschlange; ist sie
+    voll, wird der Frame für den Export verworfen. Anzeige, Inferenz und
+    Alarm-Logik warten so nie auf den Encoder.
+    """
+
+    def __init__(self, output_path, fps, width=0, queue_size=32, show_status=True):
+        self.output_path = output_path
+        self.fps = fps if fps and fps > 0 else 0  # 0 = Bildrate des ersten write()-Aufrufs
+        self.width = int(width or 0)  # 0 = Größe des ersten Frames
+        self.show_status = show_status
+        self.written_frames = 0
+        self.dropped_frames = 0
+        self._writer = None
+        self._size = None
+        self._queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, frame, status=None, fps=None):
+        """Übergibt einen Frame (wird nicht verändert) - False, wenn er wegen Rückstau verworfen wurde.
+
+        fps ist die Bildrate der Quelle; sie gilt nur ohne feste Bildrate und
+        nur für den ersten Frame (danach ist die Datei geöffnet).
+        """
+        try:
+            self._queue.put_nowait((frame, status, fps))
+            return True
+        except queue.Full:
+            self.dropped_frames += 1
+            return False
+
+    def close(self):
+        """Schreibt die restlichen Frames und schließt die Datei"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            frame, status, fps = item
+            try:
+                self._encode(frame, status, fps)
+            except Exception as e:
+                print(f"Fehler beim Video-Export: {e}")
+
+        if self._writer is not None:
+            self._writer.release()
+            print(f"Video-Export gespeichert: {self.output_path} "
+                  f"({self.written_frames} Frames, {self.dropped_frames} verworfen)")
+
+    def _encode(self, frame, status, fps):
+        if self._size is None:
+            if not self.fps:
+                self.fps = fps if fps and fps > 0 else 30.0
+            height, width = frame.shape[:2]
+            if self.width and width != self.width:
+                height, width = max(1, int(round(height * self.width / width))), self.width
+            self._size = (width, height)
+            self._writer = cv2.VideoWriter(self.output_path, cv2.VideoWriter_fourcc(*'mp4v'), self.fps, self._size)
+            if not self._writer.isOpened():
+                print(f"Video-Export {self.output_path} konnte nicht geöffnet werden")
+
+        # Resize bzw. Kopie, damit der angezeigte Frame unverändert bleibt
+        if (frame.shape[1], frame.shape[0]) != self._size:
+            frame = cv2.resize(frame, self._size, interpolation=cv2.INTER_AREA)
+        elif self.show_status and status:
+            frame = frame.copy()
+
+        if self.show_status and status:
+            self._draw_status(frame, status)
+        self._writer.write(frame)
+        self.written_frames += 1
+
+    def _draw_status(self, frame, status):
+        """Lift-Status als Textbalken unten links (im Export fehlt die Status-Bar der Oberfläche)"""
+        font_scale = max(0.5, frame.shape[1] / 1600)
+        thickness = max(1, int(round(font_scale * 2)))
+        (text_width, text_height), baseline = cv2.getTextSize(status, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+        frame_height = frame.shape[0]
+        cv2.rectangle(frame, (0, frame_height - text_height - baseline - 20), (text_width + 20, frame_height),
+                      (0, 0, 0), -1)
+        cv2.putText(frame, status, (10, frame_height - baseline - 10), cv2.FONT_HERSHEY_SIMPLEX,
+                    font_scale, (255, 255, 255), thickness, cv2.LINE_AA)
@@ -1,18 +1,66 @@
+import time
+_start_time = time.perf_counter()
+
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from ui.video_player import VideoPlayer
+import argparse
+
+def _elapsed_ms(since=None):
+    """Millisekunden seit Programmstart (bzw. seit dem angegebenen Zeitpunkt)"""
+    return (time.perf_counter() - (since if since is not None else _start_time)) * 1000
+
+def run_headless(args):
+    """Pipeline ohne Oberfläche mit MJPEG-Vorschau und Status-Endpunkt"""
+    from config.config_manager import ConfigManager
+    from core.headless_pipeline import HeadlessPipeline
+
+    config_manager = ConfigManager()
+    config = config_manager.load_config()
+    headless_config = dict(config.get('headless_config', {}))
+    if args.port:
+        headless_config['port'] = args.port
+    if args.host:
+        headless_config['host'] = args.host
+    config['headless_config'] = headless_config
+
+    pipeline = HeadlessPipeline(config, os.path.dirname(config_manager.get_config_path()), args.video)
+    pipeline.load_models()
+    print(f"Startzeit: Pipeline bereit nach {_elapsed_ms():.0f} ms")
+    return pipeline.run()
 
 def main():
     """Hauptfunktion der Anwendung"""
+    parser = argparse.ArgumentParser(description="YOLO Dual Model Video Annotator")
+    parser.add_argument('--headless', action='store_true',
+                        help="Ohne Oberfläche - annotierte Vorschau per HTTP (MJPEG) und Status als JSON")
+    parser.add_argument('--video', nargs='+', help="Videos (statt video_files aus der config.json, nur --headless)")
+    parser.add_argument('--host', help="Adresse des Vorschau-Servers (überschreibt headless_config)")
+    parser.add_argument('--port', type=int, help="Port des Vorschau-Servers (überschreibt headless_config)")
+    args = parser.parse_args()
+
+    if args.headless:
+        sys.exit(run_headless(args))
+
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QTimer
+    from ui.video_player import VideoPlayer
+    import_time = time.perf_counter()
+    print(f"Startzeit: Importe {_elapsed_ms():.0f} ms")
+
     app = QApplication(sys.argv)
     app.setApplicationName("YOLO Dual Model Video Annotator")
     app.setApplicationVersion("2.0")
-    
+
+    window_start = time.perf_counter()
     player = VideoPlayer()
     player.show()
-    
+    print(f"Startzeit: Fenster erstellt in {_elapsed_ms(window_start):.0f} ms")
+
+    # Erster Durchlauf der Event-Loop - das Fenster ist jetzt sichtbar, Modelle laden im Hintergrund
+    QTimer.singleShot(0, lambda: print(f"Startzeit: UI sichtbar nach {_elapsed_ms():.0f} ms "
+                                       f"(davon Importe {(import_time - _start_time) * 1000:.0f} ms)"))
+
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
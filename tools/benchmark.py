@@ -0,0 +1,306 @@
+"""End-to-End-Benchmark der Pipeline pro Stufe mit deterministischem Ersatz-Modell.
+
+Treibt die echten Pipeline-Teile (run_inference, FOIManager, FrameRenderer)
+über ein Video und/oder synthetische Frames und misst pro Frame die Stufen
+Dekodieren, Detection, Pose (gesamt und pro Ausschnitt) bzw. den
+Vollbild-Pass im Nur-Pose-Modus, FOI-Logik, Rendern und Qt-Konvertierung. Ergebnis: Perzentile und Durchsatz als JSON,
+vergleichbar zwischen Commits.
+
+Beispiele:
+    python tools/benchmark.py --output bench_baseline.json
+    python tools/benchmark.py --boxes 20 --latency 0.02 --output bench.json --compare bench_baseline.json
+    python tools/benchmark.py --compare bench_baseline.json bench.json
+    python tools/benchmark.py --latency 0.02 --pose-latency 0.01 --pose-only
+"""
+import os
+import sys
+import copy
+import json
+import argparse
+import platform
+import subprocess
+import time
+from contextlib import contextmanager
+from datetime import datetime
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QPoint
+from PyQt6.QtGui import QImage, QPainter
+from config.constants import DEFAULT_CONFIG, COLORS
+from core.inference import run_inference
+from core.foi_manager import FOIManager
+from core.frame_renderer import FrameRenderer
+from core.stub_model import StubDetectionModel, StubPoseModel
+
+STAGES = ['decode', 'detect', 'pose', 'pose_roi', 'pose_single', 'foi', 'render', 'qt', 'total']
+# Von run_inference selbst gemessene Stufen (gleiche Namen wie in der MetricsRegistry)
+INFERENCE_STAGES = ('detect', 'pose', 'pose_roi', 'pose_single')
+PERCENTILES = (50, 90, 99)
+DEFAULT_VIDEO = os.path.join('5_Video', 'Normal_short.mp4')
+
+class _StageTimes:
+    """Sammelt die Stufenzeiten von run_inference (gleiche Schnittstelle wie MetricsRegistry.time)"""
+
+    def __init__(self):
+        self.durations = {}
+
+    @contextmanager
+    def time(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations.setdefault(name, []).append(time.perf_counter() - start)
+
+    def take(self):
+        """Gibt die seit dem letzten Aufruf gesammelten Dauern pro Stufe zurück und leert sie"""
+        durations, self.durations = self.durations, {}
+        return durations
+
+def build_config(num_classes):
+    """Feste Benchmark-Konfiguration (unabhängig von config.json): alle Klassen aktiv, FOI und Pose an"""
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    colors = list(COLORS.values())
+    config['class_config'] = {
+        str(i): {'name': f"class_{i}", 'color': colors[i % len(colors)], 'conf': 0.5, 'iou': 0.7}
+        for i in range(num_classes)
+    }
+    config['pose_config']['pose_detect_classes'] = ['0']
+    config['foi_config'].update({'enabled': True, 'count_class': '0', 'alert_class': str(min(1, num_classes - 1))})
+    return config
+
+def video_frames(video_path):
+    """Liefert (Frame, Dekodierzeit) aus dem Video in Endlosschleife"""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Video konnte nicht geöffnet werden: {video_path}")
+    try:
+        while True:
+            start = time.perf_counter()
+            ret, frame = cap.read()
+            if not ret:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                start = time.perf_counter()
+                ret, frame = cap.read()
+                if not ret:
+                    raise RuntimeError(f"Keine Frames in {video_path}")
+            yield frame, time.perf_counter() - start
+    finally:
+        cap.release()
+
+def synthetic_frames(width, height, count=8, seed=0):
+    """Liefert (Frame, Dekodierzeit) aus wenigen vorberechneten Rauschbildern - 'Dekodieren' ist hier eine Kopie"""
+    rng = np.random.default_rng(seed)
+    frames = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(count)]
+    idx = 0
+    while True:
+        start = time.perf_counter()
+        frame = frames[idx % count].copy()
+        idx += 1
+        yield frame, time.perf_counter() - start
+
+def run_source(frames, num_frames, warmup, config, detection_model, pose_model, display_size):
+    """Führt die Pipeline für eine Quelle aus und sammelt die Stufenzeiten (Sekunden)"""
+    stage_times = _StageTimes()
+    foi_manager = FOIManager(config['foi_config'])
+    renderer = FrameRenderer(config['class_config'], config['pose_config'], config['display_config'])
+    display_width, display_height = display_size
+    target = QImage(display_width, display_height, QImage.Format.Format_RGB32)
+
+    samples = {stage: [] for stage in STAGES}
+    wall_start = None
+    for index in range(warmup + num_frames):
+        if index == warmup:
+            samples = {stage: [] for stage in STAGES}
+            wall_start = time.perf_counter()
+
+        frame_start = time.perf_counter()
+        frame, decode_time = next(frames)
+        h, w = frame.shape[:2]
+        foi_manager.set_frame_dimensions(w, h)
+
+        # Detection + Pose über denselben Pfad wie der Worker (ohne Qt), Stufen von run_inference gemessen
+        detections, poses = run_inference(frame, detection_model, pose_model, config['class_config'],
+                                          config['pose_config'], metrics=stage_times)
+        inference_times = stage_times.take()
+
+        start = time.perf_counter()
+        foi_manager.count_objects_in_foi(detections)
+        foi_manager.check_alert_objects_in_foi(detections)
+        foi_time = time.perf_counter() - start
+
+        # Rendern wie VideoPlayer.render_frame + _show_with_overlays
+        scale = min(display_width / w, display_height / h)
+        target_size = (max(1, int(w * scale)), max(1, int(h * scale)))
+        start = time.perf_counter()
+        base_frame = renderer.render_frame(frame, detections, poses, target_size=target_size)
+        rendered_frame = renderer.render_overlays(base_frame, [foi_manager])
+        render_time = time.perf_counter() - start
+
+        # Qt: QImage direkt über dem BGR-Puffer und Zeichnen wie VideoWidget.paintEvent
+        start = time.perf_counter()
+        image = QImage(rendered_frame.data, rendered_frame.shape[1], rendered_frame.shape[0],
+                       rendered_frame.strides[0], QImage.Format.Format_BGR888)
+        painter = QPainter(target)
+        painter.drawImage(QPoint(0, 0), image)
+        painter.end()
+        qt_time = time.perf_counter() - start
+
+        samples['decode'].append(decode_time)
+        for stage in INFERENCE_STAGES:
+            samples[stage].extend(inference_times.get(stage, []))
+        samples['foi'].append(foi_time)
+        samples['render'].append(render_time)
+        samples['qt'].append(qt_time)
+        samples['total'].append(time.perf_counter() - frame_start)
+
+    wall_time = time.perf_counter() - wall_start
+    return summarize(samples, num_frames, wall_time)
+
+def summarize(samples, num_frames, wall_time):
+    """Perzentile pro Stufe in Millisekunden und Durchsatz"""
+    stages = {}
+    for stage, values in samples.items():
+        if not values:
+            continue
+        values_ms = np.asarray(values) * 1000
+        stats = {f"p{p}": float(np.percentile(values_ms, p)) for p in PERCENTILES}
+        stats.update({'mean': float(values_ms.mean()), 'max': float(values_ms.max()), 'count': len(values_ms)})
+        stages[stage] = stats
+    return {'frames': num_frames, 'wall_time_s': wall_time, 'fps': num_frames / wall_time if wall_time > 0 else 0.0,
+            'stages': stages}
+
+def git_revision():
+    """Aktueller Commit (kurz) oder None außerhalb eines Git-Repos"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except Exception:
+        return None
+
+def compare(baseline, current, tolerance):
+    """Vergleicht zwei Benchmark-Ergebnisse pro Quelle und Stufe -> Anzahl Regressionen"""
+    print(f"Vergleich: {baseline['meta'].get('git_revision')} -> {current['meta'].get('git_revision')} "
+          f"(Toleranz {tolerance:.0f}%)")
+    changed = sorted(key for key, value in current['meta'].get('args', {}).items()
+                     if baseline['meta'].get('args', {}).get(key) != value)
+    if changed:
+        print(f"Achtung: unterschiedliche Parameter ({', '.join(changed)}) - Zahlen nur bedingt vergleichbar")
+    regressions = 0
+    for source, result in current['results'].items():
+        base_result = baseline['results'].get(source)
+        if base_result is None:
+            continue
+        print(f"\n[{source}] FPS {base_result['fps']:.1f} -> {result['fps']:.1f}")
+        print(f"{'Stufe':<12}{'p50 alt':>10}{'p50 neu':>10}{'Δ%':>8}{'p99 alt':>10}{'p99 neu':>10}{'Δ%':>8}")
+        for stage, stats in result['stages'].items():
+            base = base_result['stages'].get(stage)
+            if base is None:
+                continue
+            row = f"{stage:<12}"
+            flagged = False
+            for key in ('p50', 'p99'):
+                delta = (stats[key] - base[key]) / base[key] * 100 if base[key] > 0 else 0.0
+                row += f"{base[key]:>10.3f}{stats[key]:>10.3f}{delta:>+8.1f}"
+                # Sehr kurze Stufen (< 0,05 ms) schwanken zu stark für einen Vergleich
+                if delta > tolerance and stats[key] - base[key] > 0.05:
+                    flagged = True
+            if flagged:
+                regressions += 1
+                row += "  <- langsamer"
+            print(row)
+    return regressions
+
+def parse_size(text):
+    """'1280x720' -> (1280, 720)"""
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-End-Benchmark der Pipeline mit Ersatz-Modell")
+    parser.add_argument('--source', choices=['video', 'synthetic', 'both'], default='both')
+    parser.add_argument('--video', default=DEFAULT_VIDEO)
+    parser.add_argument('--synthetic-size', type=parse_size, default=(1920, 1080), help="z.B. 1920x1080")
+    parser.add_argument('--display-size', type=parse_size, default=(1280, 720), help="Größe des Video-Widgets")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--boxes', type=int, default=8, help="Boxen pro Frame des Ersatz-Modells")
+    parser.add_argument('--classes', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.0, help="Simulierte Detection-Inferenzzeit in Sekunden")
+    parser.add_argument('--persons', type=int, default=1, help="Personen pro Pose-Ausschnitt (0 = ohne Pose)")
+    parser.add_argument('--pose-latency', type=float, default=0.0, help="Simulierte Pose-Inferenzzeit pro Ausschnitt")
+    parser.add_argument('--pose-only', action='store_true',
+                        help="Nur-Pose-Modus: ein Pose-Pass auf dem Vollbild mit --boxes Personen, ohne Detection")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="JSON-Datei für die Ergebnisse")
+    parser.add_argument('--compare', nargs='+', metavar='JSON',
+                        help="Baseline (vergleicht mit diesem Lauf) oder Baseline und Vergleichsdatei (ohne Lauf)")
+    parser.add_argument('--tolerance', type=float, default=10.0, help="Erlaubte Verlangsamung in Prozent")
+    args = parser.parse_args(argv)
+
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare erwartet eine oder zwei Dateien")
+
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[0], 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.compare[1], 'r', encoding='utf-8') as f:
+            current = json.load(f)
+        return 1 if compare(baseline, current, args.tolerance) else 0
+
+    config = build_config(args.classes)
+    config['pose_config']['pose_only'] = args.pose_only
+    sources = ['video', 'synthetic'] if args.source == 'both' else [args.source]
+    results = {}
+    for source in sources:
+        if source == 'video' and not os.path.exists(args.video):
+            print(f"Video nicht gefunden, übersprungen: {args.video}")
+            continue
+
+        # Neue Modelle pro Quelle, damit jede Quelle dieselbe Box-Folge sieht
+        detection_model = StubDetectionModel(args.boxes, args.latency, range(args.classes), args.seed)
+        pose_model = StubPoseModel(args.persons, args.pose_latency, args.seed) if args.persons > 0 else None
+        if args.pose_only:
+            pose_model = StubPoseModel(args.boxes, args.pose_latency, args.seed)
+        frames = video_frames(args.video) if source == 'video' else synthetic_frames(*args.synthetic_size, seed=args.seed)
+
+        result = run_source(frames, args.frames, args.warmup, config, detection_model, pose_model, args.display_size)
+        frames.close()
+        results[source] = result
+
+        print(f"\n[{source}] {result['frames']} Frames, {result['fps']:.1f} FPS")
+        print(f"{'Stufe':<12}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  (ms)")
+        for stage, stats in result['stages'].items():
+            print(f"{stage:<12}{stats['p50']:>9.3f}{stats['p90']:>9.3f}{stats['p99']:>9.3f}{stats['max']:>9.3f}")
+
+    report = {
+        'meta': {
+            'git_revision': git_revision(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'opencv': cv2.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')}
+        },
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nErgebnisse gespeichert: {args.output}")
+
+    if args.compare:
+        with open(args.compare[0], 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print()
+        return 1 if compare(baseline, report, args.tolerance) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
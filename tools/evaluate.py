@@ -0,0 +1,157 @@
+"""Auswertung der konfigurierten Pipeline gegen einen gelabelten Datensatz (YOLO-Format).
+
+Jedes Bild läuft durch denselben Pfad wie im Live-Betrieb
+(run_inference inkl. class_config-Filter), parallel in einem
+Thread-Pool. Die Modell-Vorhersagen werden pro Bild unter dem Modell-Hash
+gecacht - neue Schwellwerte in class_config werden ohne erneute Inferenz
+ausgewertet.
+
+Beispiel:
+    python tools/evaluate.py --data 01_Data_Jon/Augmented/Images_split/Images/val --workers 4
+"""
+import os
+import sys
+import csv
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config_manager import ConfigManager
+from core.inference import run_inference
+from core.evaluation import find_dataset_images, load_yolo_labels, match_detections, average_precision
+from core.model_loader import PerThreadModel
+from core.prediction_cache import PredictionCache, CachedDetectionModel
+
+# IoU-Schwellen für mAP50-95
+MAP_IOU_THRESHOLDS = np.linspace(0.5, 0.95, 10)
+
+def evaluate_image(sample, cached_model, pose_model, class_config, pose_config):
+    """Führt die Pipeline für ein Bild aus und lädt dessen Labels"""
+    image_path, label_path = sample
+    frame = cv2.imread(image_path)
+    if frame is None:
+        print(f"Bild konnte nicht gelesen werden: {image_path}")
+        return None
+
+    detections, _ = run_inference(frame, cached_model.for_image(image_path), pose_model, class_config, pose_config)
+
+    labels = load_yolo_labels(label_path, frame.shape[1], frame.shape[0])
+    return detections, labels
+
+def compute_metrics(results, match_iou):
+    """Berechnet Precision, Recall, F1, AP50 und AP50-95 pro Klasse"""
+    classes = set()
+    for detections, labels in results:
+        classes.update(int(d['class_id']) for d in detections)
+        classes.update(labels[:, 0].astype(int).tolist())
+
+    metrics = {}
+    for cls in sorted(classes):
+        num_gt = 0
+        scores = []
+        tp_per_iou = [[] for _ in MAP_IOU_THRESHOLDS]
+        tp_at_match = []
+        for detections, labels in results:
+            class_detections = [d for d in detections if d['class_id'] == cls]
+            gt_boxes = labels[labels[:, 0] == cls, 1:5]
+            num_gt += len(gt_boxes)
+            if not class_detections:
+                continue
+
+            boxes = np.array([[d['box']['x1'], d['box']['y1'], d['box']['x2'], d['box']['y2']]
+                              for d in class_detections], dtype=np.float64)
+            confs = np.array([d['conf'] for d in class_detections], dtype=np.float64)
+            scores.append(confs)
+            tp_at_match.append(match_detections(boxes, confs, gt_boxes, match_iou))
+            for i, iou in enumerate(MAP_IOU_THRESHOLDS):
+                tp_per_iou[i].append(match_detections(boxes, confs, gt_boxes, iou))
+
+        scores = np.concatenate(scores) if scores else np.zeros(0)
+        tp = np.concatenate(tp_at_match) if tp_at_match else np.zeros(0, dtype=bool)
+        num_tp = int(tp.sum())
+        num_fp = len(tp) - num_tp
+        precision = num_tp / len(tp) if len(tp) else 0.0
+        recall = num_tp / num_gt if num_gt else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0
+
+        aps = [average_precision(scores, np.concatenate(flags) if flags else np.zeros(0, dtype=bool), num_gt)
+               for flags in tp_per_iou]
+        metrics[cls] = {
+            'precision': precision, 'recall': recall, 'f1': f1,
+            'ap50': aps[0], 'ap50_95': float(np.mean(aps)),
+            'gt': num_gt, 'tp': num_tp, 'fp': num_fp
+        }
+    return metrics
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Auswertung der konfigurierten Pipeline gegen gelabelte Bilder")
+    parser.add_argument('--data', required=True, help="Split-Verzeichnis (images/ + labels/) oder Ordner mit Bild + .txt")
+    parser.add_argument('--model', help="Detection-Modell (Standard: aus config.json)")
+    parser.add_argument('--with-pose', action='store_true', help="Pose-Modell aus config.json mitlaufen lassen")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--cache-dir', default=os.path.join('.cache', 'predictions'))
+    parser.add_argument('--match-iou', type=float, default=0.5, help="IoU für die Zuordnung zu Ground Truth")
+    parser.add_argument('--output', help="Optionale CSV-Datei für die Kennzahlen")
+    args = parser.parse_args(argv)
+
+    config = ConfigManager().load_config()
+    class_config = config.get('class_config', {})
+    pose_config = config.get('pose_config', {})
+
+    model_path = args.model or config.get('detection_model_path', '')
+    if not model_path or not os.path.exists(model_path):
+        print(f"Detection-Modell nicht gefunden: {model_path}")
+        return 1
+
+    samples = find_dataset_images(args.data)
+    if not samples:
+        print(f"Keine Bilder in {args.data} gefunden")
+        return 1
+
+    pose_model = None
+    if args.with_pose and config.get('pose_model_path'):
+        if not os.path.exists(config['pose_model_path']):
+            print(f"Pose-Modell nicht gefunden: {config['pose_model_path']}")
+            return 1
+        pose_model = PerThreadModel(config['pose_model_path'])
+
+    cached_model = CachedDetectionModel(model_path, PredictionCache(args.cache_dir))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        results = list(executor.map(
+            lambda sample: evaluate_image(sample, cached_model, pose_model, class_config, pose_config),
+            samples
+        ))
+    results = [result for result in results if result is not None]
+    print(f"{len(results)} Bilder mit {args.workers} Workern in {time.perf_counter() - start:.2f} s verarbeitet")
+
+    metrics = compute_metrics(results, args.match_iou)
+
+    print(f"{'Klasse':<20}{'P':>8}{'R':>8}{'F1':>8}{'AP50':>8}{'AP50-95':>9}{'GT':>6}")
+    for cls, m in metrics.items():
+        name = class_config.get(str(cls), {}).get('name', f"class_{cls}")
+        print(f"{name:<20}{m['precision']:>8.3f}{m['recall']:>8.3f}{m['f1']:>8.3f}"
+              f"{m['ap50']:>8.3f}{m['ap50_95']:>9.3f}{m['gt']:>6}")
+    classes_with_gt = [m for m in metrics.values() if m['gt'] > 0]
+    if classes_with_gt:
+        print(f"mAP50: {np.mean([m['ap50'] for m in classes_with_gt]):.3f}  "
+              f"mAP50-95: {np.mean([m['ap50_95'] for m in classes_with_gt]):.3f}")
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, delimiter=';')
+            writer.writerow(['Klasse', 'Name', 'Precision', 'Recall', 'F1', 'AP50', 'AP50_95', 'GT', 'TP', 'FP'])
+            for cls, m in metrics.items():
+                name = class_config.get(str(cls), {}).get('name', f"class_{cls}")
+                writer.writerow([f"class_{cls}", name, m['precision'], m['recall'], m['f1'],
+                                 m['ap50'], m['ap50_95'], m['gt'], m['tp'], m['fp']])
+        print(f"Ergebnisse gespeichert: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""Simulierte Liftsteuerung als Gegenstelle für die Alarm-Ausgabe.
+
+Empfängt die Statusmeldungen des AlertPublisher per UDP, TCP (zeilenweise,
+optional mit "OK"-Bestätigung) und HTTP-Webhook und misst die Latenz vom
+Veröffentlichen bis zum Empfang. Mit --fail-rate werden Zustellungen
+absichtlich abgewiesen, um Wiederholungen zu prüfen; mit --test N schickt
+das Werkzeug selbst N Statuswechsel über alle Ausgaben (End-to-End-Test
+ohne laufende Anwendung).
+
+Beispiele:
+    python tools/lift_controller_sim.py
+    python tools/lift_controller_sim.py --ack --fail-rate 0.2
+    python tools/lift_controller_sim.py --test 200 --interval 0.01
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.alert_publisher import AlertPublisher, create_sink
+from core.metrics import MetricsRegistry
+
+TEST_STATUSES = ["Lift verlangsamt", "Lift gestoppt", "Lift wieder auf Normalgeschwindigkeit", "Lift Normalbetrieb"]
+
+class ControllerSimulator:
+    """Empfänger für UDP, TCP und HTTP - Latenzen landen als Histogramm receive_<transport> in einer Registry"""
+
+    def __init__(self, host, udp_port, tcp_port, http_port, ack=False, fail_rate=0.0, quiet=False):
+        self.host = host
+        self.ack = ack
+        self.fail_rate = fail_rate
+        self.quiet = quiet
+        self.metrics = MetricsRegistry(histogram_size=100000)
+        self.sequences = {}  # Transport -> empfangene Sequenznummern
+        self.lock = threading.Lock()
+        self.servers = []
+        self.threads = []
+
+        simulator = self
+
+        class UdpHandler(socketserver.BaseRequestHandler):
+            def handle(self):
+                simulator.receive('udp', self.request[0])
+
+        class TcpHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if simulator.should_fail():
+                        return  # Verbindung ohne Bestätigung schließen
+                    simulator.receive('tcp', line)
+                    if simulator.ack:
+                        self.wfile.write(b"OK\n")
+
+        class HttpHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if simulator.should_fail():
+                    self.send_error(503)
+                    return
+                simulator.receive('webhook', body)
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        if udp_port:
+            self.servers.append(socketserver.ThreadingUDPServer((host, udp_port), UdpHandler))
+        if tcp_port:
+            socketserver.ThreadingTCPServer.allow_reuse_address = True
+            self.servers.append(socketserver.ThreadingTCPServer((host, tcp_port), TcpHandler))
+        if http_port:
+            self.servers.append(ThreadingHTTPServer((host, http_port), HttpHandler))
+
+    def start(self):
+        for server in self.servers:
+            server.daemon_threads = True
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+    def should_fail(self):
+        return self.fail_rate > 0 and random.random() < self.fail_rate
+
+    def receive(self, transport, payload):
+        received_at = time.time()
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            print(f"[{transport}] Ungültige Meldung: {payload[:80]!r}")
+            return
+        latency = received_at - message.get('timestamp', received_at)
+        self.metrics.observe(f"receive_{transport}", latency)
+        with self.lock:
+            self.sequences.setdefault(transport, []).append(message.get('sequence'))
+            if not self.quiet:
+                print(f"[{transport:<7}] #{message.get('sequence')} {message.get('status')} ({latency * 1000:.1f} ms)")
+
+    def received_count(self, transport):
+        with self.lock:
+            return len(self.sequences.get(transport, []))
+
+    def print_summary(self):
+        """Latenz-Perzentile pro Transport sowie fehlende (zusammengefasste) und doppelte Meldungen"""
+        snapshot = self.metrics.snapshot()
+        print(f"\n{'Transport':<18}{'Anzahl':>8}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  ms")
+        for name, summary in sorted(snapshot['histograms'].items()):
+            if summary['count']:
+                print(f"{name:<18}{summary['count']:>8}{summary['p50'] * 1000:>9.2f}{summary['p90'] * 1000:>9.2f}"
+                      f"{summary['p99'] * 1000:>9.2f}{summary['max'] * 1000:>9.2f}")
+        with self.lock:
+            for transport, sequences in sorted(self.sequences.items()):
+                duplicates = len(sequences) - len(set(sequences))
+                out_of_order = sum(1 for a, b in zip(sequences, sequences[1:]) if b is not None and a is not None and b < a)
+                print(f"{transport}: {len(set(sequences))} verschiedene Meldungen, {duplicates} doppelt, "
+                      f"{out_of_order} in falscher Reihenfolge")
+
+def run_test(args, simulator):
+    """Schickt args.test Statuswechsel über UDP, TCP und Webhook an den Simulator"""
+    sinks = [{'type': 'udp', 'port': args.udp_port}, {'type': 'tcp', 'port': args.tcp_port, 'expect_ack': args.ack},
+             {'type': 'webhook', 'url': f"http://{args.host}:{args.http_port}/alert"}]
+    metrics = MetricsRegistry(histogram_size=100000)
+    publisher = AlertPublisher([create_sink(dict(sink, host=args.host)) for sink in sinks],
+                               metrics=metrics, max_retries=args.retries, retry_delay=args.retry_delay)
+
+    for i in range(args.test):
+        status = TEST_STATUSES[i % len(TEST_STATUSES)]
+        publisher.publish({'status': status, 'alert_active': 'gestoppt' in status or 'verlangsamt' in status,
+                           'alert_duration': 0.0, 'remaining_timeout': None, 'person_count': i % 3,
+                           'alert_object_present': False})
+        time.sleep(args.interval)
+
+    # Letzte Meldungen (inkl. Wiederholungen) abwarten
+    deadline = time.monotonic() + 5.0 + args.retries * args.retry_delay * 4
+    last = args.test
+    while time.monotonic() < deadline:
+        if all(simulator.received_count(t) and max(simulator.sequences[t]) == last for t in ('udp', 'tcp', 'webhook')):
+            break
+        time.sleep(0.05)
+    publisher.close()
+
+    simulator.print_summary()
+    counters = metrics.snapshot()['counters']
+    print(f"\nPublisher: {counters.get('alerts_published', 0)} veröffentlicht, "
+          f"{counters.get('alerts_delivered', 0)} zugestellt (alle Ausgaben), "
+          f"{counters.get('alerts_coalesced', 0)} zusammengefasst, {counters.get('alert_retries', 0)} Wiederholungen, "
+          f"{counters.get('alert_delivery_failures', 0)} fehlgeschlagen")
+    for name, summary in sorted(metrics.snapshot()['histograms'].items()):
+        print(f"{name}: p50 {summary['p50'] * 1000:.2f} ms, p99 {summary['p99'] * 1000:.2f} ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulierte Liftsteuerung für die Alarm-Ausgabe")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--udp-port', type=int, default=9500, help="0 = aus")
+    parser.add_argument('--tcp-port', type=int, default=9501, help="0 = aus")
+    parser.add_argument('--http-port', type=int, default=9502, help="0 = aus")
+    parser.add_argument('--ack', action='store_true', help="TCP-Meldungen mit 'OK' bestätigen")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="Anteil absichtlich abgewiesener TCP/HTTP-Meldungen")
+    parser.add_argument('--test', type=int, metavar='N', help="N Statuswechsel selbst senden und auswerten")
+    parser.add_argument('--interval', type=float, default=0.05, help="Abstand der Test-Meldungen in Sekunden")
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--retry-delay', type=float, default=0.05)
+    parser.add_argument('--quiet', action='store_true', help="Keine Ausgabe pro Meldung")
+    args = parser.parse_args(argv)
+
+    try:
+        simulator = ControllerSimulator(args.host, args.udp_port, args.tcp_port, args.http_port,
+                                        ack=args.ack, fail_rate=args.fail_rate, quiet=args.quiet or bool(args.test))
+    except OSError as e:
+        print(f"Simulator konnte nicht gestartet werden: {e}")
+        return 1
+    simulator.start()
+
+    if args.test:
+        run_test(args, simulator)
+        simulator.stop()
+        return 0
+
+    print(f"Liftsteuerung simuliert auf {args.host}: UDP {args.udp_port}, TCP {args.tcp_port}, "
+          f"HTTP {args.http_port} (Strg+C beendet)")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    simulator.stop()
+    simulator.print_summary()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
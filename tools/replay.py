@@ -0,0 +1,117 @@
+"""Wiedergabe aufgezeichneter Detections ohne Modell-Inferenz.
+
+Die Ergebnisse pro Frame (DetectionRecorder) werden mit der Uhr der
+Aufzeichnung durch FOIManager und optional FrameRenderer geschickt - so
+lässt sich die Alarm-Logik (z.B. mit geänderter FOI-Konfiguration) gegen
+eine Stunde Aufzeichnung in Sekunden prüfen.
+
+Beispiele:
+    python tools/replay.py recordings/20250609_101500
+    python tools/replay.py recordings/20250609_101500 --start 1749464100 --end 1749465000 --render replay.mp4
+"""
+import os
+import sys
+import argparse
+import time
+from datetime import datetime
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config_manager import ConfigManager
+from core.detection_recorder import DetectionRecording
+from core.foi_manager import FOIManager
+from core.frame_renderer import FrameRenderer
+
+class ReplayClock:
+    """Uhr, die auf dem Zeitstempel des gerade wiedergegebenen Frames steht"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def format_timestamp(timestamp):
+    """Zeitstempel (Sekunden) als lokale Uhrzeit mit Millisekunden"""
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wiedergabe aufgezeichneter Detections durch FOI-Logik und Renderer")
+    parser.add_argument('recording', help="Aufzeichnungsordner (mit index.jsonl)")
+    parser.add_argument('--start', type=float, help="Startzeit (Unix-Sekunden)")
+    parser.add_argument('--end', type=float, help="Endzeit (Unix-Sekunden)")
+    parser.add_argument('--render', metavar='VIDEO', help="Gerenderte Overlays (ohne Bild) als Video schreiben")
+    parser.add_argument('--render-width', type=int, default=960)
+    parser.add_argument('--fps', type=float, default=15.0, help="Bildrate des gerenderten Videos")
+    args = parser.parse_args(argv)
+
+    # Aktuelle Konfiguration - erlaubt das Prüfen geänderter FOI-Einstellungen gegen alte Aufnahmen
+    config = ConfigManager().load_config()
+    recording = DetectionRecording(args.recording, config.get('class_config', {}))
+    if not recording.chunks:
+        print(f"Keine Aufzeichnung in {args.recording} gefunden")
+        return 1
+    first, last = recording.time_range()
+    print(f"Aufzeichnung: {recording.frame_count()} Frames, {format_timestamp(first)} - {format_timestamp(last)}")
+
+    clock = ReplayClock()
+    foi_config = config.get('foi_config', {})
+    foi_manager = FOIManager(foi_config, clock=clock)
+    renderer = FrameRenderer(config.get('class_config', {}), config.get('pose_config', {}),
+                             config.get('display_config', {})) if args.render else None
+    writer = None
+
+    frames = 0
+    mismatches = 0
+    transitions = 0
+    first_timestamp = last_timestamp = None
+    previous_status = foi_manager.get_lift_status()
+    start = time.perf_counter()
+    for recorded in recording.frames(args.start, args.end):
+        clock.now = recorded.timestamp
+        if first_timestamp is None:
+            first_timestamp = recorded.timestamp
+        last_timestamp = recorded.timestamp
+        frames += 1
+
+        width, height = recorded.frame_size
+        foi_manager.set_frame_dimensions(width, height)
+        if foi_config.get('enabled', False):
+            foi_manager.count_objects_in_foi(recorded.detections)
+            foi_manager.check_alert_objects_in_foi(recorded.detections)
+
+        lift_status = foi_manager.get_lift_status()
+        if lift_status != previous_status:
+            transitions += 1
+            print(f"{format_timestamp(recorded.timestamp)}  {lift_status}")
+            previous_status = lift_status
+        if lift_status != recorded.lift_status:
+            mismatches += 1
+
+        if renderer is not None:
+            target_size = (args.render_width, max(1, int(height * args.render_width / width)))
+            if writer is None:
+                writer = cv2.VideoWriter(args.render, cv2.VideoWriter_fourcc(*'mp4v'), args.fps, target_size)
+            canvas = np.zeros((height, width, 3), dtype=np.uint8)
+            rendered = renderer.render_frame(canvas, recorded.detections, recorded.poses, target_size=target_size)
+            rendered = renderer.render_overlays(rendered, [foi_manager])
+            writer.write(rendered)
+
+    elapsed = time.perf_counter() - start
+    if writer is not None:
+        writer.release()
+        print(f"Video gespeichert: {args.render}")
+
+    if not frames:
+        print("Keine Frames im gewählten Zeitbereich")
+        return 1
+    covered = last_timestamp - first_timestamp
+    speedup = covered / elapsed if elapsed > 0 else float('inf')
+    print(f"{frames} Frames ({covered:.0f} s Aufnahme) in {elapsed:.2f} s wiedergegeben ({speedup:.0f}x Echtzeit)")
+    print(f"Statuswechsel: {transitions}, Abweichungen vom aufgezeichneten Status: {mismatches} Frames")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
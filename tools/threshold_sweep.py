@@ -0,0 +1,214 @@
+"""Konfidenz-Sweep pro Klasse über gecachte Roh-Vorhersagen.
+
+Der Detektor läuft einmal mit sehr niedriger Konfidenz und der NMS-IoU der
+Live-Inferenz (MODEL_NMS_IOU) über einen gelabelten Datensatz; die Roh-Boxen
+werden gecacht. Greedy-NMS ist für jede höhere Konfidenz-Schwelle ein Präfix,
+daher wird pro Klasse jede Konfidenz-Schwelle genau so ausgewertet, wie sie
+live wirkt - ohne erneute Inferenz.
+
+Beispiel:
+    python tools/threshold_sweep.py --model best.pt \\
+        --data 01_Data_Jon/Augmented/Images_split/Images/val --output sweep --apply
+"""
+import os
+import sys
+import csv
+import json
+import argparse
+import time
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config_manager import ConfigManager
+from config.config_writer import write_file_atomic
+from config.constants import MODEL_PREDICT_CONF, MODEL_NMS_IOU
+from core.evaluation import (
+    find_dataset_images, load_yolo_labels, match_detections_batched, cumulative_counts, f1_scores
+)
+from core.prediction_cache import PredictionCache, file_hash
+
+def collect_raw_predictions(model_path, samples, raw_conf, raw_iou, cache):
+    """Liefert die Roh-Vorhersagen aller Bilder - aus dem Cache oder durch einmalige Inferenz"""
+    image_paths = [image_path for image_path, _ in samples]
+    params = {'conf': raw_conf, 'iou': raw_iou}
+    key = cache.make_key(file_hash(model_path), image_paths, params)
+
+    cached = cache.load(key)
+    if cached is not None:
+        print(f"Roh-Vorhersagen aus Cache geladen ({key})")
+        return cached
+
+    from core.model_loader import load_yolo_model
+    model = load_yolo_model(model_path)
+
+    image_index, boxes, scores, classes, image_sizes = [], [], [], [], []
+    start = time.perf_counter()
+    for idx, image_path in enumerate(image_paths):
+        image = cv2.imread(image_path)
+        if image is None:
+            print(f"Bild konnte nicht gelesen werden: {image_path}")
+            image_sizes.append((0, 0))
+            continue
+        image_sizes.append((image.shape[1], image.shape[0]))
+
+        result = model.predict(image, conf=raw_conf, iou=raw_iou, verbose=False)[0]
+        result_boxes = result.boxes.cpu().numpy()
+        image_index.append(np.full(len(result_boxes), idx, dtype=np.int32))
+        boxes.append(result_boxes.xyxy.astype(np.float64))
+        scores.append(result_boxes.conf.astype(np.float64))
+        classes.append(result_boxes.cls.astype(np.int32))
+    print(f"Inferenz über {len(image_paths)} Bilder in {time.perf_counter() - start:.1f} s")
+
+    arrays = {
+        'image_index': np.concatenate(image_index) if image_index else np.zeros(0, dtype=np.int32),
+        'boxes': np.concatenate(boxes) if boxes else np.zeros((0, 4)),
+        'scores': np.concatenate(scores) if scores else np.zeros(0),
+        'classes': np.concatenate(classes) if classes else np.zeros(0, dtype=np.int32),
+        'image_sizes': np.array(image_sizes, dtype=np.int32).reshape(-1, 2)
+    }
+    cache.save(key, arrays)
+    return arrays
+
+def load_ground_truth(samples, image_sizes):
+    """Lädt alle Labels -> (Bild-Index, Boxen, Klassen) als Arrays"""
+    image_index, boxes, classes = [], [], []
+    for idx, (_, label_path) in enumerate(samples):
+        width, height = image_sizes[idx]
+        labels = load_yolo_labels(label_path, width, height)
+        image_index.append(np.full(len(labels), idx, dtype=np.int32))
+        classes.append(labels[:, 0].astype(np.int32))
+        boxes.append(labels[:, 1:5])
+    return np.concatenate(image_index), np.concatenate(boxes), np.concatenate(classes)
+
+def sweep_class(cls, predictions, ground_truth, conf_grid, match_iou):
+    """Berechnet TP/FP je Konfidenz-Schwelle und die Anzahl Ground-Truth-Boxen einer Klasse (alle Bilder auf einmal)"""
+    gt_image_index, gt_boxes, gt_classes = ground_truth
+    gt_mask = gt_classes == cls
+    num_gt = int(gt_mask.sum())
+
+    pred_mask = predictions['classes'] == cls
+    pred_scores = predictions['scores'][pred_mask]
+    true_positive = match_detections_batched(
+        predictions['image_index'][pred_mask], predictions['boxes'][pred_mask], pred_scores,
+        gt_image_index[gt_mask], gt_boxes[gt_mask], match_iou
+    )
+    tp, fp = cumulative_counts(pred_scores, true_positive, conf_grid)
+    return tp, fp, num_gt
+
+def write_f1_curve(f1, conf_grid, title, file_path, width=640, height=320):
+    """Speichert die F1-Kurve über der Konfidenz-Schwelle als PNG mit Markierung des Optimums"""
+    margin_top, margin_left, margin_bottom, margin_right = 40, 50, 40, 20
+    canvas = np.full((height, width, 3), 255, dtype=np.uint8)
+    plot_w = width - margin_left - margin_right
+    plot_h = height - margin_top - margin_bottom
+    bottom = margin_top + plot_h
+
+    xs = margin_left + np.linspace(0, plot_w, len(conf_grid))
+    ys = bottom - np.clip(f1, 0, 1) * plot_h
+    cv2.rectangle(canvas, (margin_left, margin_top), (margin_left + plot_w, bottom), (200, 200, 200), 1)
+    points = np.stack([xs, ys], axis=1).round().astype(np.int32)
+    cv2.polylines(canvas, [points.reshape(-1, 1, 2)], False, (140, 80, 0), 2)
+
+    best_idx = int(np.argmax(f1))
+    cv2.circle(canvas, tuple(int(v) for v in points[best_idx]), 6, (0, 0, 255), 2)
+
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    cv2.putText(canvas, f"{title}  F1={f1.max():.3f} @ conf={conf_grid[best_idx]:.2f} (NMS-IoU {MODEL_NMS_IOU:.2f})",
+                (10, 25), font, 0.5, (0, 0, 0), 1)
+    cv2.putText(canvas, f"conf {conf_grid[0]:.2f}", (margin_left, bottom + 20), font, 0.4, (0, 0, 0), 1)
+    cv2.putText(canvas, f"{conf_grid[-1]:.2f}", (margin_left + plot_w - 30, bottom + 20), font, 0.4, (0, 0, 0), 1)
+    cv2.putText(canvas, "F1 1", (5, margin_top + 5), font, 0.4, (0, 0, 0), 1)
+    cv2.putText(canvas, "0", (30, bottom), font, 0.4, (0, 0, 0), 1)
+
+    cv2.imwrite(file_path, canvas)
+
+def apply_to_class_config(best_thresholds):
+    """Schreibt die optimalen Konfidenz-Schwellen in class_config der config.json (übrige Einträge bleiben unverändert).
+
+    Klassen ohne Ground Truth oder mit F1 = 0 im ganzen Raster haben kein
+    aussagekräftiges Optimum (argmax läge auf conf_min) - ihre bisherige
+    Schwelle bleibt erhalten.
+    """
+    config_path = ConfigManager().get_config_path()
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    class_config = config.get('class_config', {})
+
+    for cls, (best_conf, best_f1) in best_thresholds.items():
+        cfg = class_config.get(str(cls))
+        if cfg is None:
+            print(f"Klasse {cls} nicht in class_config - übersprungen")
+            continue
+        if best_f1 <= 0:
+            print(f"Klasse {cls}: keine Ground Truth bzw. F1 = 0 - Schwelle unverändert (conf={cfg.get('conf')})")
+            continue
+        cfg['conf'] = round(float(best_conf), 3)
+
+    write_file_atomic(config_path, json.dumps(config, indent=2, ensure_ascii=False))
+    print(f"Schwellwerte in {config_path} übernommen")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Konfidenz-Sweep pro Klasse über gecachte Roh-Vorhersagen")
+    parser.add_argument('--model', required=True, help="YOLO-Detection-Modell (.pt)")
+    parser.add_argument('--data', required=True, help="Split-Verzeichnis (images/ + labels/) oder Ordner mit Bild + .txt")
+    parser.add_argument('--output', default='threshold_sweep', help="Ausgabeverzeichnis für CSV und F1-Kurven")
+    parser.add_argument('--cache-dir', default=os.path.join('.cache', 'predictions'))
+    parser.add_argument('--raw-conf', type=float, default=0.001, help="Konfidenz der einmaligen Roh-Inferenz")
+    parser.add_argument('--conf-min', type=float, default=MODEL_PREDICT_CONF,
+                        help="Kleinste Schwelle (darunter verwirft die Live-Inferenz bereits)")
+    parser.add_argument('--conf-max', type=float, default=0.95)
+    parser.add_argument('--conf-steps', type=int, default=71)
+    parser.add_argument('--match-iou', type=float, default=0.5, help="IoU für die Zuordnung zu Ground Truth")
+    parser.add_argument('--apply', action='store_true', help="Optimale Schwellwerte in class_config übernehmen")
+    args = parser.parse_args(argv)
+
+    samples = find_dataset_images(args.data)
+    if not samples:
+        print(f"Keine Bilder in {args.data} gefunden")
+        return 1
+
+    conf_grid = np.linspace(args.conf_min, args.conf_max, args.conf_steps)
+
+    cache = PredictionCache(args.cache_dir)
+    predictions = collect_raw_predictions(args.model, samples, args.raw_conf, MODEL_NMS_IOU, cache)
+    ground_truth = load_ground_truth(samples, predictions['image_sizes'])
+
+    start = time.perf_counter()
+    classes = sorted(set(np.unique(ground_truth[2]).tolist()) | set(np.unique(predictions['classes']).tolist()))
+    os.makedirs(args.output, exist_ok=True)
+
+    best_thresholds = {}
+    total_tp = total_fp = total_fn = 0
+    for cls in classes:
+        tp, fp, num_gt = sweep_class(cls, predictions, ground_truth, conf_grid, args.match_iou)
+        f1 = f1_scores(tp, fp, num_gt - tp)
+        total_tp, total_fp, total_fn = total_tp + tp, total_fp + fp, total_fn + (num_gt - tp)
+
+        best_conf_idx = int(np.argmax(f1))
+        best_thresholds[cls] = (conf_grid[best_conf_idx], f1[best_conf_idx])
+        write_f1_curve(f1, conf_grid, f"class_{cls}", os.path.join(args.output, f"f1_curve_class_{cls}.png"))
+
+    if classes:
+        global_f1 = f1_scores(total_tp, total_fp, total_fn)
+        write_f1_curve(global_f1, conf_grid, "GLOBAL", os.path.join(args.output, "f1_curve_GLOBAL.png"))
+    print(f"Sweep über {len(classes)} Klassen x {len(conf_grid)} Konfidenz-Schwellen "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    csv_path = os.path.join(args.output, "conf_tuning_per_class.csv")
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(['Klasse', 'Best_Conf', 'Best_F1'])
+        for cls, (best_conf, best_f1) in best_thresholds.items():
+            writer.writerow([f"class_{cls}", best_conf, best_f1])
+            note = " (ohne Optimum - wird nicht übernommen)" if best_f1 <= 0 else ""
+            print(f"class_{cls}: conf={best_conf:.3f}, F1={best_f1:.3f}{note}")
+    print(f"Ergebnisse gespeichert: {csv_path}")
+
+    if args.apply:
+        apply_to_class_config(best_thresholds)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,15 +7,16 @@ from PyQt6.QtWidgets import (
     QMessageBox, QWidget, QScrollArea, QApplication
 )
 from PyQt6.QtCore import Qt
-from ultralytics import YOLO
 from config.constants import COLORS
 from config.config_manager import ConfigManager
+from core.model_loader import load_yolo_model
 
 class SettingsDialog(QDialog):
     """Großer übersichtlicher Dialog für alle Einstellungen - responsive für verschiedene Bildschirmgrößen."""
     
     def __init__(self, detection_model_path, pose_model_path, class_config, 
-                 pose_config, display_config, foi_config, video_files, parent=None):
+                 pose_config, display_config, foi_config, video_files, parent=None,
+                 config_manager=None):
         super().__init__(parent)
         self.setWindowTitle("Einstellungen")
         
@@ -30,7 +31,8 @@ class SettingsDialog(QDialog):
         self.foi_config = foi_config.copy()
         self.video_files = video_files.copy()
         
-        self.config_manager = ConfigManager()
+        # Gemeinsamer ConfigManager des Hauptfensters (ein Writer, bekannte eigene Schreibvorgänge)
+        self.config_manager = config_manager or ConfigManager()
         
         self.setup_ui()
         self.load_settings()
@@ -232,6 +234,14 @@ class SettingsDialog(QDialog):
         self.alarm_class_dropdown.setMaximumHeight(22)
         display_form.addRow("Alarmklasse:", self.alarm_class_dropdown)
         
+        self.max_result_age = QDoubleSpinBox()
+        self.max_result_age.setRange(0.1, 10.0)
+        self.max_result_age.setSingleStep(0.1)
+        self.max_result_age.setSuffix(" s")
+        self.max_result_age.setValue(self.display_config.get('max_result_age', 1.0))
+        self.max_result_age.setMaximumHeight(22)
+        display_form.addRow("Max. Ergebnisalter:", self.max_result_age)
+        
         return display_group
     
     def _create_pose_settings_group(self):
@@ -268,6 +278,17 @@ class SettingsDialog(QDialog):
         self.pose_show_skeleton.setChecked(self.pose_config.get('show_skeleton', True))
         pose_form.addRow("Skelett anzeigen:", self.pose_show_skeleton)
         
+        # Nur-Pose-Modus: ein Forward-Pass des Pose-Modells statt Detection + Pose pro Box
+        self.pose_only = QCheckBox()
+        self.pose_only.setChecked(self.pose_config.get('pose_only', False))
+        self.pose_only.setToolTip("Nur das Pose-Modell auf dem Vollbild ausführen - das Detection-Modell wird nicht genutzt")
+        pose_form.addRow("Nur Pose-Modell:", self.pose_only)
+        
+        self.pose_only_class_dropdown = QComboBox()
+        self.pose_only_class_dropdown.setMaximumHeight(22)
+        self.pose_only_class_dropdown.setToolTip("Klasse, der die Personen-Boxen des Pose-Modells zugeordnet werden")
+        pose_form.addRow("Klasse der Personen:", self.pose_only_class_dropdown)
+        
         return pose_settings_group
     
     def _create_foi_settings_group(self):
@@ -392,7 +413,7 @@ class SettingsDialog(QDialog):
         )
         if file_path:
             try:
-                model = YOLO(file_path)
+                model = load_yolo_model(file_path)
                 self.detection_model_path = file_path
                 self.txt_detection_model_path.setText(file_path)
                 
@@ -412,7 +433,7 @@ class SettingsDialog(QDialog):
         )
         if file_path:
             try:
-                model = YOLO(file_path)
+                model = load_yolo_model(file_path)
                 self.pose_model_path = file_path
                 self.txt_pose_model_path.setText(file_path)
                 
@@ -449,6 +470,7 @@ class SettingsDialog(QDialog):
         self.load_class_table()
         self.update_alarm_classes()
         self.update_foi_classes()
+        self.update_pose_only_classes()
     
     def load_class_table(self):
         """Lädt die Klassentabelle mit den aktuellen Einstellungen"""
@@ -558,6 +580,20 @@ class SettingsDialog(QDialog):
             if index >= 0:
                 self.alarm_class_dropdown.setCurrentIndex(index)
     
+    def update_pose_only_classes(self):
+        """Aktualisiert das Klassen-Dropdown des Nur-Pose-Modus"""
+        current_data = self.pose_only_class_dropdown.currentData()
+        self.pose_only_class_dropdown.clear()
+        
+        for cls_id, cfg in self.class_config.items():
+            self.pose_only_class_dropdown.addItem(f"{cls_id}: {cfg['name']}", userData=cls_id)
+        
+        # Gespeicherte Auswahl wiederherstellen
+        selected = current_data if current_data is not None else self.pose_config.get('pose_only_class', '0')
+        index = self.pose_only_class_dropdown.findData(selected)
+        if index >= 0:
+            self.pose_only_class_dropdown.setCurrentIndex(index)
+    
     def update_foi_classes(self):
         """Aktualisiert die FOI-Klassen-Dropdowns"""
         # Count Class Dropdown
@@ -606,6 +642,7 @@ class SettingsDialog(QDialog):
         self.load_class_table()
         self.update_alarm_classes()
         self.update_foi_classes()
+        self.update_pose_only_classes()
         
         # Modell-Info aktualisieren
         if self.detection_model_path:
@@ -650,7 +687,8 @@ class SettingsDialog(QDialog):
             'box_thickness': self.box_thickness.value(),
             'font_scale': self.font_scale.value(),
             'text_thickness': self.text_thickness.value(),
-            'alarm_class': self.alarm_class_dropdown.currentData()
+            'alarm_class': self.alarm_class_dropdown.currentData(),
+            'max_result_age': self.max_result_age.value()
         }
         
         # Pose-Einstellungen sammeln
@@ -660,7 +698,9 @@ class SettingsDialog(QDialog):
             'line_thickness': self.pose_line_thickness.value(),
             'keypoint_radius': self.pose_keypoint_radius.value(),
             'show_keypoints': self.pose_show_keypoints.isChecked(),
-            'show_skeleton': self.pose_show_skeleton.isChecked()
+            'show_skeleton': self.pose_show_skeleton.isChecked(),
+            'pose_only': self.pose_only.isChecked(),
+            'pose_only_class': self.pose_only_class_dropdown.currentData() or self.pose_config.get('pose_only_class', '0')
         }
         
         # FOI-Einstellungen sammeln
@@ -714,8 +754,7 @@ class SettingsDialog(QDialog):
                 config = json.load(f)
             
             # Verwende ConfigManager für Migration
-            temp_manager = ConfigManager()
-            migrated_config = temp_manager._migrate_config(config)
+            migrated_config = self.config_manager._migrate_config(config)
             
             # Konfiguration übernehmen
             self.detection_model_path = migrated_config['detection_model_path']
@@ -756,6 +795,7 @@ class SettingsDialog(QDialog):
         self.box_thickness.setValue(self.display_config.get('box_thickness', 2))
         self.font_scale.setValue(self.display_config.get('font_scale', 5))
         self.text_thickness.setValue(self.display_config.get('text_thickness', 1))
+        self.max_result_age.setValue(self.display_config.get('max_result_age', 1.0))
         
         # Pose-Einstellungen
         self.pose_min_confidence.setValue(self.pose_config.get('min_confidence', 0.3))
@@ -763,6 +803,7 @@ class SettingsDialog(QDialog):
         self.pose_keypoint_radius.setValue(self.pose_config.get('keypoint_radius', 3))
         self.pose_show_keypoints.setChecked(self.pose_config.get('show_keypoints', True))
         self.pose_show_skeleton.setChecked(self.pose_config.get('show_skeleton', True))
+        self.pose_only.setChecked(self.pose_config.get('pose_only', False))
         
         # FOI-Einstellungen
         self.foi_enabled.setChecked(self.foi_config.get('enabled', True))
@@ -782,4 +823,5 @@ class SettingsDialog(QDialog):
         
         self.load_class_table()
         self.update_alarm_classes()
-        self.update_foi_classes()
\ No newline at end of file
+        self.update_foi_classes()
+        self.update_pose_only_classes()
\ No newline at end of file
@@ -1,19 +1,77 @@
 import os
+import copy
+import json
+import time
 import cv2
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
     QFrame, QProgressBar, QMessageBox, QStatusBar
 )
-from PyQt6.QtGui import QPixmap, QImage, QFont
+from PyQt6.QtGui import QFont, QColor, QPalette
 from PyQt6.QtCore import QTimer, Qt, QThreadPool
-from ultralytics import YOLO
 
 from config.config_manager import ConfigManager
-from config.constants import DEFAULT_CONFIG
-from core.detection_worker import DualDetectionWorker
+from config.config_watcher import ConfigWatcher
+from config.constants import DEFAULT_CONFIG, FOI_CORNER_SIZE
+from core.detection_worker import DualDetectionWorker, ModelLoadWorker
 from core.frame_renderer import FrameRenderer
 from core.foi_manager import FOIManager
+from core.heatmap_accumulator import HeatmapAccumulator
+from core.model_loader import load_yolo_model
+from core.line_counter import LineCrossingCounter
+from core.metrics import MetricsRegistry, MetricsServer
+from core.inference_cache import InferenceCache
+from core.video_exporter import VideoExporter
+from core.pipeline_common import (
+    resolve_path, create_frame_cache, create_recorder, create_incident_recorder, create_alert_publisher,
+    get_status_style_key, evaluate_foi, observe_alert_latency, trigger_incident, publish_lift_status,
+    record_result, export_final_results
+)
 from ui.settings_dialog import SettingsDialog
+from ui.video_widget import VideoWidget
+
+def _status_bar_style(background, border, color):
+    """Erzeugt das Stylesheet der Status-Bar für eine Farbkombination"""
+    return f"""
+        QStatusBar {{
+            background-color: {background};
+            border-top: 2px solid {border};
+            color: {color};
+            font-size: 18px;
+            font-weight: bold;
+            text-align: center;
+            padding: 0px;
+        }}
+        QStatusBar::item {{ border: none; }}
+    """
+
+# Vorberechnete Stylesheets je Lift-Zustand - werden nur bei Zustandswechsel gesetzt
+STATUS_STYLES = {
+    'default': _status_bar_style('#f8f9fa', '#dee2e6', '#212529'),
+    'slowed': _status_bar_style('#fff3cd', '#ffeaa7', '#856404'),
+    'stopped': _status_bar_style('#f8d7da', '#f5c6cb', '#721c24'),
+    'normal_speed': _status_bar_style('#d1edff', '#bee5eb', '#004085'),
+    'normal': _status_bar_style('#d4edda', '#c3e6cb', '#155724'),
+}
+
+RESET_BUTTON_STYLE = """
+    padding: 8px; 
+    font-size: 14px; 
+    background-color: #dc3545; 
+    color: white; 
+    border: none; 
+    border-radius: 4px;
+    font-weight: bold;
+"""
+
+RESET_BUTTON_DONE_STYLE = RESET_BUTTON_STYLE.replace('#dc3545', '#28a745')
+
+# Ergebnisalter in der Toolbar - rot, solange die Alarm-Latenz über dem Budget liegt
+RESULT_AGE_STYLE = "color: #666; font-size: 12px;"
+RESULT_AGE_WARNING_STYLE = "color: #dc3545; font-size: 12px; font-weight: bold;"
+
+# Hintergrund des Video-Containers ohne Alarm
+VIDEO_BACKGROUND_COLOR = QColor(34, 34, 34)
 
 class VideoPlayer(QWidget):
     """Hauptklasse für den Video Player mit YOLO Dual Model Annotation"""
@@ -54,6 +112,33 @@ class VideoPlayer(QWidget):
             self.class_config, self.pose_config, self.display_config
         )
         self.foi_manager = FOIManager(self.foi_config)
+        self.heatmap_accumulator = HeatmapAccumulator(self.heatmap_config)
+        self.line_counter = LineCrossingCounter(self.line_config)
+        
+        # Laufzeit-Metriken des Hot-Paths (Overlay und optionaler HTTP-Endpunkt)
+        self.metrics = MetricsRegistry(self.metrics_config['histogram_size'], self.metrics_config['enabled'])
+        self.metrics_server = None
+        
+        # Aufzeichnung der Ergebnisse pro Frame (für die Wiedergabe ohne Inferenz)
+        self.recorder = None
+        
+        # Festplatten-Cache der Ergebnisse pro Video-Frame (Segment = aktuelles Video + Modelle + Schwellwerte)
+        self.inference_cache = None
+        self.cache_segment = None
+        
+        # Dekodierte Frames kurzer Clips als gemappte Rohdatei (None = immer cv2.VideoCapture)
+        self.frame_cache = None
+        
+        # Vorfall-Clips bei Alarmen (Ringpuffer der angezeigten Frames)
+        self.incident_recorder = None
+        
+        # Export der gerenderten Ausgabe (eigener Encoder-Thread)
+        self.video_exporter = None
+        self.source_fps = 30.0  # Bildrate des aktuellen Videos (für den Export)
+        
+        # Statuswechsel an Liftsteuerung/Pager (asynchron)
+        self.alert_publisher = None
+        self.published_status = None
         
         # Mouse interaction state
         self.mouse_pressed = False
@@ -67,6 +152,10 @@ class VideoPlayer(QWidget):
         
         # Load default config
         self.load_default_config()
+        
+        # Externe Änderungen an der config.json im laufenden Betrieb übernehmen
+        self.config_watcher = ConfigWatcher(self.config_manager, parent=self)
+        self.config_watcher.config_changed.connect(self.apply_external_config)
     
     def _init_default_values(self):
         """Initialisiert die Standard-Konfigurationswerte"""
@@ -78,7 +167,19 @@ class VideoPlayer(QWidget):
         self.pose_config = DEFAULT_CONFIG['pose_config'].copy()
         self.display_config = DEFAULT_CONFIG['display_config'].copy()
         self.foi_config = DEFAULT_CONFIG['foi_config'].copy()
+        self.heatmap_config = DEFAULT_CONFIG['heatmap_config'].copy()
+        self.line_config = DEFAULT_CONFIG['line_config'].copy()
+        self.metrics_config = DEFAULT_CONFIG['metrics_config'].copy()
+        self.recording_config = DEFAULT_CONFIG['recording_config'].copy()
+        self.inference_cache_config = DEFAULT_CONFIG['inference_cache_config'].copy()
+        self.frame_cache_config = DEFAULT_CONFIG['frame_cache_config'].copy()
+        self.incident_config = DEFAULT_CONFIG['incident_config'].copy()
+        self.export_config = DEFAULT_CONFIG['export_config'].copy()
+        self.alert_output_config = copy.deepcopy(DEFAULT_CONFIG['alert_output_config'])
+        self.headless_config = DEFAULT_CONFIG['headless_config'].copy()  # Nur für main.py --headless, wird mitgespeichert
         self.video_files = []
+        self.pending_model_loads = set()  # Modellarten, die gerade im Hintergrund geladen werden
+        self.model_load_errors = {}  # Modellart -> Fehlermeldung des letzten fehlgeschlagenen Ladens
     
     def _init_video_state(self):
         """Initialisiert den Video-Wiedergabe-Status"""
@@ -88,23 +189,48 @@ class VideoPlayer(QWidget):
         self.processing_frame = False
         self.last_detections = []
         self.last_poses = []
+        self.last_result_capture_time = None  # Erfassungszeitpunkt des Frames der letzten Detections
+        self.last_result_age_update = 0.0
+        self.base_display_frame = None  # Frame in Anzeigegröße mit Detections, ohne FOI/Zähllinie
+        self.base_display_composited = False  # True, wenn FOI/Zähllinie direkt ins Basisbild gezeichnet wurden
+        self.last_tick_time = None  # Für die Erkennung verspäteter Frame-Ticks
+        self.frame_index = 0  # Index des nächsten Frames im aktuellen Video
+        self.inflight_frame_index = None  # Frame-Index des laufenden Workers (für den Inferenz-Cache)
+        self.last_latency_check = 0.0
+        self.alert_latency_p99 = None  # Gesetzt, solange das p99 Erfassung -> Alarm über dem Budget liegt
     
     def _init_alarm_system(self):
         """Initialisiert das Alarmsystem"""
         self.alarm_active = False
         self.pulse_value = 0
         self.pulse_direction = 1
+        
+        # Zuletzt angezeigter Zustand - Widgets werden nur bei Änderungen angefasst
+        self.status_text = None
+        self.status_style_key = 'default'
     
     def _init_timers(self):
         """Initialisiert die Timer"""
-        # Frame timer - läuft mit fester 30 FPS
+        # Frame timer - läuft mit der Bildrate des Quellvideos (Standard ~30 FPS)
         self.timer = QTimer()
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
         self.timer.timeout.connect(self.next_frame)
-        self.timer.setInterval(33)  # ~30 FPS fest eingestellt
+        self.timer.setInterval(33)
         
         # Alarm animation timer
         self.alarm_timer = QTimer()
         self.alarm_timer.timeout.connect(self.pulse_alarm)
+        
+        # Fasst Neuzeichnungen durch Maus-Interaktion zusammen (max. eine pro Bildschirm-Refresh)
+        self.overlay_redraw_timer = QTimer()
+        self.overlay_redraw_timer.setSingleShot(True)
+        self.overlay_redraw_timer.setInterval(16)
+        self.overlay_redraw_timer.timeout.connect(self.render_overlays_only)
+        
+        # Aktualisiert das Metrik-Overlay (nur solange es sichtbar ist)
+        self.metrics_overlay_timer = QTimer()
+        self.metrics_overlay_timer.setInterval(500)
+        self.metrics_overlay_timer.timeout.connect(self._update_metrics_overlay)
     
     def setup_ui(self):
         """Erstellt die Benutzeroberfläche"""
@@ -142,20 +268,7 @@ class VideoPlayer(QWidget):
         status_bar.showMessage("Lift Normalbetrieb")
         
         # Styling für größere, zentrierte, dunkle Schrift auf hellem Hintergrund
-        status_bar.setStyleSheet("""
-            QStatusBar {
-                background-color: #f8f9fa;
-                border-top: 2px solid #dee2e6;
-                color: #212529;
-                font-size: 18px;
-                font-weight: bold;
-                text-align: center;
-                padding: 0px;
-            }
-            QStatusBar::item {
-                border: none;
-            }
-        """)
+        status_bar.setStyleSheet(STATUS_STYLES['default'])
         
         # Font explizit setzen für bessere Kontrolle
         font = QFont()
@@ -178,45 +291,64 @@ class VideoPlayer(QWidget):
         
         # NEU: Reset-Button für Lift-Status
         self.btn_reset_lift = QPushButton("🔄 Lift Reset")
-        self.btn_reset_lift.setStyleSheet("""
-            padding: 8px; 
-            font-size: 14px; 
-            background-color: #dc3545; 
-            color: white; 
-            border: none; 
-            border-radius: 4px;
-            font-weight: bold;
-        """)
+        self.btn_reset_lift.setStyleSheet(RESET_BUTTON_STYLE)
         self.btn_reset_lift.setToolTip("Setzt den Lift-Status zurück auf Normalbetrieb und stoppt alle Timer")
         
+        self.btn_metrics = QPushButton("📊 Metriken")
+        self.btn_metrics.setStyleSheet("padding: 8px; font-size: 14px;")
+        self.btn_metrics.setCheckable(True)
+        self.btn_metrics.setToolTip("Blendet die Laufzeit pro Stufe und die Frame-Zähler im Video ein")
+        
         self.lbl_status = QLabel("Bereit - Konfiguration für Sturzerkennung an Skiliften")
         self.lbl_status.setStyleSheet("color: #666; font-size: 12px;")
         
+        # Alter der angezeigten Detections relativ zum angezeigten Frame
+        self.lbl_result_age = QLabel("")
+        self.lbl_result_age.setStyleSheet(RESULT_AGE_STYLE)
+        self.lbl_result_age.setMinimumWidth(150)
+        self.lbl_result_age.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        
         toolbar_layout.addWidget(self.btn_settings)
         toolbar_layout.addWidget(self.btn_play_pause)
         toolbar_layout.addWidget(self.btn_reset_lift)  # NEU
+        toolbar_layout.addWidget(self.btn_metrics)
         toolbar_layout.addStretch()
         toolbar_layout.addWidget(self.lbl_status)
+        toolbar_layout.addWidget(self.lbl_result_age)
         
         return toolbar_layout
     
     def _create_video_container(self):
         """Erstellt den Video-Container"""
         video_container = QFrame()
-        video_container.setStyleSheet("background-color: #222; border-radius: 5px;")
+        
+        # Hintergrund über die Palette - der Alarm-Puls ändert nur die Farbe, ohne Stylesheet-Repolish
+        video_container.setAutoFillBackground(True)
+        palette = video_container.palette()
+        palette.setColor(QPalette.ColorRole.Window, VIDEO_BACKGROUND_COLOR)
+        video_container.setPalette(palette)
         video_layout = QVBoxLayout(video_container)
         
-        self.label = QLabel("Bitte wählen Sie Videos und YOLO-Modelle in den Einstellungen aus")
-        self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.label.setStyleSheet("color: #aaa; font-size: 16px;")
+        # Zeigt BGR-Frames direkt an (ohne RGB-Konvertierung und QPixmap)
+        self.video_widget = VideoWidget("Bitte wählen Sie Videos und YOLO-Modelle in den Einstellungen aus")
         
         # Mouse-Events für FOI-Interaktion aktivieren
-        self.label.setMouseTracking(True)
-        self.label.mousePressEvent = self.mouse_press_event
-        self.label.mouseMoveEvent = self.mouse_move_event
-        self.label.mouseReleaseEvent = self.mouse_release_event
+        self.video_widget.setMouseTracking(True)
+        self.video_widget.mousePressEvent = self.mouse_press_event
+        self.video_widget.mouseMoveEvent = self.mouse_move_event
+        self.video_widget.mouseReleaseEvent = self.mouse_release_event
+        
+        video_layout.addWidget(self.video_widget)
         
-        video_layout.addWidget(self.label)
+        # Metrik-Overlay oben links über dem Video - lässt Maus-Events für die FOI durch
+        self.metrics_overlay = QLabel(self.video_widget)
+        self.metrics_overlay.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 170); color: #7CFC00; padding: 6px; "
+            "font-family: monospace; font-size: 12px;"
+        )
+        self.metrics_overlay.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.metrics_overlay.move(8, 8)
+        self.metrics_overlay.hide()
         
         return video_container
     
@@ -225,6 +357,7 @@ class VideoPlayer(QWidget):
         self.btn_settings.clicked.connect(self.open_settings)
         self.btn_play_pause.clicked.connect(self.toggle_playback)
         self.btn_reset_lift.clicked.connect(self.reset_lift_status)  # NEU
+        self.btn_metrics.toggled.connect(self.toggle_metrics_overlay)
     
     def reset_lift_status(self):
         """NEU: Setzt den Lift-Status manuell zurück"""
@@ -232,31 +365,12 @@ class VideoPlayer(QWidget):
             self.foi_manager.manual_reset()
             
             # Sofortiges Update der Status Bar
-            self.status_bar.showMessage("Lift Normalbetrieb")
-            self.status_bar.setStyleSheet("""
-                QStatusBar {
-                    background-color: #d4edda;
-                    border-top: 2px solid #c3e6cb;
-                    color: #155724;
-                    font-size: 18px;
-                    font-weight: bold;
-                    text-align: center;
-                    padding: 0px;
-                }
-                QStatusBar::item { border: none; }
-            """)
+            self._update_status_bar("Lift Normalbetrieb", 'normal')
+            self._publish_lift_status()
             
             # Visuelles Feedback
             self.btn_reset_lift.setText("✅ Reset")
-            self.btn_reset_lift.setStyleSheet("""
-                padding: 8px; 
-                font-size: 14px; 
-                background-color: #28a745; 
-                color: white; 
-                border: none; 
-                border-radius: 4px;
-                font-weight: bold;
-            """)
+            self.btn_reset_lift.setStyleSheet(RESET_BUTTON_DONE_STYLE)
             
             # Nach 2 Sekunden Button-Text zurücksetzen
             QTimer.singleShot(2000, self._reset_button_style)
@@ -264,15 +378,176 @@ class VideoPlayer(QWidget):
     def _reset_button_style(self):
         """Setzt den Reset-Button-Style zurück"""
         self.btn_reset_lift.setText("🔄 Lift Reset")
-        self.btn_reset_lift.setStyleSheet("""
-            padding: 8px; 
-            font-size: 14px; 
-            background-color: #dc3545; 
-            color: white; 
-            border: none; 
-            border-radius: 4px;
-            font-weight: bold;
-        """)
+        self.btn_reset_lift.setStyleSheet(RESET_BUTTON_STYLE)
+    
+    def toggle_metrics_overlay(self, checked):
+        """Blendet das Metrik-Overlay ein/aus (schaltet die Erfassung bei Bedarf mit ein)"""
+        self.metrics_config = dict(self.metrics_config, show_overlay=checked)
+        if checked and not self.metrics_config.get('enabled', True):
+            self.metrics_config['enabled'] = True
+            self.metrics.enabled = True
+        self._set_metrics_overlay_visible(checked)
+        self.save_config()
+    
+    def _set_metrics_overlay_visible(self, visible):
+        """Zeigt bzw. versteckt das Overlay und startet/stoppt dessen Aktualisierung"""
+        if visible:
+            self._update_metrics_overlay()
+            self.metrics_overlay.show()
+            self.metrics_overlay.raise_()
+            self.metrics_overlay_timer.start()
+        else:
+            self.metrics_overlay_timer.stop()
+            self.metrics_overlay.hide()
+    
+    def _update_metrics_overlay(self):
+        """Schreibt die aktuellen Metriken in das Overlay"""
+        self.metrics_overlay.setText(self.metrics.format_overlay())
+        self.metrics_overlay.adjustSize()
+    
+    def _apply_metrics_config(self):
+        """Übernimmt metrics_config: Erfassung, Histogrammgröße, HTTP-Endpunkt und Overlay"""
+        self.metrics.enabled = self.metrics_config.get('enabled', True)
+        histogram_size = int(self.metrics_config.get('histogram_size', 1024))
+        if histogram_size != self.metrics.histogram_size:
+            self.metrics.histogram_size = histogram_size
+            self.metrics.reset()
+        
+        # Endpunkt nur bei geändertem Port neu starten
+        port = int(self.metrics_config.get('http_port', 0) or 0)
+        if self.metrics_server and self.metrics_server.port != port:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        if port and self.metrics_server is None:
+            server = MetricsServer(self.metrics, port)
+            if server.start():
+                self.metrics_server = server
+        
+        show_overlay = self.metrics_config.get('show_overlay', False)
+        self.btn_metrics.blockSignals(True)
+        self.btn_metrics.setChecked(show_overlay)
+        self.btn_metrics.blockSignals(False)
+        self._set_metrics_overlay_visible(show_overlay)
+    
+    def _config_dir(self):
+        """Verzeichnis der config.json - Bezug für relative Ausgabepfade"""
+        return os.path.dirname(self.config_manager.get_config_path())
+    
+    def _apply_recording_config(self):
+        """Startet bzw. beendet die Aufzeichnung gemäß recording_config (neue Sitzung bei Änderungen)"""
+        if self.recorder is not None:
+            self.recorder.close()
+        self.recorder = create_recorder(self.recording_config, self._config_dir())
+    
+    def _apply_incident_config(self):
+        """Startet bzw. beendet den Vorfall-Rekorder gemäß incident_config"""
+        if self.incident_recorder is not None:
+            self.incident_recorder.close()
+        self.incident_recorder = create_incident_recorder(self.incident_config, self._config_dir())
+    
+    def _apply_export_config(self):
+        """Startet bzw. beendet den Video-Export gemäß export_config (neue Datei bei Änderungen)"""
+        if self.video_exporter is not None:
+            self.video_exporter.close()
+            self.video_exporter = None
+        if not self.export_config.get('enabled', False):
+            return
+        
+        output_dir = resolve_path(self.export_config.get('output_dir', 'exports'), self._config_dir())
+        # Ohne feste Bildrate übernimmt der Exporter die Bildrate des Videos beim ersten Frame
+        fps = self.export_config.get('fps', 0)
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            output_path = os.path.join(output_dir, f"export_{time.strftime('%Y%m%d_%H%M%S')}.mp4")
+            self.video_exporter = VideoExporter(
+                output_path, fps,
+                width=self.export_config.get('width', 0),
+                queue_size=self.export_config.get('queue_size', 32),
+                show_status=self.export_config.get('show_status', True)
+            )
+            print(f"Video-Export: {output_path}")
+        except OSError as e:
+            print(f"Video-Export konnte nicht gestartet werden: {e}")
+    
+    def _apply_alert_output_config(self):
+        """Baut die Alarm-Ausgaben gemäß alert_output_config neu auf"""
+        if self.alert_publisher is not None:
+            self.alert_publisher.close()
+        self.alert_publisher = create_alert_publisher(self.alert_output_config, self.metrics)
+        if self.alert_publisher is None:
+            return
+        
+        # Aktuellen Status sofort senden - die Steuerung kennt den Stand vor dem (Neu-)Start nicht
+        self.published_status = None
+        if self.foi_config.get('enabled', False):
+            self._publish_lift_status()
+    
+    def _publish_lift_status(self):
+        """Veröffentlicht den Lift-Status, wenn er sich seit der letzten Meldung geändert hat"""
+        self.published_status = publish_lift_status(self.alert_publisher, self.foi_manager, self.published_status)
+    
+    def _apply_inference_cache_config(self):
+        """Aktiviert bzw. deaktiviert den Inferenz-Cache gemäß inference_cache_config"""
+        self._close_cache_segment()
+        if self.inference_cache is not None:
+            self.inference_cache.close()
+            self.inference_cache = None
+        if not self.inference_cache_config.get('enabled', False):
+            return
+        
+        cache_dir = resolve_path(self.inference_cache_config.get('cache_dir', '.cache/inference'), self._config_dir())
+        max_bytes = int(self.inference_cache_config.get('max_size_mb', 512) * 1024 * 1024)
+        self.inference_cache = InferenceCache(cache_dir, max_bytes)
+    
+    def _apply_frame_cache_config(self):
+        """Aktiviert bzw. deaktiviert den Frame-Cache gemäß frame_cache_config (gilt ab dem nächsten Video)"""
+        self.frame_cache = create_frame_cache(self.frame_cache_config, self._config_dir())
+    
+    def _open_capture(self, video_path):
+        """Öffnet ein Video - bei aktivem Frame-Cache aus der gemappten Rohdatei bzw. mit Aufbau des Cache"""
+        if self.frame_cache is not None:
+            return self.frame_cache.open(video_path)
+        return cv2.VideoCapture(video_path)
+    
+    def _close_cache_segment(self):
+        """Übergibt die neuen Frames des Segments zum Schreiben und schließt es (neues Video, Modell oder neue Schwellwerte)"""
+        if self.cache_segment is not None:
+            self.cache_segment.close()
+            self.cache_segment = None
+        self.inflight_frame_index = None
+    
+    def _reset_frame_index(self):
+        """Beginnt die Frame-Zählung für ein neu geöffnetes Video"""
+        self.frame_index = 0
+        self._close_cache_segment()
+    
+    def _get_cached_result(self, frame_index):
+        """Gecachte (Detections, Posen) des Frames - öffnet das Segment des aktuellen Videos bei Bedarf"""
+        if self.inference_cache is None:
+            return None
+        # Mit Zähllinie nicht: gecachte Track-IDs eines früheren Durchlaufs passen nicht zum laufenden Tracker
+        if self.line_config.get('enabled', False):
+            return None
+        
+        if self.cache_segment is None:
+            # Nur wenn die geladenen Modelle den konfigurierten Pfaden entsprechen
+            if self.pending_model_loads:
+                return None
+            if bool(self.detection_model) != bool(self.detection_model_path):
+                return None
+            if bool(self.pose_model) != bool(self.pose_model_path):
+                return None
+            
+            # Hashen und Laden im Hintergrund - bis dahin liefert das Segment keine Treffer
+            self.cache_segment = self.inference_cache.open_segment(
+                self.video_files[self.current_video_idx],
+                self.detection_model_path, self.pose_model_path,
+                self.class_config, self.pose_config,
+                self.line_config.get('enabled', False),
+                getattr(self.cap, 'max_width', 0)
+            )
+        
+        return self.cache_segment.get(frame_index)
     
     def open_settings(self):
         """Öffnet den Einstellungsdialog"""
@@ -284,13 +559,16 @@ class VideoPlayer(QWidget):
             self.display_config,
             self.foi_config,
             self.video_files,
-            self
+            self,
+            config_manager=self.config_manager
         )
         
         if dialog.exec():
+            previous_detection_path = self.detection_model_path
+            previous_pose_path = self.pose_model_path
             settings = dialog.get_settings()
             self._apply_settings(settings)
-            self._update_models()
+            self._update_models(previous_detection_path, previous_pose_path)
             self._update_status()
             self.save_config()
     
@@ -309,13 +587,19 @@ class VideoPlayer(QWidget):
             self.class_config, self.pose_config, self.display_config
         )
         self.foi_manager.update_config(self.foi_config)
+        
+        # Schwellwerte oder Modelle können sich geändert haben
+        self._close_cache_segment()
     
-    def _update_models(self):
-        """Lädt die Modelle neu falls sie geändert wurden"""
+    def _update_models(self, previous_detection_path=None, previous_pose_path=None):
+        """Lädt die Modelle neu falls sich ihr Pfad geändert hat"""
         # Detection Modell neu laden
-        if self.detection_model_path:
+        if (self.detection_model_path == previous_detection_path and
+                (self.detection_model is not None or not self.detection_model_path)):
+            pass  # Unverändert - kein erneutes Laden
+        elif self.detection_model_path:
             try:
-                self.detection_model = YOLO(self.detection_model_path)
+                self.detection_model = load_yolo_model(self.detection_model_path)
                 detection_model_name = os.path.basename(self.detection_model_path)
                 print(f"Detection Modell geladen: {detection_model_name}")
             except Exception as e:
@@ -325,9 +609,12 @@ class VideoPlayer(QWidget):
             self.detection_model = None
         
         # Pose Modell neu laden
-        if self.pose_model_path:
+        if (self.pose_model_path == previous_pose_path and
+                (self.pose_model is not None or not self.pose_model_path)):
+            pass  # Unverändert - kein erneutes Laden
+        elif self.pose_model_path:
             try:
-                self.pose_model = YOLO(self.pose_model_path)
+                self.pose_model = load_yolo_model(self.pose_model_path)
                 pose_model_name = os.path.basename(self.pose_model_path)
                 print(f"Pose Modell geladen: {pose_model_name}")
             except Exception as e:
@@ -353,16 +640,16 @@ class VideoPlayer(QWidget):
         if self.video_files and (self.detection_model or self.pose_model):
             self.current_video_idx = 0
             self.btn_play_pause.setEnabled(True)
-            self.label.setText("Bereit zum Abspielen")
+            self.video_widget.setText("Bereit zum Abspielen")
             video_count = len(self.video_files)
             current_status = self.lbl_status.text()
             self.lbl_status.setText(f"{current_status} | {video_count} Video(s) bereit")
         else:
             self.btn_play_pause.setEnabled(False)
             if not self.video_files:
-                self.label.setText("Keine Videos ausgewählt")
+                self.video_widget.setText("Keine Videos ausgewählt")
             elif not (self.detection_model or self.pose_model):
-                self.label.setText("Keine Modelle ausgewählt")
+                self.video_widget.setText("Keine Modelle ausgewählt")
     
     def start_video(self):
         """Startet die Video-Wiedergabe"""
@@ -377,7 +664,9 @@ class VideoPlayer(QWidget):
         if self.cap:
             self.cap.release()
             
-        self.cap = cv2.VideoCapture(self.video_files[self.current_video_idx])
+        self.cap = self._open_capture(self.video_files[self.current_video_idx])
+        self._apply_source_frame_rate()
+        self._reset_frame_index()
         self.timer.start()
         
         self.btn_play_pause.setText("⏸ Pausieren")
@@ -422,7 +711,9 @@ class VideoPlayer(QWidget):
         """Animation für den Alarmzustand"""
         if not self.alarm_active:
             self.alarm_timer.stop()
-            self.video_container.setStyleSheet("background-color: #222; border-radius: 5px;")
+            self.pulse_value = 0
+            self.pulse_direction = 1
+            self._set_video_background(VIDEO_BACKGROUND_COLOR)
             return
             
         self.pulse_value += (5 * self.pulse_direction)
@@ -434,33 +725,68 @@ class VideoPlayer(QWidget):
             self.pulse_direction = 1
             
         intensity = 100 + int(self.pulse_value * 1.55)
-        self.video_container.setStyleSheet(f"""
-            background-color: rgb({intensity}, 0, 0);
-            border-radius: 5px;
-        """)
+        self._set_video_background(QColor(intensity, 0, 0))
     
-    def handle_detection_result(self, result):
-        """Verarbeitet die Erkennungsergebnisse vom Worker-Thread"""
+    def _set_video_background(self, color):
+        """Setzt die Hintergrundfarbe des Video-Containers über die Palette (kein Repolish)"""
+        palette = self.video_container.palette()
+        if palette.color(QPalette.ColorRole.Window) == color:
+            return
+        palette.setColor(QPalette.ColorRole.Window, color)
+        self.video_container.setPalette(palette)
+    
+    def _get_status_style_key(self, lift_status):
+        """Ordnet den Lift-Status einem vorberechneten Status-Bar-Style zu"""
+        return get_status_style_key(lift_status)
+    
+    def _update_status_bar(self, text, style_key):
+        """Aktualisiert Text und Style der Status-Bar nur bei tatsächlichen Änderungen"""
+        if text != self.status_text:
+            self.status_text = text
+            self.status_bar.showMessage(text)
+        if style_key != self.status_style_key:
+            self.status_style_key = style_key
+            self.status_bar.setStyleSheet(STATUS_STYLES[style_key])
+    
+    def handle_detection_result(self, result, from_cache=False):
+        """Verarbeitet die Erkennungsergebnisse vom Worker-Thread bzw. aus dem Inferenz-Cache"""
         if not result:
             return
             
-        frame, detections, poses = result
-        self.current_frame = frame
+        # Der Frame des Ergebnisses wird nicht angezeigt - die Anzeige läuft im Takt des Videos
+        frame, detections, poses, capture_time = result
         self.last_detections = detections
         self.last_poses = poses
+        self.last_result_capture_time = capture_time
+        
+        # Worker-Ergebnis für spätere Durchläufe des Videos cachen
+        if self.inflight_frame_index is not None and self.cache_segment is not None and frame is not None:
+            self.cache_segment.put(self.inflight_frame_index, (frame.shape[1], frame.shape[0]), detections, poses)
+        self.inflight_frame_index = None
         
         # Frame-Dimensionen für FOI Manager setzen
         if frame is not None:
             h, w = frame.shape[:2]
             self.foi_manager.set_frame_dimensions(w, h)
+            self.heatmap_accumulator.set_frame_dimensions(w, h)
+            self.line_counter.set_frame_dimensions(w, h)
+        
+        # Heatmap inkrementell aus den vorhandenen Detections aktualisieren
+        self.heatmap_accumulator.update(detections)
+        
+        # Linienüberquerungen anhand der Track-IDs zählen
+        self.line_counter.update(detections)
         
         # FOI-Analysen durchführen
         if self.foi_config.get('enabled', False):
-            self.foi_manager.count_objects_in_foi(detections)
-            self.foi_manager.check_alert_objects_in_foi(detections)
+            previous_status, lift_status = evaluate_foi(self.foi_manager, detections, self.metrics)
             
             # Status-Bar aktualisieren mit verbessertem Styling
-            lift_status = self.foi_manager.get_lift_status()
+            if not from_cache:
+                # Cache-Treffer kommen ohne Inferenz - ihre Latenz würde die Perzentile verfälschen
+                self._record_alert_latency(capture_time, previous_status, lift_status)
+            trigger_incident(self.incident_recorder, previous_status, lift_status)
+            self._publish_lift_status()
             
             # Erweiterte Status-Anzeige mit Timer-Info
             status_info = self.foi_manager.get_status_info()
@@ -472,61 +798,12 @@ class VideoPlayer(QWidget):
             else:
                 display_status = lift_status
             
-            self.status_bar.showMessage(display_status)
-            
-            # Status-Bar-Farbe je nach Status ändern - mit dunklem Text
-            if "verlangsamt" in lift_status:
-                self.status_bar.setStyleSheet("""
-                    QStatusBar {
-                        background-color: #fff3cd;
-                        border-top: 2px solid #ffeaa7;
-                        color: #856404;
-                        font-size: 18px;
-                        font-weight: bold;
-                        text-align: center;
-                        padding: 0px;
-                    }
-                    QStatusBar::item { border: none; }
-                """)
-            elif "gestoppt" in lift_status:
-                self.status_bar.setStyleSheet("""
-                    QStatusBar {
-                        background-color: #f8d7da;
-                        border-top: 2px solid #f5c6cb;
-                        color: #721c24;
-                        font-size: 18px;
-                        font-weight: bold;
-                        text-align: center;
-                        padding: 0px;
-                    }
-                    QStatusBar::item { border: none; }
-                """)
-            elif "Normalgeschwindigkeit" in lift_status:
-                self.status_bar.setStyleSheet("""
-                    QStatusBar {
-                        background-color: #d1edff;
-                        border-top: 2px solid #bee5eb;
-                        color: #004085;
-                        font-size: 18px;
-                        font-weight: bold;
-                        text-align: center;
-                        padding: 0px;
-                    }
-                    QStatusBar::item { border: none; }
-                """)
-            else:
-                self.status_bar.setStyleSheet("""
-                    QStatusBar {
-                        background-color: #d4edda;
-                        border-top: 2px solid #c3e6cb;
-                        color: #155724;
-                        font-size: 18px;
-                        font-weight: bold;
-                        text-align: center;
-                        padding: 0px;
-                    }
-                    QStatusBar::item { border: none; }
-                """)
+            # Text ändert sich nur mit dem Countdown (0.1s-Schritte), der Style nur beim Zustandswechsel
+            self._update_status_bar(display_status, self._get_status_style_key(lift_status))
+        
+        if frame is not None:
+            record_result(self.recorder, (frame.shape[1], frame.shape[0]), detections, poses,
+                          self.foi_manager.get_lift_status(), capture_time)
         
         # Prüfung auf Standard-Alarmzustand
         alarm_class_id = self.display_config.get('alarm_class')
@@ -539,42 +816,189 @@ class VideoPlayer(QWidget):
             elif not alarm_triggered:
                 self.alarm_active = False
                 
-        # Frame mit Erkennungen und Posen rendern
-        self.render_frame()
+        # Im Pausenmodus das neue Ergebnis sofort anzeigen
+        if not self.timer.isActive():
+            self.render_frame()
         
         # Processing-Lock freigeben
         self.processing_frame = False
     
+    def _record_alert_latency(self, capture_time, previous_status, lift_status):
+        """Erfasst die Latenz vom Erfassen des Frames bis zur FOI-Entscheidung bzw. zum Statuswechsel"""
+        latency = observe_alert_latency(self.metrics, capture_time, previous_status, lift_status)
+        if latency is None:
+            return
+        if lift_status != previous_status:
+            print(f"Lift-Status '{lift_status}' {latency * 1000:.0f} ms nach Erfassung des Frames")
+        
+        self._check_alert_latency_budget()
+    
+    def _check_alert_latency_budget(self):
+        """Warnt, wenn das p99 Erfassung -> Alarm das konfigurierte Budget überschreitet (max. 1x pro Sekunde geprüft)"""
+        budget = self.metrics_config.get('alert_latency_budget', 0.5)
+        now = time.monotonic()
+        if not budget or now - self.last_latency_check < 1.0:
+            return
+        self.last_latency_check = now
+        
+        # Erst ab einer Mindestanzahl an Frames aussagekräftig
+        p99 = self.metrics.quantile('capture_to_alert', 0.99, min_count=30)
+        if p99 is None:
+            return
+        
+        over_budget = p99 > budget
+        was_over_budget = self.alert_latency_p99 is not None
+        self.alert_latency_p99 = p99 if over_budget else None
+        if over_budget and not was_over_budget:
+            self.metrics.inc('alert_latency_budget_exceeded')
+            print(f"Warnung: p99 Erfassung -> Alarm {p99 * 1000:.0f} ms über dem Budget von {budget * 1000:.0f} ms")
+            self.lbl_result_age.setStyleSheet(RESULT_AGE_WARNING_STYLE)
+        elif was_over_budget and not over_budget:
+            print(f"p99 Erfassung -> Alarm wieder im Budget ({p99 * 1000:.0f} ms)")
+            self.lbl_result_age.setStyleSheet(RESULT_AGE_STYLE)
+    
+    def handle_detection_error(self, error):
+        """Gibt den Processing-Lock nach einem Fehler im Worker-Thread wieder frei"""
+        print(f"Error: {error}")
+        self.metrics.inc('inference_errors')
+        self.inflight_frame_index = None
+        self.processing_frame = False
+    
     def render_frame(self):
         """Zeichnet Erkennungen und Posen auf den Frame und zeigt ihn an"""
         if self.current_frame is None:
             return
+        
+        self._render_base_frame()
+        
+        # Ein gerenderter Frame enthält bereits den aktuellen FOI-Zustand
+        self.overlay_redraw_timer.stop()
+        displayed_frame = self._show_with_overlays(in_place=True)
+        if self.incident_recorder is not None:
+            self.incident_recorder.add_frame(displayed_frame)
+        if self.video_exporter is not None and self.timer.isActive():
+            status = self.status_text if self.foi_config.get('enabled', False) else None
+            if not self.video_exporter.write(displayed_frame, status, self.source_fps):
+                self.metrics.inc('export_frames_dropped')
+    
+    def _render_base_frame(self):
+        """Rendert das Basisbild in Anzeigegröße mit Detections und Posen (ohne FOI/Zähllinie)"""
+        # Veraltete Detections nicht mehr über den aktuellen Frame legen
+        result_age = self._get_result_age()
+        max_result_age = self.display_config.get('max_result_age', 1.0)
+        if result_age is not None and result_age <= max_result_age:
+            detections, poses = self.last_detections, self.last_poses
+        else:
+            detections, poses = [], []
+            if result_age is not None:
+                self.metrics.inc('stale_results_hidden')
+        self._update_result_age_display(result_age)
+        
+        # Frame zuerst auf Anzeigegröße skalieren, dann Erkennungen und Posen zeichnen
+        with self.metrics.time('render'):
+            self.base_display_frame = self.frame_renderer.render_frame(
+                self.current_frame, detections, poses,
+                heatmap=self.heatmap_accumulator,
+                target_size=self._display_target_size()
+            )
+        self.base_display_composited = False
+    
+    def render_overlays_only(self):
+        """Zeichnet nur FOI und Zähllinie neu - auf dem gecachten Basisbild des letzten Frames"""
+        if self.base_display_frame is None or self.current_frame is None:
+            return
+        
+        base_height, base_width = self.base_display_frame.shape[:2]
+        if (base_width, base_height) != self._display_target_size():
+            # Widget-Größe hat sich geändert - Basisbild neu rendern
+            self.render_frame()
+            return
+        
+        if self.base_display_composited:
+            # Overlays wurden bei der Wiedergabe direkt ins Basisbild gezeichnet - einmal sauber neu rendern
+            self._render_base_frame()
+        self._show_with_overlays(in_place=False)
+    
+    def request_overlay_redraw(self):
+        """Fordert ein Neuzeichnen der FOI-Ebene an (zusammengefasst über einen Single-Shot-Timer)"""
+        if self.timer.isActive():
+            # Während der Wiedergabe übernimmt der nächste Frame das Neuzeichnen
+            return
+        if not self.overlay_redraw_timer.isActive():
+            self.overlay_redraw_timer.start()
+    
+    def _show_with_overlays(self, in_place):
+        """Blendet FOI und Zähllinie auf das Basisbild ein und zeigt es an"""
+        with self.metrics.time('display'):
+            if in_place:
+                # Wiedergabe: das Basisbild wird mit dem nächsten Frame ohnehin ersetzt
+                rendered_frame = self.base_display_frame
+                self.base_display_composited = True
+            else:
+                # Interaktions-Redraw: Kopie, damit das Basisbild für weitere Redraws unverändert bleibt
+                rendered_frame = self.base_display_frame.copy()
             
-        # Frame mit Erkennungen und Posen rendern
-        rendered_frame = self.frame_renderer.render_frame(
-            self.current_frame, self.last_detections, self.last_poses
-        )
+            # FOI und Zähllinie aus den gecachten Overlay-Ebenen einblenden
+            rendered_frame = self.frame_renderer.render_overlays(
+                rendered_frame, [self.foi_manager, self.line_counter]
+            )
+            
+            # BGR-Puffer direkt an Qt übergeben (Format_BGR888, keine Kopie)
+            self.video_widget.set_frame(rendered_frame)
+        return rendered_frame
+    
+    def _display_target_size(self):
+        """Berechnet die Anzeigegröße des Frames im Video-Widget (KeepAspectRatio)"""
+        frame_height, frame_width = self.current_frame.shape[:2]
+        widget_width = max(1, self.video_widget.width())
+        widget_height = max(1, self.video_widget.height())
         
-        # FOI auf Frame zeichnen
-        if self.foi_config.get('enabled', False):
-            rendered_frame = self.foi_manager.draw_foi_on_frame(rendered_frame)
-            rendered_frame = self.foi_manager.draw_count_display(rendered_frame)
+        scale = min(widget_width / frame_width, widget_height / frame_height)
+        return (max(1, int(frame_width * scale)), max(1, int(frame_height * scale)))
+    
+    def _get_result_age(self):
+        """Alter der letzten Detections in Sekunden (bezogen auf den Erfassungszeitpunkt ihres Frames)"""
+        if self.last_result_capture_time is None:
+            return None
+        return time.monotonic() - self.last_result_capture_time
+    
+    def _update_result_age_display(self, result_age):
+        """Zeigt das Ergebnisalter an (max. 4x pro Sekunde aktualisiert)"""
+        now = time.monotonic()
+        if now - self.last_result_age_update < 0.25:
+            return
+        self.last_result_age_update = now
         
-        # In Qt-Format für Anzeige konvertieren
-        rgb_frame = cv2.cvtColor(rendered_frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_frame.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-        pixmap = QPixmap.fromImage(qt_image)
-        self.label.setPixmap(pixmap.scaled(self.label.size(), Qt.AspectRatioMode.KeepAspectRatio))
+        if result_age is None:
+            text = ""
+        else:
+            text = f"Ergebnisalter: {result_age * 1000:.0f} ms"
+        if self.alert_latency_p99 is not None:
+            text += f" | p99 Alarm: {self.alert_latency_p99 * 1000:.0f} ms"
+        self.lbl_result_age.setText(text)
+    
+    def _apply_source_frame_rate(self):
+        """Setzt das Anzeigeintervall auf die Bildrate des aktuellen Videos"""
+        fps = self.cap.get(cv2.CAP_PROP_FPS) if self.cap else 0
+        if not fps or fps <= 0 or fps > 240:
+            fps = 30.0  # Fallback bei fehlender/ungültiger Angabe
+        self.source_fps = fps
+        self.timer.setInterval(max(1, int(round(1000.0 / fps))))
     
     def next_frame(self):
-        """Holt den nächsten Video-Frame und verarbeitet ihn"""
-        if not self.cap or self.processing_frame:
+        """Holt den nächsten Video-Frame, zeigt ihn an und übergibt ihn bei freier Inferenz an den Worker"""
+        if not self.cap:
             return
+        
+        # Verspätete Ticks (Anzeige hinkt der Bildrate hinterher) zählen
+        tick_time = time.monotonic()
+        if self.last_tick_time is not None and tick_time - self.last_tick_time > 1.5 * self.timer.interval() / 1000.0:
+            self.metrics.inc('ticks_late')
+        self.last_tick_time = tick_time
             
         # Frame holen
-        ret, frame = self.cap.read()
+        with self.metrics.time('decode'):
+            ret, frame = self.cap.read()
         if not ret:
             # Ende des aktuellen Videos, zum nächsten in Endlosschleife
             self.current_video_idx = (self.current_video_idx + 1) % len(self.video_files)
@@ -594,21 +1018,50 @@ class VideoPlayer(QWidget):
             
             self.lbl_status.setText(" | ".join(status_parts))
             
-            # Nächstes Video starten
+            # Nächstes Video starten - Track-IDs sind nicht videoübergreifend gültig
+            self.line_counter.reset_tracks()
             if self.cap:
                 self.cap.release()
-            self.cap = cv2.VideoCapture(self.video_files[self.current_video_idx])
+            self.cap = self._open_capture(self.video_files[self.current_video_idx])
+            self._apply_source_frame_rate()
+            self._reset_frame_index()
             return
         
-        # Processing-Lock setzen
-        self.processing_frame = True
+        capture_time = time.monotonic()
+        self.current_frame = frame
+        frame_index = self.frame_index
+        self.frame_index += 1
+        self.metrics.inc('frames_decoded')
         
-        # An Thread-Pool übergeben
-        worker = DualDetectionWorker(frame, self.detection_model, self.pose_model, 
-                                   self.class_config, self.pose_config)
-        worker.signals.result.connect(self.handle_detection_result)
-        worker.signals.error.connect(lambda err: print(f"Error: {err}"))
-        self.threadpool.start(worker)
+        # Bereits berechnete Frames direkt aus dem Inferenz-Cache (ohne Worker, im Takt des Dekodierens)
+        cached = self._get_cached_result(frame_index) if not self.processing_frame else None
+        if cached is not None:
+            self.metrics.inc('inference_cache_hits')
+            detections, poses = cached
+            self.handle_detection_result((frame, detections, poses, capture_time), from_cache=True)
+        # Inferenz asynchron - nur wenn der Worker frei ist, sonst wird dieser Frame nur angezeigt
+        elif not self.processing_frame:
+            self.processing_frame = True
+            self.inflight_frame_index = frame_index if self.cache_segment is not None else None
+            if self.inflight_frame_index is not None:
+                self.metrics.inc('inference_cache_misses')
+            self.metrics.inc('inference_submitted')
+            
+            worker = DualDetectionWorker(frame, self.detection_model, self.pose_model, 
+                                       self.class_config, self.pose_config,
+                                       use_tracking=self.line_config.get('enabled', False),
+                                       capture_time=capture_time,
+                                       metrics=self.metrics)
+            worker.signals.result.connect(self.handle_detection_result)
+            worker.signals.error.connect(self.handle_detection_error)
+            self.threadpool.start(worker)
+        else:
+            # Worker noch belegt - Frame wird ohne eigene Inferenz angezeigt
+            self.metrics.inc('inference_skipped_busy')
+        self.metrics.set_gauge('threadpool_active', self.threadpool.activeThreadCount())
+        
+        # Jeden dekodierten Frame mit den neuesten Detections anzeigen
+        self.render_frame()
     
     def load_default_config(self):
         """Lädt die Standard-Konfiguration falls config.json existiert"""
@@ -622,33 +1075,37 @@ class VideoPlayer(QWidget):
             self.pose_config = config.get('pose_config', DEFAULT_CONFIG['pose_config'].copy())
             self.display_config = config.get('display_config', DEFAULT_CONFIG['display_config'].copy())
             self.foi_config = config.get('foi_config', DEFAULT_CONFIG['foi_config'].copy())
+            self.heatmap_config = config.get('heatmap_config', DEFAULT_CONFIG['heatmap_config'].copy())
+            self.line_config = config.get('line_config', DEFAULT_CONFIG['line_config'].copy())
+            self.metrics_config = config.get('metrics_config', DEFAULT_CONFIG['metrics_config'].copy())
+            self.recording_config = config.get('recording_config', DEFAULT_CONFIG['recording_config'].copy())
+            self.inference_cache_config = config.get('inference_cache_config',
+                                                     DEFAULT_CONFIG['inference_cache_config'].copy())
+            self.frame_cache_config = config.get('frame_cache_config', DEFAULT_CONFIG['frame_cache_config'].copy())
+            self.incident_config = config.get('incident_config', DEFAULT_CONFIG['incident_config'].copy())
+            self.export_config = config.get('export_config', DEFAULT_CONFIG['export_config'].copy())
+            self.alert_output_config = config.get('alert_output_config',
+                                                  copy.deepcopy(DEFAULT_CONFIG['alert_output_config']))
+            self.headless_config = config.get('headless_config', DEFAULT_CONFIG['headless_config'].copy())
             self.video_files = config.get('video_files', [])
             
-            # Frame renderer und FOI Manager aktualisieren
+            # Frame renderer, FOI Manager und Heatmap aktualisieren
             self.frame_renderer.update_config(
                 self.class_config, self.pose_config, self.display_config
             )
             self.foi_manager.update_config(self.foi_config)
+            self.heatmap_accumulator.update_config(self.heatmap_config)
+            self.line_counter.update_config(self.line_config)
+            self._apply_metrics_config()
+            self._apply_recording_config()
+            self._apply_inference_cache_config()
+            self._apply_frame_cache_config()
+            self._apply_incident_config()
+            self._apply_export_config()
+            self._apply_alert_output_config()
             
-            # Detection Modell laden falls Pfad vorhanden
-            if self.detection_model_path and os.path.exists(self.detection_model_path):
-                try:
-                    self.detection_model = YOLO(self.detection_model_path)
-                    detection_model_name = os.path.basename(self.detection_model_path)
-                    print(f"Detection Modell geladen: {detection_model_name}")
-                except Exception as e:
-                    print(f"Fehler beim Laden des Detection Modells: {e}")
-                    self.detection_model = None
-            
-            # Pose Modell laden falls Pfad vorhanden
-            if self.pose_model_path and os.path.exists(self.pose_model_path):
-                try:
-                    self.pose_model = YOLO(self.pose_model_path)
-                    pose_model_name = os.path.basename(self.pose_model_path)
-                    print(f"Pose Modell geladen: {pose_model_name}")
-                except Exception as e:
-                    print(f"Fehler beim Laden des Pose Modells: {e}")
-                    self.pose_model = None
+            # Modelle erst laden, wenn das Fenster sichtbar ist (Event-Loop läuft) - im Hintergrund
+            QTimer.singleShot(0, self._load_initial_models)
             
             # Status aktualisieren
             self._update_initial_status()
@@ -660,82 +1117,287 @@ class VideoPlayer(QWidget):
                 "0": {"name": "Person", "color": (0, 255, 0), "conf": 0.5, "iou": 0.4}
             }
     
+    def _load_initial_models(self):
+        """Startet das Laden der konfigurierten Modelle nach dem Anzeigen des Fensters"""
+        pending = []
+        if self.detection_model_path and os.path.exists(self.detection_model_path):
+            self._load_model_in_background('detection', self.detection_model_path)
+            pending.append("Detection")
+        if self.pose_model_path and os.path.exists(self.pose_model_path):
+            self._load_model_in_background('pose', self.pose_model_path)
+            pending.append("Pose")
+        
+        if pending:
+            self.lbl_status.setText(f"Modelle werden geladen ({', '.join(pending)})...")
+    
     def _update_initial_status(self):
         """Aktualisiert den initialen Status nach dem Laden der Konfiguration"""
         status_parts = []
-        if self.detection_model:
+        if self.detection_model and 'detection' not in self.model_load_errors:
            status_parts.append(f"Detection: {os.path.basename(self.detection_model_path)}")
-        if self.pose_model:
+        if self.pose_model and 'pose' not in self.model_load_errors:
             status_parts.append(f"Pose: {os.path.basename(self.pose_model_path)}")
+        status_parts.extend(self.model_load_errors.values())
         
         if status_parts and self.video_files:
             self.btn_play_pause.setEnabled(True)
             video_count = len(self.video_files)
             status_parts.append(f"{video_count} Video(s) bereit")
             self.lbl_status.setText(" | ".join(status_parts))
-            self.label.setText("Bereit zum Abspielen")
+            self.video_widget.setText("Bereit zum Abspielen")
         elif status_parts:
             self.lbl_status.setText(" | ".join(status_parts))
         else:
             self.lbl_status.setText("Keine Modelle geladen - Konfiguration für Sturzerkennung an Skiliften")
     
-    def save_config(self):
-        """Speichert die aktuelle Konfiguration"""
-        config = {
+    def _current_config(self):
+        """Stellt die laufende Konfiguration als Dictionary zusammen"""
+        return {
             'detection_model_path': self.detection_model_path,
             'pose_model_path': self.pose_model_path,
             'class_config': self.class_config,
             'pose_config': self.pose_config,
             'display_config': self.display_config,
             'foi_config': self.foi_config,
+            'heatmap_config': self.heatmap_config,
+            'line_config': self.line_config,
+            'metrics_config': self.metrics_config,
+            'recording_config': self.recording_config,
+            'inference_cache_config': self.inference_cache_config,
+            'frame_cache_config': self.frame_cache_config,
+            'incident_config': self.incident_config,
+            'export_config': self.export_config,
+            'alert_output_config': self.alert_output_config,
+            'headless_config': self.headless_config,
             'video_files': self.video_files
         }
-        
-        success = self.config_manager.save_config(config)
+    
+    def save_config(self):
+        """Speichert die aktuelle Konfiguration"""
+        success = self.config_manager.save_config(self._current_config())
         if not success:
             print("Fehler beim Speichern der Konfiguration")
     
+    def apply_external_config(self, config):
+        """Übernimmt eine extern geänderte config.json - nur geänderte Bereiche, ohne Neustart.
+        
+        Läuft im GUI-Thread zwischen zwei Frames; die Bereiche werden als neue
+        Dictionaries ersetzt, ein laufender Worker rechnet mit dem alten Stand zu Ende.
+        """
+        # Vergleich in JSON-Form, damit Tupel und Listen (z.B. Farben) als gleich gelten
+        current = json.loads(json.dumps(self._current_config()))
+        changed = [key for key in current
+                   if key in config and json.loads(json.dumps(config[key])) != current[key]]
+        if not changed:
+            return
+        
+        previous_video_files = self.video_files
+        for key in changed:
+            if key not in ('detection_model_path', 'pose_model_path'):
+                setattr(self, key, config[key])
+        if 'video_files' in changed:
+            self._apply_video_files(previous_video_files)
+        
+        # Schwellwerte, Anzeige, FOI, Heatmap und Zähllinie übernehmen
+        self.frame_renderer.update_config(
+            self.class_config, self.pose_config, self.display_config
+        )
+        if 'foi_config' in changed:
+            self.foi_manager.update_config(self.foi_config)
+        if 'heatmap_config' in changed:
+            self.heatmap_accumulator.update_config(self.heatmap_config)
+        if 'line_config' in changed:
+            self.line_counter.update_config(self.line_config)
+        if 'metrics_config' in changed:
+            self._apply_metrics_config()
+        if 'recording_config' in changed:
+            self._apply_recording_config()
+        if 'frame_cache_config' in changed:
+            self._apply_frame_cache_config()
+        if 'incident_config' in changed:
+            self._apply_incident_config()
+        if 'export_config' in changed:
+            self._apply_export_config()
+        if 'alert_output_config' in changed:
+            self._apply_alert_output_config()
+        if 'inference_cache_config' in changed:
+            self._apply_inference_cache_config()
+        elif any(key in changed for key in ('class_config', 'pose_config', 'line_config',
+                                            'detection_model_path', 'pose_model_path')):
+            self._close_cache_segment()
+        
+        # Modelle nur bei geändertem Pfad und im Hintergrund laden - das alte Modell läuft bis dahin weiter
+        if 'detection_model_path' in changed:
+            self.detection_model_path = config['detection_model_path']
+            self._load_model_in_background('detection', self.detection_model_path)
+        if 'pose_model_path' in changed:
+            self.pose_model_path = config['pose_model_path']
+            self._load_model_in_background('pose', self.pose_model_path)
+        
+        print(f"Konfiguration neu geladen: {', '.join(changed)}")
+        
+        if not self.timer.isActive():
+            if 'video_files' in changed:
+                self._update_initial_status()
+            if self.current_frame is not None:
+                self.render_frame()
+    
+    def _apply_video_files(self, previous_video_files):
+        """Passt den Video-Index an eine geänderte Videoliste an - leere Liste beendet die Wiedergabe"""
+        current_path = None
+        if 0 <= self.current_video_idx < len(previous_video_files):
+            current_path = previous_video_files[self.current_video_idx]
+        
+        if not self.video_files:
+            self.timer.stop()
+            if self.cap:
+                self.cap.release()
+            self.cap = None
+            self.current_video_idx = 0
+            self._reset_frame_index()
+            self.btn_play_pause.setText("▶ Abspielen")
+            return
+        
+        if current_path in self.video_files:
+            # Aktuelles Video läuft weiter, nur seine Position in der Liste hat sich geändert
+            self.current_video_idx = self.video_files.index(current_path)
+            return
+        
+        # Aktuelles Video entfernt - von vorn beginnen
+        self.current_video_idx = 0
+        self.line_counter.reset_tracks()
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+        if self.timer.isActive():
+            self.cap = self._open_capture(self.video_files[self.current_video_idx])
+            self._apply_source_frame_rate()
+        self._reset_frame_index()
+    
+    def _load_model_in_background(self, model_kind, model_path):
+        """Startet das Laden eines Modells im Thread-Pool"""
+        if not model_path:
+            if model_kind == 'detection':
+                self.detection_model = None
+            else:
+                self.pose_model = None
+            return
+        
+        worker = ModelLoadWorker(model_kind, model_path)
+        worker.signals.result.connect(self._handle_model_loaded)
+        worker.signals.error.connect(lambda err: self._handle_model_load_error(model_kind, model_path, err))
+        worker.signals.finished.connect(lambda: self.pending_model_loads.discard(model_kind))
+        self.pending_model_loads.add(model_kind)
+        self.threadpool.start(worker)
+    
+    def _handle_model_loaded(self, result):
+        """Tauscht ein im Hintergrund geladenes Modell ein (nur wenn der Pfad noch aktuell ist)"""
+        model_kind, model_path, model = result
+        if model_kind == 'detection' and model_path == self.detection_model_path:
+            self.detection_model = model
+        elif model_kind == 'pose' and model_path == self.pose_model_path:
+            self.pose_model = model
+        else:
+            return
+        
+        # Ergebnisse des neuen Modells gehören in ein anderes Cache-Segment
+        self.pending_model_loads.discard(model_kind)
+        self.model_load_errors.pop(model_kind, None)
+        self._close_cache_segment()
+        print(f"{model_kind.capitalize()} Modell geladen: {os.path.basename(model_path)}")
+        if not self.timer.isActive():
+            self._update_initial_status()
+    
+    def _handle_model_load_error(self, model_kind, model_path, error):
+        """Meldet ein fehlgeschlagenes Laden im Status (nur wenn der Pfad noch aktuell ist)"""
+        print(f"Fehler beim Laden des Modells {model_path}: {error}")
+        current_path = self.detection_model_path if model_kind == 'detection' else self.pose_model_path
+        if model_path != current_path:
+            return
+        
+        self.pending_model_loads.discard(model_kind)
+        self.model_load_errors[model_kind] = (
+            f"{model_kind.capitalize()} Modell konnte nicht geladen werden: "
+            f"{os.path.basename(model_path)} ({error})"
+        )
+        if self.timer.isActive():
+            self.lbl_status.setText(self.model_load_errors[model_kind])
+        else:
+            self._update_initial_status()
+    
     def closeEvent(self, event):
         """Wird beim Schließen der Anwendung aufgerufen"""
         # Ressourcen aufräumen
         self.timer.stop()
         self.alarm_timer.stop()
+        self.metrics_overlay_timer.stop()
         if self.cap:
             self.cap.release()
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.incident_recorder is not None:
+            self.incident_recorder.close()
+            self.incident_recorder = None
+        if self.video_exporter is not None:
+            self.video_exporter.close()
+            self.video_exporter = None
+        if self.alert_publisher is not None:
+            self.alert_publisher.close()
+            self.alert_publisher = None
+        self._close_cache_segment()
+        if self.inference_cache is not None:
+            self.inference_cache.close()
+            self.inference_cache = None
+        
+        # Aktuelle Heatmap und Durchsatz-Zählungen der Zähllinie sichern
+        export_final_results(self.heatmap_accumulator, self.heatmap_config,
+                             self.line_counter, self.line_config, self._config_dir())
             
-        # Konfiguration beim Beenden speichern
+        # Konfiguration beim Beenden speichern - ausstehende Schreibvorgänge sofort ausführen
         self.save_config()
+        self.config_manager.flush()
         event.accept()
     
-    # Mouse-Event-Handler für FOI-Interaktion
+    # Mouse-Event-Handler für FOI- und Zähllinien-Interaktion
     def mouse_press_event(self, event):
-        """Behandelt Maus-Klick-Events für FOI-Manipulation"""
-        if not self.foi_config.get('enabled', False) or self.current_frame is None:
+        """Behandelt Maus-Klick-Events für FOI-Ecken und Endpunkte der Zähllinie"""
+        foi_enabled = self.foi_config.get('enabled', False)
+        if not (foi_enabled or self.line_config.get('enabled', False)) or self.current_frame is None:
             return
             
-        frame_pos = self._pixmap_to_frame_coordinates(event.position().toPoint())
+        frame_pos = self._widget_to_frame_coordinates(event.position().toPoint())
         if frame_pos is None:
             return
             
         x, y = frame_pos
         
-        # Prüfe ob auf einer Ecke geklickt wurde
-        corner_idx = self.foi_manager.get_corner_at_position(x, y)
+        # Prüfe ob auf einer Ecke bzw. einem Linienendpunkt geklickt wurde (FOI hat Vorrang)
+        corner_idx = self.foi_manager.get_corner_at_position(x, y, self._corner_tolerance()) if foi_enabled else -1
+        point_idx = self.line_counter.get_point_at_position(x, y, self._corner_tolerance()) if corner_idx < 0 else -1
         if corner_idx >= 0:
             self.mouse_pressed = True
             self.foi_manager.dragging_corner = corner_idx
             self.last_mouse_pos = (x, y)
+        elif point_idx >= 0:
+            self.mouse_pressed = True
+            self.line_counter.dragging_point = point_idx
+            self.last_mouse_pos = (x, y)
         else:
             # Wenn nicht auf einer Ecke, dann FOI neu setzen
             # self.foi_manager.set_foi_corners(x, y)
-            self.render_frame()
+            self.request_overlay_redraw()
     
     def mouse_move_event(self, event):
-        """Behandelt Maus-Bewegungs-Events für FOI-Manipulation"""
-        if not self.foi_config.get('enabled', False) or self.current_frame is None:
+        """Behandelt Maus-Bewegungs-Events für FOI-Ecken und Endpunkte der Zähllinie"""
+        foi_enabled = self.foi_config.get('enabled', False)
+        if not (foi_enabled or self.line_config.get('enabled', False)) or self.current_frame is None:
             return
             
-        frame_pos = self._pixmap_to_frame_coordinates(event.position().toPoint())
+        frame_pos = self._widget_to_frame_coordinates(event.position().toPoint())
         if frame_pos is None:
             return
             
@@ -744,61 +1406,62 @@ class VideoPlayer(QWidget):
         if self.mouse_pressed and self.foi_manager.dragging_corner >= 0:
             # Ecke verschieben
             self.foi_manager.move_corner(self.foi_manager.dragging_corner, x, y)
-            self.render_frame()  # Frame neu rendern
+            self.request_overlay_redraw()  # Nur FOI-Ebene neu zeichnen, zusammengefasst
+        elif self.mouse_pressed and self.line_counter.dragging_point >= 0:
+            # Endpunkt der Zähllinie verschieben
+            self.line_counter.move_point(self.line_counter.dragging_point, x, y)
+            self.request_overlay_redraw()
         else:
-            # Hover-Effekt für Ecken
-            corner_idx = self.foi_manager.get_corner_at_position(x, y)
-            if corner_idx != self.foi_manager.hover_corner:
+            # Hover-Effekt für Ecken und Linienendpunkte
+            corner_idx = self.foi_manager.get_corner_at_position(x, y, self._corner_tolerance()) if foi_enabled else -1
+            point_idx = self.line_counter.get_point_at_position(x, y, self._corner_tolerance()) if corner_idx < 0 else -1
+            if corner_idx != self.foi_manager.hover_corner or point_idx != self.line_counter.hover_point:
                 self.foi_manager.hover_corner = corner_idx
-                if self.current_frame is not None:
-                    self.render_frame()  # Frame neu rendern für Hover-Effekt
+                self.line_counter.hover_point = point_idx
+                self.request_overlay_redraw()  # Hover-Effekt, zusammengefasst
     
     def mouse_release_event(self, event):
-        """Behandelt Maus-Los-Events für FOI-Manipulation"""
+        """Behandelt Maus-Los-Events für FOI-Ecken und Endpunkte der Zähllinie"""
         if self.mouse_pressed:
             self.mouse_pressed = False
             self.foi_manager.dragging_corner = -1
-            self.save_config()  # FOI-Position speichern
+            self.line_counter.dragging_point = -1
+            self.save_config()  # FOI- bzw. Linienposition speichern
+    
+    def _corner_tolerance(self):
+        """Greifradius der FOI-Ecken in Frame-Pixeln - die Ecken werden in Anzeigegröße gezeichnet"""
+        if self.current_frame is None or not self.video_widget.has_frame():
+            return FOI_CORNER_SIZE
+        scale = self.video_widget.image_rect().width() / self.current_frame.shape[1]
+        return FOI_CORNER_SIZE / scale if scale > 0 else FOI_CORNER_SIZE
     
-    def _pixmap_to_frame_coordinates(self, pixmap_pos):
-        """Konvertiert Pixmap-Koordinaten zu Frame-Koordinaten"""
-        if self.current_frame is None or not self.label.pixmap():
+    def _widget_to_frame_coordinates(self, widget_pos):
+        """Konvertiert Widget-Koordinaten zu Frame-Koordinaten"""
+        if self.current_frame is None or not self.video_widget.has_frame():
             return None
             
-        # Pixmap-Dimensionen
-        pixmap = self.label.pixmap()
-        pixmap_width = pixmap.width()
-        pixmap_height = pixmap.height()
-        
-        # Label-Dimensionen
-        label_width = self.label.width()
-        label_height = self.label.height()
+        # Zielrechteck des angezeigten Bildes im Widget (zentriert)
+        image_rect = self.video_widget.image_rect()
+        scaled_width = image_rect.width()
+        scaled_height = image_rect.height()
         
         # Frame-Dimensionen
         frame_height, frame_width = self.current_frame.shape[:2]
         
-        # Berechne Skalierung und Offset (KeepAspectRatio)
-        scale_x = pixmap_width / frame_width
-        scale_y = pixmap_height / frame_height
-        scale = min(scale_x, scale_y)
-        
-        scaled_width = int(frame_width * scale)
-        scaled_height = int(frame_height * scale)
-        
-        # Offset für Zentrierung
-        offset_x = (label_width - scaled_width) // 2
-        offset_y = (label_height - scaled_height) // 2
+        # Skalierung Anzeige -> Frame
+        scale_x = scaled_width / frame_width
+        scale_y = scaled_height / frame_height
         
-        # Relative Position im Pixmap
-        rel_x = pixmap_pos.x() - offset_x
-        rel_y = pixmap_pos.y() - offset_y
+        # Relative Position im angezeigten Bild
+        rel_x = widget_pos.x() - image_rect.x()
+        rel_y = widget_pos.y() - image_rect.y()
         
-        # Prüfe ob innerhalb des Pixmaps
+        # Prüfe ob innerhalb des Bildes
         if rel_x < 0 or rel_y < 0 or rel_x >= scaled_width or rel_y >= scaled_height:
             return None
         
         # Konvertiere zu Frame-Koordinaten
-        frame_x = int(rel_x / scale)
-        frame_y = int(rel_y / scale)
+        frame_x = int(rel_x / scale_x)
+        frame_y = int(rel_y / scale_y)
         
         return (frame_x, frame_y)
\ No newline at end of file
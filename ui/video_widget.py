@@ -0,0 +1,90 @@
+import numpy as np
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+from PyQt6.QtGui import QImage, QPainter, QColor, QFont
+from PyQt6.QtCore import Qt, QRect
+
+class VideoWidget(QWidget):
+    """Zeigt BGR-Frames ohne Farbkonvertierung und ohne QPixmap-Umweg an.
+
+    Das QImage wird direkt über dem BGR-Puffer des NumPy-Arrays erzeugt
+    (Format_BGR888); das Array wird so lange referenziert, wie das Bild
+    angezeigt wird.
+    """
+
+    def __init__(self, text="", parent=None):
+        super().__init__(parent)
+        self._text = text
+        self._frame = None  # Hält den Puffer des QImage am Leben
+        self._image = None
+
+        self._text_color = QColor("#aaa")
+        self._text_font = QFont()
+        self._text_font.setPixelSize(16)
+
+        # Nicht an die Bildgröße gebunden - das Bild wird in die Widget-Fläche eingepasst
+        self.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+
+    def setText(self, text):
+        """Zeigt einen Hinweistext statt eines Frames an"""
+        self._text = text
+        self._frame = None
+        self._image = None
+        self.update()
+
+    def text(self):
+        """Gibt den aktuellen Hinweistext zurück"""
+        return self._text
+
+    def set_frame(self, frame):
+        """Zeigt einen BGR-Frame (uint8, HxWx3) an - ohne Kopie, solange er C-kontigu ist"""
+        if frame is None:
+            return
+        if not frame.flags['C_CONTIGUOUS']:
+            frame = np.ascontiguousarray(frame)
+
+        h, w = frame.shape[:2]
+        self._frame = frame
+        self._image = QImage(frame.data, w, h, frame.strides[0], QImage.Format.Format_BGR888)
+        self.update()
+
+    def has_frame(self):
+        """Prüft ob aktuell ein Frame angezeigt wird"""
+        return self._image is not None
+
+    def image_size(self):
+        """Gibt die Größe des angezeigten Bildes (Breite, Höhe) zurück"""
+        if self._image is None:
+            return None
+        return self._image.width(), self._image.height()
+
+    def image_rect(self):
+        """Berechnet das Zielrechteck des Bildes im Widget (zentriert, KeepAspectRatio)"""
+        if self._image is None:
+            return QRect()
+
+        image_width, image_height = self._image.width(), self._image.height()
+        scale = min(self.width() / image_width, self.height() / image_height)
+        target_width = int(image_width * scale)
+        target_height = int(image_height * scale)
+        if abs(target_width - image_width) <= 1 and abs(target_height - image_height) <= 1:
+            # Bereits in Anzeigegröße gerendert - unskaliert zeichnen
+            target_width, target_height = image_width, image_height
+        x = (self.width() - target_width) // 2
+        y = (self.height() - target_height) // 2
+        return QRect(x, y, target_width, target_height)
+
+    def paintEvent(self, event):
+        """Zeichnet das Bild direkt aus dem BGR-Puffer bzw. den Hinweistext"""
+        painter = QPainter(self)
+        if self._image is not None:
+            target = self.image_rect()
+            if target.width() == self._image.width() and target.height() == self._image.height():
+                painter.drawImage(target.topLeft(), self._image)
+            else:
+                # Nur bis zum nächsten gerenderten Frame nach einer Größenänderung
+                painter.drawImage(target, self._image)
+        elif self._text:
+            painter.setPen(self._text_color)
+            painter.setFont(self._text_font)
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap, self._text)
+        painter.end()